@@ -6,12 +6,127 @@ import numpy as np
 import sys
 import math
 import os
+import ctypes
+import argparse
+from collections import OrderedDict
+
+from obj_loader import parse_obj_file, read_mesh_cache, write_mesh_cache, cache_path_for
+from frame_profiler import FrameProfiler, LogSink
+from static_layer import StaticLayer
+
+# Batas sudut (derajat) antara normal face dan normal vertex; di atas ini tepi dianggap tajam
+SMOOTH_CREASE_ANGLE = 45.0
+
+class MeshBuffers:
+    # Buffer GPU (VBO + index buffer) untuk satu mesh, dibuat sekali lalu digambar per frame
+    def __init__(self):
+        self.vertex_buffer = None
+        self.triangle_buffer = None
+        self.line_buffer = None
+        self.vertex_count = 0
+        self.triangle_count = 0
+        self.line_count = 0
+
+    def upload(self, positions, flat_normals, smooth_normals, triangle_indices, line_indices):
+        if self.vertex_buffer is None:
+            self.vertex_buffer, self.triangle_buffer, self.line_buffer = glGenBuffers(3)
+
+        # Posisi dan kedua jenis normal disimpan berurutan dalam satu buffer:
+        # [posisi | normal flat | normal smooth], sehingga ganti shading tidak perlu upload ulang
+        vertex_data = np.concatenate((positions, flat_normals, smooth_normals)).astype(np.float32)
+        self.vertex_count = len(positions)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBufferData(GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        triangle_indices = np.ascontiguousarray(triangle_indices, dtype=np.uint32)
+        line_indices = np.ascontiguousarray(line_indices, dtype=np.uint32)
+        self.triangle_count = len(triangle_indices)
+        self.line_count = len(line_indices)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.triangle_buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, triangle_indices.nbytes, triangle_indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.line_buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, line_indices.nbytes, line_indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def draw(self, mode, smooth=False):
+        # mode: GL_TRIANGLES untuk solid, GL_LINES untuk wireframe
+        if mode == GL_LINES:
+            index_buffer, count = self.line_buffer, self.line_count
+        else:
+            index_buffer, count = self.triangle_buffer, self.triangle_count
+        if count == 0:
+            return
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+        if mode != GL_LINES:
+            glEnableClientState(GL_NORMAL_ARRAY)
+            normal_block = 2 if smooth else 1
+            glNormalPointer(GL_FLOAT, 0, ctypes.c_void_p(self.vertex_count * 12 * normal_block))
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, index_buffer)
+        glDrawElements(mode, count, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        if self.vertex_buffer is not None:
+            glDeleteBuffers(3, [self.vertex_buffer, self.triangle_buffer, self.line_buffer])
+            self.vertex_buffer = self.triangle_buffer = self.line_buffer = None
+
+class TextTextureCache:
+    # Tekstur teks yang sudah di-render, dengan kunci (font, teks, warna) dan eviksi LRU.
+    # Label yang tidak berubah cukup digambar sebagai satu quad bertekstur per frame.
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # kunci -> (texid, width, height)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def upload(surface):
+        surface = pygame.transform.flip(surface, False, True)
+        text_data = pygame.image.tostring(surface, "RGBA", True)
+        width, height = surface.get_size()
+        texid = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texid)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+        return texid, width, height
+
+    def get(self, font, text, color):
+        key = (font, text, tuple(color))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self.upload(font.render(text, True, color))
+        self.entries[key] = entry
+        while len(self.entries) > self.capacity:
+            _, (texid, _, _) = self.entries.popitem(last=False)
+            glDeleteTextures([texid])
+        return entry
+
+    def clear(self):
+        if self.entries:
+            glDeleteTextures([texid for texid, _, _ in self.entries.values()])
+            self.entries.clear()
+
 
 class Object3D:
     def __init__(self, obj_type, vertices=None, faces=None, position=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1), color=(1, 1, 1)):
         self.obj_type = obj_type  # 'cube', 'pyramid', 'loaded'
-        self.vertices = vertices if vertices else []
-        self.faces = faces if faces else []
+        self.vertices = vertices if vertices is not None else []
+        self.faces = faces if faces is not None else []
         self.position = position
         self.rotation = rotation
         self.scale = scale
@@ -19,61 +134,190 @@ class Object3D:
         self.display_mode = GL_FILL
         self.visible = True
         self.normals = []
+        self.vertex_normals = []
+        self.buffers = None
+
+    # Setiap perubahan data mesh menandai buffer GPU perlu dibangun ulang
+    @property
+    def vertices(self):
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, value):
+        self._vertices = np.asarray(value, dtype=np.float32).reshape(-1, 3)
+        self.mesh_dirty = True
+
+    # Face disimpan sebagai array indeks gabungan + offset per face (mendukung segitiga dan quad
+    # sekaligus); bentuk list of list hanya dibangun jika ada yang memintanya
+    @property
+    def faces(self):
+        if self._faces is None:
+            self._faces = [face.tolist() for face in np.split(self.face_indices, self.face_offsets[1:-1])]
+        return self._faces
+
+    @faces.setter
+    def faces(self, value):
+        faces = [list(face) for face in value]
+        counts = [len(face) for face in faces]
+        self.set_face_arrays(
+            np.array([i for face in faces for i in face], dtype=np.int32),
+            np.concatenate(([0], np.cumsum(counts, dtype=np.int64))).astype(np.int32)
+        )
+        self._faces = faces
+
+    def set_face_arrays(self, face_indices, face_offsets):
+        self.face_indices = np.asarray(face_indices, dtype=np.int32)
+        self.face_offsets = np.asarray(face_offsets, dtype=np.int32)
+        self._faces = None
+        self.mesh_dirty = True
+
+    @property
+    def face_count(self):
+        return len(self.face_offsets) - 1
+
+    @property
+    def normals(self):
+        return self._normals
+
+    @normals.setter
+    def normals(self, value):
+        self._normals = value
+        self.mesh_dirty = True
+
+    @property
+    def vertex_normals(self):
+        return self._vertex_normals
+
+    @vertex_normals.setter
+    def vertex_normals(self, value):
+        self._vertex_normals = value
+        self.mesh_dirty = True
+
+    def fan_triangles(self):
+        # Pecah setiap face menjadi segitiga fan (0, k, k+1) untuk k = 1..n-2.
+        # Mengembalikan nomor face tiap segitiga dan posisi ketiga sudutnya di face_indices.
+        counts = np.diff(self.face_offsets).astype(np.int64)
+        tri_per_face = np.maximum(counts - 2, 0)
+        tri_face = np.repeat(np.arange(len(counts)), tri_per_face)
+        tri_first = np.concatenate(([0], np.cumsum(tri_per_face)[:-1]))
+        k = np.arange(len(tri_face)) - np.repeat(tri_first, tri_per_face) + 1
+        base = self.face_offsets[:-1].astype(np.int64)[tri_face]
+        return tri_face, np.stack((base, base + k, base + k + 1), axis=1)
+
+    def build_mesh_arrays(self):
+        # Triangulasi semua face (fan) menjadi array NumPy yang siap diunggah ke GPU.
+        # Setiap sudut face mendapat vertex sendiri agar bisa membawa normal face-nya.
+        counts = np.diff(self.face_offsets).astype(np.int64)
+        if len(counts) == 0 or len(self.vertices) == 0:
+            empty = np.zeros((0, 3), dtype=np.float32)
+            return empty, empty, empty, np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint32)
+
+        corner_indices = self.face_indices
+        starts = self.face_offsets[:-1].astype(np.int64)
+
+        positions = self.vertices[corner_indices]
+
+        if len(self.normals) != self.face_count or len(self.vertex_normals) != len(self.vertices):
+            self.calculate_normals()
+        face_normals = np.asarray(self.normals, dtype=np.float32).reshape(-1, 3)
+        flat_normals = np.repeat(face_normals, counts, axis=0)
+
+        # Normal smooth per sudut diambil dari normal vertex, kecuali pada tepi tajam
+        # (sudut dengan face > SMOOTH_CREASE_ANGLE) agar kubus dan piramida tetap bersudut
+        smooth_normals = np.asarray(self.vertex_normals, dtype=np.float32)[corner_indices]
+        crease = np.einsum('ij,ij->i', flat_normals, smooth_normals) < math.cos(math.radians(SMOOTH_CREASE_ANGLE))
+        smooth_normals[crease] = flat_normals[crease]
+
+        _, triangles = self.fan_triangles()
+        triangle_indices = triangles.ravel()
+
+        # Garis wireframe: setiap sudut terhubung ke sudut berikutnya, sudut terakhir kembali ke awal
+        corner = np.arange(len(corner_indices))
+        next_corner = corner + 1
+        face_end = starts + counts - 1
+        next_corner[face_end] = starts
+        line_indices = np.stack((corner, next_corner), axis=1).ravel()
+
+        return positions, flat_normals, smooth_normals, triangle_indices.astype(np.uint32), line_indices.astype(np.uint32)
+
+    def get_buffers(self):
+        # Bangun ulang buffer GPU hanya jika data mesh berubah
+        if self.buffers is None:
+            self.buffers = MeshBuffers()
+            self.mesh_dirty = True
+        if self.mesh_dirty:
+            self.buffers.upload(*self.build_mesh_arrays())
+            self.mesh_dirty = False
+        return self.buffers
         
     def calculate_normals(self):
-        self.normals = []
-        for face in self.faces:
-            if len(face) >= 3:
-                v1 = np.array(self.vertices[face[0]])
-                v2 = np.array(self.vertices[face[1]])
-                v3 = np.array(self.vertices[face[2]])
-                
-                # Hitung dua vektor dari tiga titik
-                vector1 = v2 - v1
-                vector2 = v3 - v1
-                
-                # Hitung perkalian silang untuk mendapatkan normal
-                normal = np.cross(vector1, vector2)
-                
-                # Normalisasi vektor normal
-                norm = np.linalg.norm(normal)
-                if norm != 0:
-                    normal = normal / norm
-                
-                self.normals.append(normal)
-            else:
-                self.normals.append((0, 0, 1))
-                
+        # Hitung semua normal sekaligus: setiap face dipecah menjadi segitiga fan, lalu
+        # cross product tiap segitiga (panjangnya = 2x luas segitiga) dijumlahkan per face.
+        # Vektor face yang belum dinormalisasi itu dijumlahkan ke setiap sudutnya sehingga
+        # normal vertex terbobot luas face.
+        face_count = self.face_count
+        vertex_count = len(self.vertices)
+        counts = np.diff(self.face_offsets)
+        tri_face, triangles = self.fan_triangles()
+
+        vertices = self.vertices.astype(np.float64)
+        tri_vertices = self.face_indices[triangles]
+        v1 = vertices[tri_vertices[:, 0]]
+        v2 = vertices[tri_vertices[:, 1]]
+        v3 = vertices[tri_vertices[:, 2]]
+        cross = np.cross(v2 - v1, v3 - v1)
+
+        face_normals = np.zeros((face_count, 3))
+        vertex_normals = np.zeros((vertex_count, 3))
+        for axis in range(3):
+            face_normals[:, axis] = np.bincount(tri_face, weights=cross[:, axis], minlength=face_count)
+            vertex_normals[:, axis] = np.bincount(self.face_indices, weights=np.repeat(face_normals[:, axis], counts),
+                                                  minlength=vertex_count)
+
+        # Face dengan kurang dari 3 vertex tidak punya normal; pakai arah default (0, 0, 1)
+        face_normals[np.diff(self.face_offsets) < 3] = (0, 0, 1)
+
+        self.normals = self._normalize(face_normals)
+        self.vertex_normals = self._normalize(vertex_normals)
+
+    @staticmethod
+    def _normalize(vectors):
+        lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, lengths, out=vectors, where=lengths != 0)
+        return vectors.astype(np.float32)
+
     def load_obj_file(self, file_path):
         # Muat objek dari file .obj
-        vertices = []
-        faces = []
-        
         try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    if line.startswith('#'):
-                        continue
-                        
-                    values = line.split()
-                    if not values:
-                        continue
-                        
-                    if values[0] == 'v':
-                        # Posisi vertex
-                        vertex = [float(values[1]), float(values[2]), float(values[3])]
-                        vertices.append(vertex)
-                    elif values[0] == 'f':
-                        face = []
-                        for v in values[1:]:
-                            w = v.split('/')
-                            face.append(int(w[0]) - 1)
-                        faces.append(face)
-            self.vertices = vertices
-            self.faces = faces
+            mesh = read_mesh_cache(file_path)
+            if mesh is not None:
+                # Cache biner masih cocok dengan file sumber: pakai array yang di-memory-map
+                self.vertices = mesh.vertices
+                self.set_face_arrays(mesh.face_indices, mesh.face_offsets)
+                if mesh.face_normals is not None and mesh.vertex_normals is not None:
+                    self.normals = mesh.face_normals
+                    self.vertex_normals = mesh.vertex_normals
+                else:
+                    self.calculate_normals()
+                print(f"Loaded OBJ file: {file_path} (cache)")
+                print(f"Vertices: {len(self.vertices)}, Faces: {self.face_count}")
+                print(f"Cache loaded in {mesh.parse_time * 1000:.1f} ms")
+                return True
+
+            mesh = parse_obj_file(file_path)
+            self.vertices = mesh.vertices
+            self.set_face_arrays(mesh.face_indices, mesh.face_offsets)
             self.calculate_normals()
             print(f"Loaded OBJ file: {file_path}")
-            print(f"Vertices: {len(self.vertices)}, Faces: {len(self.faces)}")
+            print(f"Vertices: {len(self.vertices)}, Faces: {self.face_count}")
+            print(f"Parsed {mesh.file_size / (1024 * 1024):.2f} MB in {mesh.parse_time * 1000:.1f} ms ({mesh.throughput:.1f} MB/s)")
+
+            mesh.face_normals = self.normals
+            mesh.vertex_normals = self.vertex_normals
+            try:
+                write_mesh_cache(file_path, mesh)
+            except OSError as e:
+                print(f"Warning: cache mesh tidak dapat ditulis: {e}")
             return True
         except Exception as e:
             print(f"Error loading OBJ file: {e}")
@@ -92,16 +336,15 @@ class Graphics3DApp:
                 obj.scale = tuple(max(0.05, s * factor) for s in obj.scale)
                 self.set_status_message(f"Skala objek: {obj.scale}")
                 break
-    def draw_pygame_text(self, surface, x, y):
-        # Render surface pygame (teks) sebagai tekstur OpenGL di (x, y).
-        surface = pygame.transform.flip(surface, False, True)
-        text_data = pygame.image.tostring(surface, "RGBA", True)
-        width, height = surface.get_size()
-        texid = glGenTextures(1)
+    def draw_text(self, font, text, color, x, y, center=False):
+        texid, width, height = self.text_cache.get(font, text, color)
+        if center:
+            x -= width // 2
+            y -= height // 2
+        self.draw_text_texture(texid, x, y, width, height)
+
+    def draw_text_texture(self, texid, x, y, width, height):
         glBindTexture(GL_TEXTURE_2D, texid)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
         glEnable(GL_TEXTURE_2D)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
@@ -114,7 +357,6 @@ class Graphics3DApp:
         glEnd()
         glDisable(GL_TEXTURE_2D)
         glDisable(GL_BLEND)
-        glDeleteTextures([texid])
     def __init__(self):
         self.width = 800
         self.height = 600
@@ -154,6 +396,18 @@ class Graphics3DApp:
         # Kondisi dialog file
         self.file_dialog_open = False
         self.obj_file_path = None
+
+        # Cache tekstur untuk label UI, pesan status, dan overlay profiler
+        self.text_cache = TextTextureCache()
+
+        # Grid XZ dan sumbu XYZ tidak pernah berubah: dikompilasi sekali ke display list
+        self.grid_layer = StaticLayer(self.draw_grid)
+        self.axes_layer = StaticLayer(self.draw_axes)
+
+        # Profiler per tahap render (F12: overlay, Shift+F12: sinkronisasi GPU)
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.profiler_lines = []
         
         # Inisialisasi Pygame dan OpenGL
         pygame.init()
@@ -173,6 +427,7 @@ class Graphics3DApp:
         pygame.font.init()
         self.ui_font = pygame.font.SysFont('Arial', 14, bold=True)
         self.status_font = pygame.font.SysFont('Arial', 20, bold=True)
+        self.profiler_font = pygame.font.SysFont('monospace', 13)
         # Aktifkan pencahayaan
         glEnable(GL_LIGHTING)
         glEnable(GL_LIGHT0)
@@ -447,13 +702,11 @@ class Graphics3DApp:
                 glVertex2f(button['x'], button['y'] + button['height'])
                 glEnd()
                 glColor4f(1, 1, 1, 1)
-                text_surface = self.ui_font.render(button['label'], True, (255, 255, 0))
-                text_rect = text_surface.get_rect(center=(button['x'] + button['width']//2, button['y'] + button['height']//2))
+                center_x = button['x'] + button['width']//2
+                center_y = button['y'] + button['height']//2
                 shadow_offset = 1
-                shadow_surface = self.ui_font.render(button['label'], True, (0, 0, 0))
-                shadow_rect = shadow_surface.get_rect(center=(text_rect.centerx + shadow_offset, text_rect.centery + shadow_offset))
-                self.draw_pygame_text(shadow_surface, shadow_rect.left, shadow_rect.top)
-                self.draw_pygame_text(text_surface, text_rect.left, text_rect.top)
+                self.draw_text(self.ui_font, button['label'], (0, 0, 0), center_x + shadow_offset, center_y + shadow_offset, center=True)
+                self.draw_text(self.ui_font, button['label'], (255, 255, 0), center_x, center_y, center=True)
         glEnable(GL_DEPTH_TEST)
         if self.ambient_enabled or self.diffuse_enabled or self.specular_enabled:
             glEnable(GL_LIGHTING)
@@ -507,62 +760,22 @@ class Graphics3DApp:
         else:
             glColor3f(*obj.color)
         
-        # Gambar setiap face dari objek
-        for i, face in enumerate(obj.faces):
-            if i < len(obj.normals) and glIsEnabled(GL_LIGHTING):
-                glNormal3f(*obj.normals[i])
-
-            if obj.display_mode == GL_LINE_LOOP:
-                glDisable(GL_LIGHTING)
-                glColor3f(*obj.color)
-                glBegin(GL_LINE_LOOP)
-                for vertex_idx in face:
-                    glVertex3f(*obj.vertices[vertex_idx])
-                glEnd()
-                if self.ambient_enabled or self.diffuse_enabled or self.specular_enabled:
-                    glEnable(GL_LIGHTING)
-            else:
-                if len(face) == 3:
-                    # Segitiga
-                    glBegin(GL_TRIANGLES)
-                    for vertex_idx in face:
-                        if i < len(obj.normals):
-                            glNormal3f(*obj.normals[i])
-                        glVertex3f(*obj.vertices[vertex_idx])
-                    glEnd()
-                elif len(face) == 4:
-                    glBegin(GL_TRIANGLES)
-                    # Segitiga 1: vertex 0,1,2
-                    if i < len(obj.normals):
-                        glNormal3f(*obj.normals[i])
-                    glVertex3f(*obj.vertices[face[0]])
-                    glVertex3f(*obj.vertices[face[1]])
-                    glVertex3f(*obj.vertices[face[2]])
-                    # Segitiga 2: vertex 0,2,3
-                    glVertex3f(*obj.vertices[face[0]])
-                    glVertex3f(*obj.vertices[face[2]])
-                    glVertex3f(*obj.vertices[face[3]])
-                    glEnd()
-                else:
-                    glBegin(GL_POLYGON)
-                    for vertex_idx in face:
-                        if i < len(obj.normals):
-                            glNormal3f(*obj.normals[i])
-                        glVertex3f(*obj.vertices[vertex_idx])
-                    glEnd()
+        # Gambar seluruh face dari buffer GPU dengan satu draw call
+        buffers = obj.get_buffers()
+        if obj.display_mode == GL_LINE_LOOP:
+            glDisable(GL_LIGHTING)
+            glColor3f(*obj.color)
+            buffers.draw(GL_LINES)
+            if self.ambient_enabled or self.diffuse_enabled or self.specular_enabled:
+                glEnable(GL_LIGHTING)
+        else:
+            buffers.draw(GL_TRIANGLES, smooth=self.shading_model == 'phong')
         
         glPopMatrix()
     
-    def render_scene(self):
-        # Atur latar belakang abu-abu terang
-        glClearColor(0.92, 0.92, 0.92, 1.0)
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-
-        # Gambar grid pada bidang XZ
-        glDisable(GL_LIGHTING)
+    @staticmethod
+    def draw_grid(grid_size):
         glColor3f(0.8, 0.8, 0.8)
-        grid_size = 10
-        grid_step = 1
         glLineWidth(1)
         glBegin(GL_LINES)
         for i in range(-grid_size, grid_size + 1):
@@ -574,7 +787,8 @@ class Graphics3DApp:
             glVertex3f(i, 0, grid_size)
         glEnd()
 
-        # Gambar sumbu XYZ
+    @staticmethod
+    def draw_axes():
         glLineWidth(2)
         glBegin(GL_LINES)
         # Sumbu X - Merah
@@ -592,15 +806,33 @@ class Graphics3DApp:
         glEnd()
         glLineWidth(1)
 
+    def render_scene(self):
+        profiler = self.profiler
+        profiler.begin_frame()
+
+        # Atur latar belakang abu-abu terang
+        glClearColor(0.92, 0.92, 0.92, 1.0)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+        # Gambar grid pada bidang XZ
+        with profiler.stage('grid'):
+            glDisable(GL_LIGHTING)
+            self.grid_layer.draw(10)
+
+        # Gambar sumbu XYZ
+        with profiler.stage('axes'):
+            self.axes_layer.draw()
+
         # Gambar matahari sebagai bola kuning
-        from OpenGL.GLU import gluNewQuadric, gluSphere, gluDeleteQuadric
-        glPushMatrix()
-        glTranslatef(*self.light_position)
-        glColor3f(1.0, 1.0, 0.0)  # Kuning terang
-        quad = gluNewQuadric()
-        gluSphere(quad, 0.3, 16, 16)
-        gluDeleteQuadric(quad)
-        glPopMatrix()
+        with profiler.stage('sun'):
+            from OpenGL.GLU import gluNewQuadric, gluSphere, gluDeleteQuadric
+            glPushMatrix()
+            glTranslatef(*self.light_position)
+            glColor3f(1.0, 1.0, 0.0)  # Kuning terang
+            quad = gluNewQuadric()
+            gluSphere(quad, 0.3, 16, 16)
+            gluDeleteQuadric(quad)
+            glPopMatrix()
 
         if self.ambient_enabled or self.diffuse_enabled or self.specular_enabled:
             glEnable(GL_LIGHTING)
@@ -609,17 +841,83 @@ class Graphics3DApp:
         self.update_camera()
 
         # Render semua objek
-        for obj in self.objects:
-            if obj.obj_type == self.current_object_type or self.current_object_type == 'all':
-                self.render_object(obj)
+        with profiler.stage('objects'):
+            for obj in self.objects:
+                if obj.obj_type == self.current_object_type or self.current_object_type == 'all':
+                    self.render_object(obj)
 
-        self.render_ui()
-        self.render_text()
-        self.render_status_message()
+        with profiler.stage('ui'):
+            self.render_ui()
+            self.render_text()
+        with profiler.stage('status'):
+            self.render_status_message()
+        if self.show_profiler:
+            with profiler.stage('overlay'):
+                self.render_profiler_overlay()
 
         # Perbarui tampilan
-        pygame.display.flip()
+        with profiler.stage('flip'):
+            pygame.display.flip()
+        profiler.end_frame()
     
+    def render_profiler_overlay(self):
+        """Render rata-rata waktu per tahap di pojok kanan bawah layar"""
+        # Teks diperbarui beberapa kali per detik saja agar angka mudah dibaca
+        if not self.profiler_lines or self.profiler.frame_index % 15 == 0:
+            self.profiler_lines = self.profiler.report_lines()
+        lines = self.profiler_lines
+
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluOrtho2D(0, self.width, self.height, 0)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        glDisable(GL_DEPTH_TEST)
+        glDisable(GL_LIGHTING)
+
+        line_height = 16
+        panel_width = 260
+        panel_height = len(lines) * line_height + 10
+        x = self.width - panel_width - 10
+        y = self.height - panel_height - 10
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glColor4f(0.0, 0.0, 0.0, 0.7)
+        glBegin(GL_QUADS)
+        glVertex2f(x, y)
+        glVertex2f(x + panel_width, y)
+        glVertex2f(x + panel_width, y + panel_height)
+        glVertex2f(x, y + panel_height)
+        glEnd()
+        glDisable(GL_BLEND)
+
+        for i, line in enumerate(lines):
+            self.draw_text(self.profiler_font, line, (255, 255, 255), x + 6, y + 5 + i * line_height)
+
+        glEnable(GL_DEPTH_TEST)
+        if self.ambient_enabled or self.diffuse_enabled or self.specular_enabled:
+            glEnable(GL_LIGHTING)
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopMatrix()
+
+    def toggle_profiler(self, sync=False):
+        if sync:
+            self.profiler.sync = None if self.profiler.sync else glFinish
+            self.profiler.reset()
+            self.set_status_message(f"Sinkronisasi GPU profiler {'aktif' if self.profiler.sync else 'nonaktif'}")
+            return
+        self.show_profiler = not self.show_profiler
+        self.profiler.enabled = self.show_profiler or bool(self.profiler.sinks)
+        self.profiler_lines = []
+        self.set_status_message(f"Profiler {'ditampilkan' if self.show_profiler else 'disembunyikan'}")
+
     # Metode interaksi UI
     def toggle_ui(self):
         self.ui_active = not self.ui_active
@@ -636,6 +934,7 @@ class Graphics3DApp:
             "W: Toggle wireframe/solid",
             "A/D/S: Toggle ambient/diffuse/specular lighting",
             "P: Toggle Phong/Flat shading",
+            "F12: Toggle profiler (Shift+F12: sinkronisasi GPU)",
             "ESC: Keluar"
         ]
         help_text = "\n".join(controls)
@@ -756,6 +1055,8 @@ class Graphics3DApp:
 
         elif event.key == pygame.K_TAB:
             self.toggle_camera_mode()
+        elif event.key == pygame.K_F12:
+            self.toggle_profiler(sync=bool(event.mod & pygame.KMOD_SHIFT))
 
         elif event.key in (pygame.K_PLUS, pygame.K_EQUALS):  # + untuk membesar
             self.scale_current_object(1.1)
@@ -867,6 +1168,7 @@ class Graphics3DApp:
         print("  R: Reset posisi kamera")
         print("  U: Toggle UI")
         print("  H: Tampilkan bantuan")
+        print("  F12: Toggle overlay profiler (Shift+F12: sinkronisasi GPU)")
         print("  ESC: Keluar")
         print()
         print("ANTARMUKA:")
@@ -922,13 +1224,9 @@ class Graphics3DApp:
         glLineWidth(1.0)
 
         shadow_offset = 2
-        shadow_surface = self.status_font.render(self.status_message, True, (0, 0, 0))
-        text_surface = self.status_font.render(self.status_message, True, (255, 255, 0))
-        text_rect = text_surface.get_rect(center=(self.width//2, status_height//2))
-        shadow_rect = shadow_surface.get_rect(center=(text_rect.centerx + shadow_offset, text_rect.centery + shadow_offset))
-
-        self.draw_pygame_text(shadow_surface, shadow_rect.left, shadow_rect.top)
-        self.draw_pygame_text(text_surface, text_rect.left, text_rect.top)
+        center_x, center_y = self.width//2, status_height//2
+        self.draw_text(self.status_font, self.status_message, (0, 0, 0), center_x + shadow_offset, center_y + shadow_offset, center=True)
+        self.draw_text(self.status_font, self.status_message, (255, 255, 0), center_x, center_y, center=True)
 
         glEnable(GL_DEPTH_TEST)
         if self.ambient_enabled or self.diffuse_enabled or self.specular_enabled:
@@ -962,8 +1260,40 @@ class Graphics3DApp:
         pygame.quit()
         sys.exit()
 
+def warm_mesh_caches(paths, force=False):
+    # Bangun cache biner untuk semua file .obj pada path (file atau folder, rekursif)
+    obj_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                obj_files.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith('.obj'))
+        else:
+            obj_files.append(path)
+
+    failed = 0
+    for file_path in obj_files:
+        if force and os.path.exists(cache_path_for(file_path)):
+            os.remove(cache_path_for(file_path))
+        if not Object3D('loaded').load_obj_file(file_path):
+            failed += 1
+    print(f"Cache siap: {len(obj_files) - failed}/{len(obj_files)} file OBJ")
+    return failed == 0
+
 def main():
+    parser = argparse.ArgumentParser(description="Aplikasi Grafika 3D Interaktif")
+    parser.add_argument('--warm-cache', nargs='+', metavar='PATH',
+                        help="Bangun cache mesh untuk file/folder OBJ lalu keluar")
+    parser.add_argument('--force', action='store_true', help="Bangun ulang cache meskipun masih valid")
+    parser.add_argument('--profile', type=int, nargs='?', const=60, metavar='FRAMES',
+                        help="Cetak rata-rata waktu per tahap render setiap FRAMES frame")
+    args = parser.parse_args()
+
+    if args.warm_cache:
+        sys.exit(0 if warm_mesh_caches(args.warm_cache, args.force) else 1)
+
     app = Graphics3DApp()
+    if args.profile:
+        app.profiler.add_sink(LogSink(every=args.profile))
     app.run()
 
 if __name__ == "__main__":
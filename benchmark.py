@@ -0,0 +1,356 @@
+# Benchmark headless untuk loop render aplikasi 2D dan 3D.
+#
+# Kedua aplikasi dijalankan tanpa layar. Backend 'stub' mengganti semua fungsi
+# GL/GLU dengan pencatat panggilan (mengukur biaya sisi Python), sedangkan
+# backend 'egl' membuat konteks OpenGL software offscreen (Mesa) sehingga
+# perintah GL benar-benar dieksekusi. Hasil ditulis sebagai JSON agar bisa
+# dibandingkan antar commit (lihat --compare).
+#
+# Contoh:
+#   python benchmark.py --output bench.json
+#   python benchmark.py --backend egl --scene 3d-mesh-solid --frames 60
+#   python benchmark.py --compare bench_lama.json > bench_baru.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from collections import Counter
+from contextlib import redirect_stdout
+
+WIDTH, HEIGHT = 800, 600
+BASE_MESH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'FinalBaseMesh.obj')
+
+
+class GLCallRecorder:
+    """Menghitung panggilan GL/GLU per frame; pada backend stub panggilan tidak diteruskan"""
+    # Nilai kembali untuk fungsi yang hasilnya dipakai oleh aplikasi
+    STUB_RESULTS = {
+        'glIsEnabled': True,
+        'glGetError': 0,
+        'glGenLists': 1,
+    }
+
+    def __init__(self, passthrough):
+        self.passthrough = passthrough
+        self.calls = Counter()
+
+    def wrap(self, name, func):
+        calls = self.calls
+        if self.passthrough:
+            def recorded(*args, **kwargs):
+                calls[name] += 1
+                return func(*args, **kwargs)
+        else:
+            result = self.STUB_RESULTS.get(name)
+            generator = name in ('glGenBuffers', 'glGenTextures')
+
+            def recorded(*args, **kwargs):
+                calls[name] += 1
+                if generator:
+                    count = args[0] if args else 1
+                    return 1 if count == 1 else list(range(1, count + 1))
+                if name == 'gluNewQuadric':
+                    return object()
+                return result
+        recorded.__name__ = name
+        return recorded
+
+    def install(self):
+        # Harus dipanggil sebelum modul aplikasi diimpor: `from OpenGL.GL import *`
+        # akan mengambil fungsi yang sudah dibungkus dari namespace modul OpenGL
+        import OpenGL.GL
+        import OpenGL.GLU
+        for module, prefix in ((OpenGL.GL, 'gl'), (OpenGL.GLU, 'glu')):
+            for name in dir(module):
+                value = getattr(module, name)
+                if name.startswith(prefix) and callable(value):
+                    setattr(module, name, self.wrap(name, value))
+
+    def take(self):
+        total = sum(self.calls.values())
+        self.calls.clear()
+        return total
+
+
+def create_egl_context(width, height):
+    # Konteks OpenGL offscreen (pbuffer) lewat EGL, tanpa server display
+    import ctypes
+    from OpenGL import EGL
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    if not EGL.eglInitialize(display, None, None):
+        raise RuntimeError("eglInitialize gagal")
+    config_attribs = (EGL.EGLint * 13)(
+        EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+        EGL.EGL_DEPTH_SIZE, 24,
+        EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+        EGL.EGL_NONE
+    )
+    config = EGL.EGLConfig()
+    count = EGL.EGLint()
+    EGL.eglChooseConfig(display, config_attribs, ctypes.pointer(config), 1, ctypes.pointer(count))
+    if count.value == 0:
+        raise RuntimeError("Tidak ada konfigurasi EGL yang cocok")
+    surface_attribs = (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+    surface = EGL.eglCreatePbufferSurface(display, config, surface_attribs)
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+    if not EGL.eglMakeCurrent(display, surface, surface, context):
+        raise RuntimeError("eglMakeCurrent gagal")
+
+
+def setup_backend(backend):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    if backend == 'egl':
+        os.environ['PYOPENGL_PLATFORM'] = 'egl'
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+    recorder = GLCallRecorder(passthrough=(backend == 'egl'))
+    recorder.install()
+    if backend == 'egl':
+        create_egl_context(WIDTH, HEIGHT)
+
+    # Aplikasi tidak membuka jendela; set_mode hanya mengembalikan surface biasa
+    import pygame
+    pygame.display.set_mode = lambda size, flags=0, *args, **kwargs: pygame.Surface(size)
+    pygame.display.set_caption = lambda *args, **kwargs: None
+    pygame.display.flip = lambda: None
+    return recorder
+
+
+# Skenario: setup(app, options) dipanggil sekali, step(app, frame) sebelum setiap frame
+def setup_2d_primitives(app, options):
+    from pro2d.stress import generate_scene
+    if options.scene_file:
+        # Scene dari file (Ctrl+S / Ctrl+J di aplikasi 2D) menggantikan primitif acak
+        if not app.load_scene(options.scene_file):
+            raise RuntimeError(f"Gagal memuat {options.scene_file}")
+        options.objects = len(app.objects)
+    else:
+        # spread > 1 menyebar objek ke luar viewport (hanya sebagian yang terlihat)
+        bounds = [value * options.spread for value in app.ortho_bounds]
+        generate_scene(app, options.objects, options.seed, bounds=bounds)
+
+    if options.clipping:
+        app.window_bounds = [-200, 200, -150, 150]
+        app.window_angle = options.window_angle
+        app.window_active = True
+        app.clipping_enabled = True
+
+
+def step_2d_move_window(app, frame):
+    # Geser window bolak-balik seperti menekan F3/F4
+    if app.window_active:
+        shift = 20 if (frame // 10) % 2 == 0 else -20
+        app.window_bounds[0] += shift
+        app.window_bounds[1] += shift
+
+
+def setup_3d_mesh(display_mode):
+    def setup(app, options):
+        if not app.load_obj_file(BASE_MESH):
+            raise RuntimeError(f"Gagal memuat {BASE_MESH}")
+        app.set_display_mode(display_mode)
+    return setup
+
+
+def step_3d_rotate(app, frame):
+    for obj in app.objects:
+        if obj.obj_type == app.current_object_type:
+            rx, ry, rz = obj.rotation
+            obj.rotation = (rx, ry + 2.0, rz)
+
+
+SCENES = {
+    '2d-primitives-clip': ('2d', setup_2d_primitives, step_2d_move_window,
+                           {'clipping': True, 'window_angle': 0.0, 'spread': 1.0}),
+    # Window dirotasi: clipping lewat Cyrus-Beck dan Sutherland-Hodgman untuk window konveks
+    '2d-primitives-clip-rotated': ('2d', setup_2d_primitives, step_2d_move_window,
+                                   {'clipping': True, 'window_angle': 30.0, 'spread': 1.0}),
+    # Sebagian besar objek di luar layar: mengukur culling viewport lewat SceneBVH
+    '2d-primitives-offscreen': ('2d', setup_2d_primitives, step_2d_move_window,
+                                {'clipping': True, 'window_angle': 0.0, 'spread': 4.0}),
+    '2d-primitives': ('2d', setup_2d_primitives, None, {'clipping': False, 'spread': 1.0}),
+    '3d-mesh-solid': ('3d', setup_3d_mesh('solid'), step_3d_rotate, {}),
+    '3d-mesh-wireframe': ('3d', setup_3d_mesh('wireframe'), step_3d_rotate, {}),
+}
+
+
+def create_app(kind):
+    if kind == '2d':
+        from pro2d.core import Graphics2DApp
+        app = Graphics2DApp()
+        return app, app.render
+    from Objek3d import Graphics3DApp
+    app = Graphics3DApp()
+    return app, app.render_scene
+
+
+def percentiles(values):
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+    return {
+        'mean': sum(ordered) / len(ordered),
+        'p50': pick(50), 'p90': pick(90), 'p99': pick(99),
+        'min': ordered[0], 'max': ordered[-1],
+    }
+
+
+def run_scene(name, recorder, options):
+    kind, setup, step, scene_options = SCENES[name]
+    for key, value in scene_options.items():
+        setattr(options, key, value)
+
+    app, render = create_app(kind)
+    setup(app, options)
+    finish = None
+    if options.backend == 'egl':
+        from OpenGL.GL import glFinish
+        finish = glFinish
+
+    def frame(index):
+        if step:
+            step(app, index)
+        render()
+        if finish:
+            finish()
+
+    for i in range(options.warmup):
+        frame(i)
+    recorder.take()
+
+    frame_ms = []
+    gl_calls = []
+    for i in range(options.frames):
+        start = time.perf_counter()
+        frame(i)
+        frame_ms.append((time.perf_counter() - start) * 1000.0)
+        gl_calls.append(recorder.take())
+
+    # Alokasi diukur di putaran terpisah karena tracemalloc memperlambat eksekusi
+    alloc_kb = []
+    alloc_blocks = []
+    tracemalloc.start()
+    for i in range(options.alloc_frames):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        frame(i)
+        _, peak = tracemalloc.get_traced_memory()
+        alloc_kb.append((peak - base) / 1024.0)
+        alloc_blocks.append(sys.getallocatedblocks() - blocks)
+    tracemalloc.stop()
+    recorder.take()
+
+    # Rincian per tahap dari FrameProfiler aplikasi, juga di putaran terpisah
+    stage_totals = Counter()
+
+    def collect(frame_index, frame_ms, stages):
+        stage_totals.update(stages)
+    app.profiler.add_sink(collect)
+    for i in range(options.stage_frames):
+        frame(i)
+    app.profiler.remove_sink(collect)
+    app.profiler.enabled = False
+    recorder.take()
+
+    return {
+        'app': kind,
+        'frames': options.frames,
+        'objects': options.objects if kind == '2d' else len(app.objects),
+        'frame_ms': percentiles(frame_ms),
+        'fps_mean': 1000.0 / (sum(frame_ms) / len(frame_ms)) if frame_ms else 0.0,
+        'gl_calls_per_frame': percentiles(gl_calls),
+        'alloc_peak_kb_per_frame': percentiles(alloc_kb),
+        'alloc_net_blocks_per_frame': percentiles(alloc_blocks),
+        'stage_ms_mean': {name: total / options.stage_frames for name, total in stage_totals.items()}
+                         if options.stage_frames else {},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path, file=sys.stdout):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"{'scene':<22}{'p50 ms (lama)':>15}{'p50 ms (baru)':>15}{'rasio':>8}{'GL/frame (lama)':>17}{'GL/frame (baru)':>17}", file=file)
+    for name, result in current['scenes'].items():
+        old = baseline.get('scenes', {}).get(name)
+        if not old:
+            continue
+        old_ms, new_ms = old['frame_ms']['p50'], result['frame_ms']['p50']
+        ratio = new_ms / old_ms if old_ms else float('nan')
+        print(f"{name:<22}{old_ms:>15.2f}{new_ms:>15.2f}{ratio:>8.2f}"
+              f"{old['gl_calls_per_frame']['mean']:>17.0f}{result['gl_calls_per_frame']['mean']:>17.0f}", file=file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless untuk aplikasi grafika 2D dan 3D")
+    parser.add_argument('--backend', choices=('stub', 'egl'), default='stub',
+                        help="stub: GL dicatat tanpa dieksekusi; egl: konteks OpenGL software offscreen")
+    parser.add_argument('--scene', action='append', choices=sorted(SCENES),
+                        help="Skenario yang dijalankan (default: semua)")
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--alloc-frames', type=int, default=10)
+    parser.add_argument('--stage-frames', type=int, default=10, help="Frame untuk rincian waktu per tahap")
+    parser.add_argument('--objects', type=int, default=10000, help="Jumlah primitif acak untuk skenario 2D")
+    parser.add_argument('--scene-file', help="File scene 2D (.npz/.json) sebagai pengganti primitif acak")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="Tulis hasil JSON ke file (default: stdout)")
+    parser.add_argument('--compare', metavar='JSON', help="Bandingkan dengan hasil benchmark sebelumnya")
+    options = parser.parse_args()
+
+    recorder = setup_backend(options.backend)
+    scenes = options.scene or list(SCENES)
+
+    result = {
+        'meta': {
+            'revision': git_revision(),
+            'backend': options.backend,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'frames': options.frames,
+            'seed': options.seed,
+            'scene_file': options.scene_file,
+        },
+        'scenes': {},
+    }
+    for name in scenes:
+        print(f"Menjalankan {name}...", file=sys.stderr)
+        # Pesan dari aplikasi diarahkan ke stderr agar stdout hanya berisi JSON
+        with redirect_stdout(sys.stderr):
+            result['scenes'][name] = run_scene(name, recorder, options)
+
+    text = json.dumps(result, indent=2)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if options.compare:
+        # Tanpa --output stdout berisi JSON, jadi tabel perbandingan ditulis ke stderr
+        compare(result, options.compare, sys.stdout if options.output else sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+# Benchmark skala untuk aplikasi 2D: waktu setiap tahap pada jumlah objek yang makin besar.
+#
+# Untuk setiap ukuran, scene acak dibuat ulang dengan pro2d.stress.generate_scene (seed tetap),
+# lalu diukur:
+#   create    - membuat dan menambahkan semua objek (termasuk Transform2D jika --transformed)
+#   pick      - --picks kali pick_object pada titik acak (SceneBVH.query_point + jarak ke objek)
+#   clip      - Renderer.clip_scene seluruh scene dengan cache kosong
+#   render    - satu frame render() dengan window clipping aktif (median --repeat frame)
+#   transform - translate_group, rotate_group, dan scale_group pada semua objek
+# Hasilnya dicetak sebagai kurva skala: waktu (ms) per ukuran dan eksponen log-log terhadap
+# ukuran sebelumnya (~1 linear, ~2 kuadratik), sehingga regresi pada satu tahap langsung terlihat.
+#
+# Contoh:
+#   python benchmark_scaling.py
+#   python benchmark_scaling.py --sizes 1,100,10000,1000000 --transformed 0.25 --output skala.json
+#   python benchmark_scaling.py --compare skala_lama.json
+
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+from contextlib import redirect_stdout
+
+from benchmark import setup_backend, git_revision
+
+DEFAULT_SIZES = (1, 10, 100, 1000, 10000, 100000)
+STAGES = ('create', 'pick', 'clip', 'render', 'transform')
+WINDOW_BOUNDS = [-200, 200, -150, 150]
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2.0
+
+
+def timed(func, repeat=1):
+    # Median waktu (ms) dari repeat kali pemanggilan func
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return median(samples)
+
+
+def measure(size, options):
+    from pro2d.core import Graphics2DApp
+    from pro2d.render import Renderer, SceneClip
+    from pro2d.stress import generate_scene
+    from pro2d.transform import Transform2D
+
+    app = Graphics2DApp()
+    finish = None
+    if options.backend == 'egl':
+        from OpenGL.GL import glFinish
+        finish = glFinish
+
+    result = {}
+    objects = []
+
+    def create():
+        objects.extend(generate_scene(app, size, options.seed, options.transformed))
+    result['create'] = timed(create)
+
+    rng = random.Random(options.seed)
+    left, right, bottom, top = app.ortho_bounds
+    points = [(rng.uniform(left, right), rng.uniform(bottom, top)) for _ in range(options.picks)]
+
+    def pick():
+        for x, y in points:
+            app.pick_object(x, y)
+    app.pick_object(0.0, 0.0)   # BVH dibangun di luar pengukuran
+    result['pick'] = timed(pick, options.repeat)
+
+    result['clip'] = timed(lambda: Renderer.clip_scene(app.objects, WINDOW_BOUNDS, SceneClip()), options.repeat)
+
+    app.window_bounds = list(WINDOW_BOUNDS)
+    app.window_active = True
+    app.clipping_enabled = True
+
+    def render():
+        app.render()
+        if finish:
+            finish()
+    render()
+    result['render'] = timed(render, options.repeat)
+
+    def transform():
+        Transform2D.translate_group(objects, 5.0, -5.0)
+        Transform2D.rotate_group(objects, 15.0, 0.0, 0.0)
+        Transform2D.scale_group(objects, 1.1, 0.9, 0.0, 0.0)
+    result['transform'] = timed(transform)
+    return result
+
+
+def exponent(size, ms, previous_size, previous_ms):
+    # Kemiringan log-log antara dua ukuran: waktu ~ ukuran ** eksponen
+    if previous_size is None or previous_ms <= 0 or ms <= 0:
+        return None
+    return math.log(ms / previous_ms) / math.log(size / previous_size)
+
+
+def print_curves(rows):
+    header = f"{'objek':>10}" + ''.join(f"{stage:>12}" for stage in STAGES)
+    print("Waktu per tahap (ms):")
+    print(header)
+    for row in rows:
+        print(f"{row['objects']:>10}" + ''.join(f"{row['ms'][stage]:>12.2f}" for stage in STAGES))
+
+    print("\nEksponen skala terhadap ukuran sebelumnya (waktu ~ n ** k):")
+    print(header)
+    previous = None
+    for row in rows:
+        cells = []
+        for stage in STAGES:
+            k = None
+            if previous is not None:
+                k = exponent(row['objects'], row['ms'][stage], previous['objects'], previous['ms'][stage])
+            cells.append(f"{k:>12.2f}" if k is not None else f"{'-':>12}")
+        print(f"{row['objects']:>10}" + ''.join(cells))
+        previous = row
+
+
+def compare(rows, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {row['objects']: row for row in json.load(f).get('sizes', [])}
+    print("\nRasio waktu terhadap baseline (baru / lama):")
+    print(f"{'objek':>10}" + ''.join(f"{stage:>12}" for stage in STAGES))
+    for row in rows:
+        old = baseline.get(row['objects'])
+        if not old:
+            continue
+        cells = []
+        for stage in STAGES:
+            old_ms = old['ms'].get(stage)
+            cells.append(f"{row['ms'][stage] / old_ms:>12.2f}" if old_ms else f"{'-':>12}")
+        print(f"{row['objects']:>10}" + ''.join(cells))
+
+
+def parse_sizes(text):
+    sizes = sorted({int(float(value)) for value in text.split(',') if value.strip()})
+    if not sizes or sizes[0] < 1:
+        raise argparse.ArgumentTypeError("Ukuran harus bilangan bulat >= 1, mis. 1,100,10000")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skala aplikasi 2D (1 hingga 1M objek)")
+    parser.add_argument('--backend', choices=('stub', 'egl'), default='stub',
+                        help="stub: GL dicatat tanpa dieksekusi; egl: konteks OpenGL software offscreen")
+    parser.add_argument('--sizes', type=parse_sizes, default=list(DEFAULT_SIZES),
+                        help="Jumlah objek dipisah koma (default: 1,10,100,1000,10000,100000)")
+    parser.add_argument('--transformed', type=float, default=0.0,
+                        help="Bagian objek (0..1) yang dirotasi dan diskalakan saat dibuat")
+    parser.add_argument('--picks', type=int, default=1000, help="Jumlah titik pick per pengukuran")
+    parser.add_argument('--repeat', type=int, default=3, help="Pengulangan pick/clip/render (diambil median)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="Tulis hasil JSON ke file")
+    parser.add_argument('--compare', metavar='JSON', help="Bandingkan dengan hasil sebelumnya")
+    options = parser.parse_args()
+
+    setup_backend(options.backend)
+    rows = []
+    for size in options.sizes:
+        print(f"Mengukur {size} objek...", file=sys.stderr)
+        # Pesan dari aplikasi diarahkan ke stderr agar tabel di stdout tetap rapi
+        with redirect_stdout(sys.stderr):
+            rows.append({'objects': size, 'ms': measure(size, options)})
+
+    print_curves(rows)
+    if options.output:
+        result = {
+            'meta': {
+                'revision': git_revision(),
+                'backend': options.backend,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'seed': options.seed,
+                'transformed': options.transformed,
+                'picks': options.picks,
+            },
+            'sizes': rows,
+        }
+        with open(options.output, 'w') as f:
+            f.write(json.dumps(result, indent=2) + '\n')
+    if options.compare:
+        compare(rows, options.compare)
+
+
+if __name__ == '__main__':
+    main()
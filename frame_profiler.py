@@ -0,0 +1,141 @@
+# Profiler waktu frame per tahap render untuk aplikasi 2D dan 3D.
+#
+# Pemakaian di loop render:
+#   profiler.begin_frame()
+#   with profiler.stage('grid'):
+#       ...
+#   profiler.end_frame()
+#
+# Saat tidak aktif, stage() mengembalikan context manager kosong sehingga
+# biaya instrumentasi hampir nol. Hasil tiap frame dikirim ke sink (callable)
+# dan disimpan sebagai rata-rata bergulir untuk overlay di layar.
+
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        if profiler.sync is not None:
+            profiler.sync()
+        elapsed = (time.perf_counter() - self.start) * 1000.0
+        current = profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, window=60, enabled=False, sync=None):
+        self.window = window        # jumlah frame untuk rata-rata bergulir
+        self.enabled = enabled
+        self.sync = sync            # mis. glFinish agar waktu GPU ikut masuk ke tahapnya
+        self.sinks = []
+        self.history = {}           # nama tahap -> deque waktu (ms)
+        self.frame_history = deque(maxlen=window)
+        self.current = {}
+        self.frame_index = 0
+        self.frame_start = None
+
+    def add_sink(self, sink):
+        # sink(frame_index, frame_ms, stages) dipanggil di akhir setiap frame
+        self.sinks.append(sink)
+        self.enabled = True
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def reset(self):
+        self.history.clear()
+        self.frame_history.clear()
+        self.current = {}
+
+    def begin_frame(self):
+        if not self.enabled:
+            self.frame_start = None
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def stage(self, name):
+        if self.frame_start is None:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        if self.sync is not None:
+            self.sync()
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000.0
+        self.frame_start = None
+
+        stages = self.current
+        for name in stages:
+            if name not in self.history:
+                self.history[name] = deque(maxlen=self.window)
+        for name, samples in self.history.items():
+            samples.append(stages.get(name, 0.0))
+        self.frame_history.append(frame_ms)
+
+        for sink in self.sinks:
+            sink(self.frame_index, frame_ms, stages)
+        self.frame_index += 1
+
+    def frame_average(self):
+        if not self.frame_history:
+            return 0.0
+        return sum(self.frame_history) / len(self.frame_history)
+
+    def averages(self):
+        # Rata-rata bergulir per tahap (ms), urut sesuai kemunculan pertama
+        return [(name, sum(samples) / len(samples)) for name, samples in self.history.items() if samples]
+
+    def report_lines(self):
+        frame_ms = self.frame_average()
+        fps = 1000.0 / frame_ms if frame_ms > 0 else 0.0
+        lines = [f"Frame {frame_ms:7.2f} ms  ({fps:5.1f} fps)" + ("  [sync]" if self.sync else "")]
+        for name, avg in self.averages():
+            share = 100.0 * avg / frame_ms if frame_ms > 0 else 0.0
+            lines.append(f"  {name:<16}{avg:7.2f} ms {share:5.1f}%")
+        return lines
+
+
+class LogSink:
+    """Sink yang mencetak rata-rata per tahap setiap `every` frame"""
+    def __init__(self, every=60, stream=None):
+        self.every = every
+        self.stream = stream
+        self.frames = 0
+        self.frame_total = 0.0
+        self.totals = {}
+
+    def __call__(self, frame_index, frame_ms, stages):
+        self.frames += 1
+        self.frame_total += frame_ms
+        for name, ms in stages.items():
+            self.totals[name] = self.totals.get(name, 0.0) + ms
+        if self.frames < self.every:
+            return
+
+        parts = [f"{name} {total / self.frames:.2f}" for name, total in self.totals.items()]
+        print(f"[profiler] frame {frame_index}: {self.frame_total / self.frames:.2f} ms | " + " | ".join(parts),
+              file=self.stream or sys.stdout)
+        self.frames = 0
+        self.frame_total = 0.0
+        self.totals = {}
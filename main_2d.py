@@ -1,5 +1,20 @@
+import argparse
+
 from pro2d.core import Graphics2DApp
+from pro2d.stress import generate_scene
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aplikasi Grafika 2D Interaktif")
+    parser.add_argument('scene', nargs='?', help="File scene (.npz atau .json) yang dimuat saat mulai")
+    parser.add_argument('--generate', type=int, metavar='N', help="Isi scene dengan N objek acak (uji beban)")
+    parser.add_argument('--seed', type=int, default=1, help="Seed untuk --generate")
+    parser.add_argument('--transformed', type=float, default=0.0,
+                        help="Bagian objek --generate (0..1) yang dirotasi dan diskalakan")
+    args = parser.parse_args()
+
     app = Graphics2DApp()
-    app.run()
\ No newline at end of file
+    if args.scene:
+        app.load_scene(args.scene)
+    if args.generate:
+        generate_scene(app, args.generate, args.seed, args.transformed)
+    app.run()
@@ -0,0 +1,355 @@
+# Parser file Wavefront OBJ berbasis NumPy.
+#
+# File dibaca per blok (chunk) dan setiap blok diurai sekaligus: baris-baris
+# v/vt/vn/f dikelompokkan dengan operasi array, lalu angka-angkanya dikonversi
+# dalam satu panggilan NumPy per jenis record, bukan token per token di Python.
+
+import os
+import json
+import mmap
+import time
+import struct
+import hashlib
+import numpy as np
+
+CHUNK_SIZE = 1 << 20  # 1 MB per blok
+
+_SPACE = ord(' ')
+_NEWLINE = ord('\n')
+_SLASH = ord('/')
+
+
+class ObjMesh:
+    """Hasil parsing file OBJ dalam bentuk array NumPy"""
+    def __init__(self):
+        self.vertices = np.zeros((0, 3), dtype=np.float32)
+        self.texcoords = np.zeros((0, 2), dtype=np.float32)
+        self.normals = np.zeros((0, 3), dtype=np.float32)
+        # Indeks sudut semua face digabung; face ke-i = face_indices[face_offsets[i]:face_offsets[i + 1]]
+        self.face_indices = np.zeros(0, dtype=np.int32)
+        self.face_texcoord_indices = np.zeros(0, dtype=np.int32)  # -1 jika tidak ada
+        self.face_normal_indices = np.zeros(0, dtype=np.int32)    # -1 jika tidak ada
+        self.face_offsets = np.zeros(1, dtype=np.int32)
+        self.face_normals = None
+        self.vertex_normals = None
+        self.file_size = 0
+        self.parse_time = 0.0
+        self.from_cache = False
+
+    @property
+    def face_count(self):
+        return len(self.face_offsets) - 1
+
+    @property
+    def throughput(self):
+        """Kecepatan parsing dalam MB/s"""
+        if self.parse_time <= 0:
+            return 0.0
+        return self.file_size / (1024 * 1024) / self.parse_time
+
+
+class _ObjChunkParser:
+    def __init__(self):
+        self.vertex_blocks = []
+        self.texcoord_blocks = []
+        self.normal_blocks = []
+        self.index_blocks = []
+        self.texcoord_index_blocks = []
+        self.normal_index_blocks = []
+        self.count_blocks = []
+        # Jumlah record yang sudah dibaca, dibutuhkan untuk indeks negatif (relatif)
+        self.vertex_total = 0
+        self.texcoord_total = 0
+        self.normal_total = 0
+
+    def feed(self, chunk):
+        # chunk selalu diakhiri newline (diatur oleh parse_obj_file)
+        buf = np.frombuffer(chunk, dtype=np.uint8).copy()
+        buf[(buf == ord('\r')) | (buf == ord('\t'))] = _SPACE
+
+        ends = np.flatnonzero(buf == _NEWLINE)
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+
+        # Record boleh diawali spasi/tab: jenis record dibaca dari karakter non-spasi pertama
+        # setiap baris (baris kosong berakhir pada newline-nya sendiri)
+        filled = np.flatnonzero(buf != _SPACE)
+        heads = filled[np.searchsorted(filled, starts)]
+
+        last = len(buf) - 1
+        c0 = buf[heads]
+        c1 = buf[np.minimum(heads + 1, last)]
+        c2 = buf[np.minimum(heads + 2, last)]
+        is_v = (c0 == ord('v')) & (c1 == _SPACE)
+        is_vt = (c0 == ord('v')) & (c1 == ord('t')) & (c2 == _SPACE)
+        is_vn = (c0 == ord('v')) & (c1 == ord('n')) & (c2 == _SPACE)
+        is_f = (c0 == ord('f')) & (c1 == _SPACE)
+
+        # Hapus prefix record agar setiap baris hanya berisi angka
+        buf[heads[is_v | is_f]] = _SPACE
+        buf[heads[is_vt | is_vn]] = _SPACE
+        buf[heads[is_vt | is_vn] + 1] = _SPACE
+
+        # Hitung jumlah token per baris dari posisi awal token
+        is_newline = buf == _NEWLINE
+        is_blank = (buf == _SPACE) | is_newline
+        token_start = np.flatnonzero(~is_blank & np.concatenate(([True], is_blank[:-1])))
+        line_of_byte = np.cumsum(is_newline, dtype=np.int32) - is_newline
+        token_line = line_of_byte[token_start]
+        tokens_per_line = np.bincount(token_line, minlength=len(ends))
+        line_lengths = ends - starts + 1
+
+        # Indeks record sebelum setiap baris (untuk indeks negatif di face)
+        vertex_before = self.vertex_total + np.cumsum(is_v) - is_v
+        texcoord_before = self.texcoord_total + np.cumsum(is_vt) - is_vt
+        normal_before = self.normal_total + np.cumsum(is_vn) - is_vn
+
+        if is_v.any():
+            values = self._read_floats(buf, is_v, line_lengths, tokens_per_line, 3, 'v')
+            self.vertex_blocks.append(values)
+        if is_vt.any():
+            values = self._read_floats(buf, is_vt, line_lengths, tokens_per_line, 2, 'vt')
+            self.texcoord_blocks.append(values)
+        if is_vn.any():
+            values = self._read_floats(buf, is_vn, line_lengths, tokens_per_line, 3, 'vn')
+            self.normal_blocks.append(values)
+        if is_f.any():
+            self._read_faces(buf, line_of_byte, is_f, line_lengths, tokens_per_line, token_start, token_line,
+                             vertex_before, texcoord_before, normal_before)
+
+        self.vertex_total += int(is_v.sum())
+        self.texcoord_total += int(is_vt.sum())
+        self.normal_total += int(is_vn.sum())
+
+    @staticmethod
+    def _select_lines(buf, line_mask, line_lengths):
+        return buf[np.repeat(line_mask, line_lengths)].tobytes()
+
+    @staticmethod
+    def _to_numbers(text, dtype, expected):
+        # Konversi teks angka yang dipisah spasi/newline dalam satu panggilan C
+        values = np.fromstring(text, dtype=dtype, sep=' ')
+        if len(values) != expected:
+            raise ValueError("Data angka pada file OBJ tidak valid")
+        return values
+
+    def _read_floats(self, buf, line_mask, line_lengths, tokens_per_line, width, record):
+        counts = tokens_per_line[line_mask]
+        if counts.min() < width:
+            raise ValueError(f"Record '{record}' membutuhkan minimal {width} nilai")
+        text = self._select_lines(buf, line_mask, line_lengths)
+        values = self._to_numbers(text, np.float32, int(counts.sum()))
+        if (counts == width).all():
+            return values.reshape(-1, width)
+        # Nilai tambahan (mis. w atau warna vertex) diabaikan
+        first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        return values[first[:, None] + np.arange(width)]
+
+    def _read_faces(self, buf, line_of_byte, line_mask, line_lengths, tokens_per_line, token_start, token_line,
+                    vertex_before, texcoord_before, normal_before):
+        counts = tokens_per_line[line_mask]
+        if counts.min() < 3:
+            raise ValueError("Face membutuhkan minimal 3 vertex")
+        text = self._select_lines(buf, line_mask, line_lengths)
+
+        # Jumlah '/' per sudut menentukan format: v, v/vt, v//vn atau v/vt/vn
+        corner_starts = token_start[line_mask[token_line]]
+        slashes = np.flatnonzero(buf == _SLASH)
+        slashes = slashes[line_mask[line_of_byte[slashes]]]
+        slashes_per_corner = np.bincount(np.searchsorted(corner_starts, slashes, side='right') - 1,
+                                         minlength=len(corner_starts))
+        if len(slashes_per_corner) and (slashes_per_corner == slashes_per_corner[0]).all():
+            width = int(slashes_per_corner[0]) + 1
+            # '//' berarti vt kosong; 0 dipakai sebagai penanda karena indeks OBJ dimulai dari 1
+            text = text.replace(b'//', b'/0/').replace(b'/', b' ')
+            values = self._to_numbers(text, np.int64, len(corner_starts) * width).reshape(-1, width)
+        else:
+            values = self._read_mixed_corners(text)
+
+        corner_vertex_before = np.repeat(vertex_before[line_mask], counts)
+        vertex_index = self._resolve(values[:, 0], corner_vertex_before)
+        if values.shape[1] > 1:
+            texcoord_index = self._resolve(values[:, 1], np.repeat(texcoord_before[line_mask], counts))
+        else:
+            texcoord_index = np.full(len(values), -1)
+        if values.shape[1] > 2:
+            normal_index = self._resolve(values[:, 2], np.repeat(normal_before[line_mask], counts))
+        else:
+            normal_index = np.full(len(values), -1)
+
+        self.index_blocks.append(vertex_index.astype(np.int32))
+        self.texcoord_index_blocks.append(texcoord_index.astype(np.int32))
+        self.normal_index_blocks.append(normal_index.astype(np.int32))
+        self.count_blocks.append(counts.astype(np.int32))
+
+    @staticmethod
+    def _read_mixed_corners(text):
+        # Jalur lambat untuk file yang mencampur format sudut dalam satu blok
+        values = []
+        for token in text.split():
+            parts = token.split(b'/')
+            parts += [b''] * (3 - len(parts))
+            values.append([int(p) if p else 0 for p in parts[:3]])
+        return np.array(values, dtype=np.int64).reshape(-1, 3)
+
+    @staticmethod
+    def _resolve(indices, count_before):
+        # Indeks OBJ dimulai dari 1; indeks negatif relatif terhadap record terakhir; 0 = tidak ada
+        resolved = np.where(indices < 0, count_before + indices, indices - 1)
+        resolved[indices == 0] = -1
+        return resolved
+
+    def finish(self):
+        mesh = ObjMesh()
+        if self.vertex_blocks:
+            mesh.vertices = np.concatenate(self.vertex_blocks)
+        if self.texcoord_blocks:
+            mesh.texcoords = np.concatenate(self.texcoord_blocks)
+        if self.normal_blocks:
+            mesh.normals = np.concatenate(self.normal_blocks)
+        if self.index_blocks:
+            mesh.face_indices = np.concatenate(self.index_blocks)
+            mesh.face_texcoord_indices = np.concatenate(self.texcoord_index_blocks)
+            mesh.face_normal_indices = np.concatenate(self.normal_index_blocks)
+            counts = np.concatenate(self.count_blocks)
+            mesh.face_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int32)
+
+        if len(mesh.face_indices):
+            if mesh.face_indices.min() < 0 or mesh.face_indices.max() >= len(mesh.vertices):
+                raise ValueError("Indeks vertex pada face di luar jangkauan")
+        return mesh
+
+
+def parse_obj_file(file_path, chunk_size=CHUNK_SIZE):
+    start_time = time.perf_counter()
+    parser = _ObjChunkParser()
+    with open(file_path, 'rb') as f:
+        tail = b''
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            block = tail + block
+            # Potong di newline terakhir; sisa baris dibawa ke blok berikutnya
+            cut = block.rfind(b'\n') + 1
+            tail = block[cut:]
+            if cut:
+                parser.feed(block[:cut])
+        if tail.strip():
+            parser.feed(tail + b'\n')
+
+    mesh = parser.finish()
+    mesh.file_size = os.path.getsize(file_path)
+    mesh.parse_time = time.perf_counter() - start_time
+    return mesh
+
+
+# Cache biner di samping file .obj: header JSON + array mentah yang di-memory-map saat dibaca
+CACHE_SUFFIX = '.meshcache'
+CACHE_MAGIC = b'OBJCACHE'
+CACHE_VERSION = 2
+_CACHE_ALIGN = 64
+_CACHE_ARRAYS = ('vertices', 'texcoords', 'normals', 'face_indices', 'face_texcoord_indices',
+                 'face_normal_indices', 'face_offsets', 'face_normals', 'vertex_normals')
+
+
+def cache_path_for(file_path):
+    return file_path + CACHE_SUFFIX
+
+
+def _file_hash(file_path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_signature(file_path):
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': _file_hash(file_path)}
+
+
+def write_mesh_cache(file_path, mesh):
+    arrays = {}
+    for name in _CACHE_ARRAYS:
+        value = getattr(mesh, name, None)
+        if value is not None:
+            arrays[name] = np.ascontiguousarray(value)
+
+    layout = {}
+    offset = 0
+    for name, value in arrays.items():
+        layout[name] = {'dtype': value.dtype.str, 'shape': list(value.shape), 'offset': offset}
+        offset += -(-value.nbytes // _CACHE_ALIGN) * _CACHE_ALIGN
+
+    header = json.dumps({
+        'version': CACHE_VERSION,
+        'source': source_signature(file_path),
+        'arrays': layout,
+    }).encode('utf-8')
+    prefix_size = len(CACHE_MAGIC) + 8 + len(header)
+    data_start = -(-prefix_size // _CACHE_ALIGN) * _CACHE_ALIGN
+
+    # Tulis ke file sementara lalu ganti, agar pembaca tidak pernah melihat cache setengah jadi
+    cache_path = cache_path_for(file_path)
+    temp_path = cache_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(CACHE_MAGIC)
+        f.write(struct.pack('<II', CACHE_VERSION, len(header)))
+        f.write(header)
+        f.write(b'\0' * (data_start - prefix_size))
+        for name, value in arrays.items():
+            f.write(value.tobytes())
+            f.write(b'\0' * (-value.nbytes % _CACHE_ALIGN))
+    os.replace(temp_path, cache_path)
+    return cache_path
+
+
+def read_mesh_cache(file_path):
+    # Mengembalikan ObjMesh dari cache, atau None jika cache tidak ada / sudah tidak cocok
+    cache_path = cache_path_for(file_path)
+    if not os.path.exists(cache_path):
+        return None
+
+    start_time = time.perf_counter()
+    try:
+        with open(cache_path, 'rb') as f:
+            if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                return None
+            version, header_size = struct.unpack('<II', f.read(8))
+            if version != CACHE_VERSION:
+                return None
+            header = json.loads(f.read(header_size).decode('utf-8'))
+
+            # Ukuran dan waktu modifikasi dicek dulu (murah), hash isi file terakhir
+            source = header['source']
+            stat = os.stat(file_path)
+            if source['size'] != stat.st_size or source['mtime_ns'] != stat.st_mtime_ns:
+                return None
+            if source['hash'] != _file_hash(file_path):
+                return None
+
+            data_start = -(-(len(CACHE_MAGIC) + 8 + header_size) // _CACHE_ALIGN) * _CACHE_ALIGN
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Array langsung menunjuk ke halaman file yang di-map, tanpa salinan. Rentang setiap
+        # array dicek terhadap ukuran file agar cache yang terpotong tidak dipetakan.
+        mesh = ObjMesh()
+        for name, info in header['arrays'].items():
+            dtype = np.dtype(info['dtype'])
+            count = int(np.prod(info['shape'], dtype=np.int64))
+            offset = data_start + int(info['offset'])
+            if offset < data_start or offset + count * dtype.itemsize > len(buffer):
+                raise ValueError(f"Array {name} di luar batas file cache")
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+            setattr(mesh, name, array.reshape(info['shape']))
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        # Cache rusak diperlakukan seperti tidak ada; akan ditulis ulang setelah parsing
+        return None
+
+    mesh.file_size = stat.st_size
+    mesh.parse_time = time.perf_counter() - start_time
+    mesh.from_cache = True
+    return mesh
@@ -1,6 +1,9 @@
 from pro2d.objects import Object2D, Point2D, Line2D, Rectangle2D, Ellipse2D
+from pro2d.scene import Scene2D
+from pro2d.serialize import save_scene, load_scene
 from pro2d.core import Graphics2DApp
 from pro2d.transform import Transform2D
 from pro2d.render import Renderer
 from pro2d.clipping import Clipper
+from pro2d.stress import generate_scene
 from pro2d.utils import screen_to_world, normalize_rectangle_points
\ No newline at end of file
@@ -0,0 +1,177 @@
+# Bounding volume hierarchy (BVH) di atas bounding box objek Scene2D.
+#
+# Objek diurutkan menurut kode Morton pusat kotaknya, lalu dikelompokkan per LEAF_SIZE
+# objek menjadi daun. Setiap level di atasnya menggabungkan dua node berurutan, sehingga
+# node i pada level k selalu mencakup objek urutan [i * span, (i + 1) * span) dengan
+# span = LEAF_SIZE * 2**k dan seluruh pohon cukup disimpan sebagai list array kotak.
+# Setelah transformasi (mis. drag) hanya kotak objek yang revisinya lebih baru dari pohon
+# dan node leluhurnya yang dihitung ulang (refit).
+#
+# query(window) menelusuri pohon dari akar, satu panggilan NumPy per level: subtree yang
+# seluruhnya di dalam window diterima, yang seluruhnya di luar dibuang, dan hanya node
+# yang terpotong yang diturunkan. Pada daun, tiap objek diklasifikasikan dengan kotaknya.
+# query_point(x, y) mencari kandidat picking: penelusuran dimulai dari level dengan paling
+# banyak POINT_ROOTS node dan turun POINT_STEP level sekaligus, sehingga biayanya beberapa
+# panggilan NumPy saja, bahkan untuk jutaan objek.
+import numpy as np
+
+from pro2d.clipping import ClipWindow
+
+OUTSIDE, INSIDE, STRADDLE = 0, 1, 2
+
+
+def _merge(boxes, starts):
+    # Gabungkan kotak berurutan mulai dari setiap indeks starts
+    return np.column_stack((np.minimum.reduceat(boxes[:, 0], starts), np.maximum.reduceat(boxes[:, 1], starts),
+                            np.minimum.reduceat(boxes[:, 2], starts), np.maximum.reduceat(boxes[:, 3], starts)))
+
+
+def _spread_bits(values):
+    # Sisipkan bit nol di antara 16 bit terbawah (untuk kode Morton 2D)
+    values = values.astype(np.uint32) & 0x0000FFFF
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    values = (values | (values << 1)) & 0x55555555
+    return values
+
+
+class SceneBVH:
+    LEAF_SIZE = 8
+    POINT_ROOTS = 256
+    POINT_STEP = 3
+
+    def __init__(self):
+        self.scene = None
+        self.slots = None     # scene.slots saat pohon dibangun (berubah jika urutan objek berubah)
+        self.version = None   # scene.version saat kotak node terakhir diperbarui
+        self.order = None     # posisi objek (urutan gambar) untuk setiap posisi di pohon
+        self.tree_slots = None  # slot objek untuk setiap posisi di pohon
+        self.boxes = None     # kotak objek menurut urutan pohon
+        self.levels = []      # levels[0] = daun, levels[-1] = akar
+        self.max_width = 0.0  # tebal garis terbesar (jarak pick maksimum di luar kotak objek)
+
+    def __len__(self):
+        return 0 if self.order is None else len(self.order)
+
+    def update(self, scene):
+        # Bangun ulang jika objek ditambah/dihapus; jika hanya geometri yang berubah, cukup
+        # perbarui kotak node yang terkena (refit) tanpa mengurutkan ulang
+        slots = scene.slots
+        if scene is not self.scene or slots is not self.slots:
+            self.build(scene)
+        elif scene.version != self.version:
+            self.refit()
+
+    def build(self, scene):
+        self.scene = scene
+        self.slots = scene.slots
+        boxes = scene.bounds(self.slots)
+        if len(boxes):
+            centers = np.column_stack(((boxes[:, 0] + boxes[:, 1]) * 0.5, (boxes[:, 2] + boxes[:, 3]) * 0.5))
+            low = centers.min(axis=0)
+            extent = np.maximum(centers.max(axis=0) - low, 1e-12)
+            grid = ((centers - low) / extent * 0xFFFF).astype(np.uint32)
+            codes = _spread_bits(grid[:, 0]) | (_spread_bits(grid[:, 1]) << 1)
+            self.order = np.argsort(codes, kind='stable')
+        else:
+            self.order = np.zeros(0, dtype=np.int64)
+        self.tree_slots = self.slots[self.order]
+        self.version = scene.version
+        self.boxes = boxes[self.order]
+        self.levels = []
+        if len(self.boxes) == 0:
+            self.max_width = 0.0
+            return
+        self.max_width = float(scene.widths[self.slots].max())
+        level = _merge(self.boxes, np.arange(0, len(self.boxes), self.LEAF_SIZE))
+        self.levels.append(level)
+        while len(level) > 1:
+            level = _merge(level, np.arange(0, len(level), 2))
+            self.levels.append(level)
+
+    def refit(self):
+        # Hitung ulang kotak objek yang berubah sejak refit terakhir (revisions lebih baru),
+        # lalu hanya daun dan leluhurnya. Perubahan warna/visibilitas tidak menyentuh pohon.
+        changed = np.flatnonzero(self.scene.revisions[self.tree_slots] > self.version)
+        self.version = self.scene.version
+        if len(changed) == 0:
+            return
+        slots = self.tree_slots[changed]
+        self.boxes[changed] = self.scene.bounds(slots)
+        # Tebal garis hanya bisa bertambah di sini (objek baru memicu build), jadi cukup max
+        self.max_width = max(self.max_width, float(self.scene.widths[slots].max()))
+        nodes = np.unique(changed // self.LEAF_SIZE)
+        children, fanout = self.boxes, self.LEAF_SIZE
+        for level in self.levels:
+            # Anak node yang melewati akhir array diganti anak terakhir (milik node yang sama)
+            items = np.minimum(nodes[:, None] * fanout + np.arange(fanout), len(children) - 1)
+            merged = children[items]
+            level[nodes] = np.column_stack((merged[:, :, 0].min(axis=1), merged[:, :, 1].max(axis=1),
+                                            merged[:, :, 2].min(axis=1), merged[:, :, 3].max(axis=1)))
+            nodes = np.unique(nodes >> 1)
+            children, fanout = level, 2
+
+    def query(self, window):
+        # Klasifikasi setiap objek (urutan gambar) terhadap window: OUTSIDE, INSIDE, atau STRADDLE.
+        # window berupa ClipWindow atau batas [xmin, xmax, ymin, ymax].
+        window = ClipWindow.of(window)
+        count = len(self)
+        result = np.full(count, OUTSIDE, dtype=np.int8)
+        if count == 0:
+            return result
+
+        accepted = np.zeros(count + 1, dtype=np.int64)  # selisih untuk menandai rentang INSIDE
+        nodes = np.arange(len(self.levels[-1]))
+        for depth in range(len(self.levels) - 1, -1, -1):
+            inside, outside = window.box_sides(self.levels[depth][nodes])
+            span = self.LEAF_SIZE << depth
+            starts = nodes[inside] * span
+            np.add.at(accepted, starts, 1)
+            np.add.at(accepted, np.minimum(starts + span, count), -1)
+            nodes = nodes[~inside & ~outside]
+            if len(nodes) == 0:
+                break
+            if depth > 0:
+                children = np.concatenate((nodes * 2, nodes * 2 + 1))
+                nodes = np.sort(children[children < len(self.levels[depth - 1])])
+            else:
+                # Daun yang terpotong: klasifikasikan objeknya satu per satu
+                items = (nodes[:, None] * self.LEAF_SIZE + np.arange(self.LEAF_SIZE)).ravel()
+                items = items[items < count]
+                inside, outside = window.box_sides(self.boxes[items])
+                result[items[inside]] = INSIDE
+                result[items[~inside & ~outside]] = STRADDLE
+
+        result[np.cumsum(accepted[:-1]) > 0] = INSIDE
+        ordered = np.empty_like(result)
+        ordered[self.order] = result
+        return ordered
+
+    def query_point(self, x, y, margin=0.0):
+        # Posisi objek (urutan gambar, dari yang teratas) yang kotaknya diperluas margin memuat (x, y)
+        count = len(self)
+        if count == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        def contains(boxes):
+            return ((boxes[:, 0] <= x + margin) & (boxes[:, 1] >= x - margin) &
+                    (boxes[:, 2] <= y + margin) & (boxes[:, 3] >= y - margin))
+
+        depth = len(self.levels) - 1
+        while depth > 0 and len(self.levels[depth - 1]) <= self.POINT_ROOTS:
+            depth -= 1
+        nodes = np.arange(len(self.levels[depth]))
+        while True:
+            nodes = nodes[contains(self.levels[depth][nodes])]
+            if depth == 0 or len(nodes) == 0:
+                break
+            step = min(self.POINT_STEP, depth)
+            nodes = ((nodes[:, None] << step) | np.arange(1 << step)).ravel()
+            depth -= step
+            nodes = nodes[nodes < len(self.levels[depth])]
+
+        items = (nodes[:, None] * self.LEAF_SIZE + np.arange(self.LEAF_SIZE)).ravel()
+        items = items[items < count]
+        items = items[contains(self.boxes[items])]
+        return np.sort(self.order[items])[::-1]
@@ -1,4 +1,18 @@
 # Algoritma clipping dan windowing untuk grafik 2D.
+#
+# Window dapat berupa batas [xmin, xmax, ymin, ymax] (persegi panjang sejajar sumbu) atau
+# ClipWindow, yaitu poligon konveks sembarang (mis. persegi panjang yang dirotasi).
+# Setiap sisi ClipWindow adalah bidang-setengah n . p >= c dengan n normal ke dalam.
+import math
+
+import numpy as np
+
+# Kode region Cohen-Sutherland
+INSIDE = 0  # 0000
+LEFT = 1    # 0001
+RIGHT = 2   # 0010
+BOTTOM = 4  # 0100
+TOP = 8     # 1000
 
 class Clipper:
     @staticmethod
@@ -120,39 +134,315 @@ class Clipper:
         return (clipped, x1, y1, x2, y2)
     
     @staticmethod
-    def clip_rectangle(rect_points, window_bounds):
+    def compute_outcodes(x, y, window_bounds):
+        # Versi vektor dari compute_code: x, y berupa array NumPy
         xmin, xmax, ymin, ymax = window_bounds
+        codes = np.where(x < xmin, LEFT, np.where(x > xmax, RIGHT, INSIDE))
+        codes |= np.where(y < ymin, BOTTOM, np.where(y > ymax, TOP, INSIDE))
+        return codes
 
-        points_inside = 0
-        for point in rect_points:
-            if Clipper.is_point_inside_window(point[0], point[1], window_bounds):
-                points_inside += 1
+    @staticmethod
+    def cohen_sutherland_clip_batch(segments, window_bounds):
+        # Versi vektor dari cohen_sutherland_clip dengan urutan pemotongan yang sama
+        # (atas, bawah, kanan, kiri). Setiap iterasi memotong satu titik akhir dari
+        # semua segmen yang belum selesai; paling banyak 4 iterasi per segmen.
+        clipped = np.array(segments, dtype=np.float64).reshape(-1, 4)
+        xmin, xmax, ymin, ymax = window_bounds
+        x1, y1, x2, y2 = clipped.T  # view, diubah langsung di tempat
 
-        if points_inside == len(rect_points):
-            return False, True, False, rect_points
+        code1 = Clipper.compute_outcodes(x1, y1, window_bounds)
+        code2 = Clipper.compute_outcodes(x2, y2, window_bounds)
+        accept = np.zeros(len(clipped), dtype=bool)
+        active = np.ones(len(clipped), dtype=bool)
 
-        if points_inside == 0:
+        while True:
+            inside = active & ((code1 | code2) == 0)
+            accept |= inside
+            active &= ~inside & ((code1 & code2) == 0)
+            rows = np.flatnonzero(active)
+            if len(rows) == 0:
+                break
 
-            window_corners = [
-                (xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax)
-            ]
+            c1 = code1[rows]
+            code_out = np.where(c1 != 0, c1, code2[rows])
+            ax, ay, bx, by = x1[rows], y1[rows], x2[rows], y2[rows]
+            dx = bx - ax
+            dy = by - ay
+            safe_dx = np.where(dx != 0, dx, 1.0)
+            safe_dy = np.where(dy != 0, dy, 1.0)
 
-            rect_xmin = min(p[0] for p in rect_points)
-            rect_xmax = max(p[0] for p in rect_points)
-            rect_ymin = min(p[1] for p in rect_points)
-            rect_ymax = max(p[1] for p in rect_points)
+            top = (code_out & TOP) != 0
+            bottom = ~top & ((code_out & BOTTOM) != 0)
+            right = ~top & ~bottom & ((code_out & RIGHT) != 0)
+            horizontal = top | bottom
+            edge_y = np.where(top, ymax, ymin)
+            edge_x = np.where(right, xmax, xmin)
 
-            if rect_xmin <= xmin and rect_xmax >= xmax and rect_ymin <= ymin and rect_ymax >= ymax:
-                return True, False, False, window_corners
-            
-            for i in range(len(rect_points)):
-                x1, y1 = rect_points[i]
-                x2, y2 = rect_points[(i + 1) % len(rect_points)]
+            x = np.where(horizontal, np.where(dy != 0, ax + dx * (edge_y - ay) / safe_dy, ax), edge_x)
+            y = np.where(horizontal, edge_y, np.where(dx != 0, ay + dy * (edge_x - ax) / safe_dx, ay))
+            new_code = Clipper.compute_outcodes(x, y, window_bounds)
 
-                clipped, _, _, _, _ = Clipper.cohen_sutherland_clip(x1, y1, x2, y2, window_bounds)
-                if clipped:
-                    return True, False, False, None
-            
-            return False, False, True, None
+            first = c1 != 0
+            r1, r2 = rows[first], rows[~first]
+            x1[r1], y1[r1], code1[r1] = x[first], y[first], new_code[first]
+            x2[r2], y2[r2], code2[r2] = x[~first], y[~first], new_code[~first]
+
+        return accept, clipped
+
+    @staticmethod
+    def cyrus_beck_clip_batch(segments, planes):
+        # Cyrus-Beck untuk window konveks: segments array (N, 4), planes array (E, 3) berisi
+        # (nx, ny, c) tiap sisi window dengan titik p di dalam jika nx*x + ny*y >= c.
+        # Mengembalikan (mask diterima, array (N, 4) titik akhir hasil clipping).
+        segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        normals, offsets = planes[:, :2], planes[:, 2]
+        start = segments[:, :2]
+        direction = segments[:, 2:] - start
+
+        # Titik p(t) = start + t * direction di dalam sisi e jika num + t * den >= 0
+        num = start @ normals.T - offsets
+        den = direction @ normals.T
+        parallel = den == 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = -num / np.where(parallel, 1.0, den)
+        t_enter = np.max(np.where(den > 0, t, 0.0), axis=1, initial=0.0)
+        t_leave = np.min(np.where(den < 0, t, 1.0), axis=1, initial=1.0)
+
+        accept = ~np.any(parallel & (num < 0), axis=1) & (t_enter <= t_leave)
+        clipped = np.concatenate((start + t_enter[:, None] * direction, start + t_leave[:, None] * direction), axis=1)
+        return accept, clipped
+
+    @staticmethod
+    def window_planes(window_bounds):
+        # Sisi kiri, kanan, bawah, dan atas window sejajar sumbu sebagai bidang-setengah
+        xmin, xmax, ymin, ymax = window_bounds
+        return np.array([(1.0, 0.0, xmin), (-1.0, 0.0, -xmax), (0.0, 1.0, ymin), (0.0, -1.0, -ymax)])
+
+    @staticmethod
+    def clip_polygons_batch(polygons, window_bounds):
+        # Sutherland-Hodgman untuk K poligon sekaligus, polygons: array (K, n, 2).
+        # window_bounds berupa batas window atau ClipWindow. Poligon dipotong berturut-turut
+        # oleh setiap sisi window; tiap langkah memproses semua sisi semua poligon dengan mask NumPy.
+        # Mengembalikan (points (K, M, 2), counts (K,), boundary (K, M)):
+        #   points[k, :counts[k]] - titik poligon hasil clipping (kosong jika di luar window)
+        #   boundary[k, j]        - sisi dari titik j ke titik berikutnya terletak pada batas
+        #                           window (bukan bagian dari sisi poligon asli)
+        polygons = np.asarray(polygons, dtype=np.float64).reshape(len(polygons), -1, 2)
+        window = ClipWindow.of(window_bounds)
+        planes = window.planes
+
+        # Poligon yang seluruhnya di dalam window, atau seluruhnya di luar salah satu sisinya,
+        # tidak perlu dipotong
+        if window.axis_aligned:
+            xmin, xmax, ymin, ymax = window.bounds
+            low = polygons.min(axis=1, initial=np.inf)
+            high = polygons.max(axis=1, initial=-np.inf)
+            inside = (low[:, 0] >= xmin) & (high[:, 0] <= xmax) & (low[:, 1] >= ymin) & (high[:, 1] <= ymax)
+            outside = (high[:, 0] < xmin) | (low[:, 0] > xmax) | (high[:, 1] < ymin) | (low[:, 1] > ymax)
+        else:
+            inside = np.ones(len(polygons), dtype=bool)
+            outside = np.zeros(len(polygons), dtype=bool)
+            for nx, ny, c in planes.tolist():
+                distance = polygons[:, :, 0] * nx + polygons[:, :, 1] * ny - c
+                inside &= distance.min(axis=1, initial=np.inf) >= 0
+                outside |= distance.max(axis=1, initial=-np.inf) < 0
+        rows = np.flatnonzero(~inside & ~outside)
+        counts = np.where(inside, polygons.shape[1], 0)
+        if len(rows) == 0:
+            return polygons.copy(), counts, np.zeros(polygons.shape[:2], dtype=bool)
+
+        cut_points, cut_counts, cut_boundary = Clipper._clip_polygons(polygons[rows], planes)
+        width = max(polygons.shape[1], cut_points.shape[1])
+        points = np.zeros((len(polygons), width, 2))
+        points[:, :polygons.shape[1]] = polygons
+        points[rows, :cut_points.shape[1]] = cut_points
+        boundary = np.zeros((len(polygons), width), dtype=bool)
+        boundary[rows, :cut_points.shape[1]] = cut_boundary
+        counts[rows] = cut_counts
+        return points, counts, boundary
+
+    @staticmethod
+    def _clip_polygons(points, planes):
+        # Tahap-tahap Sutherland-Hodgman (satu per sisi window) untuk poligon yang memotong batas window
+        points = points.copy()
+        count, width = points.shape[:2]
+        counts = np.full(count, width, dtype=np.int64)
+        boundary = np.zeros((count, width), dtype=bool)
+
+        for nx, ny, c in planes.tolist():
+            if width == 0:
+                break
+            index = np.arange(width)
+            valid = index < counts[:, None]
+            # Jarak bertanda ke garis batas; >= 0 berarti di sisi dalam
+            distance = points[:, :, 0] * nx + points[:, :, 1] * ny - c
+            inside = distance >= 0
+
+            # Poligon yang seluruhnya di dalam tidak berubah, yang seluruhnya di luar menjadi kosong;
+            # hanya poligon yang memotong garis batas yang diproses
+            all_inside = np.all(inside | ~valid, axis=1)
+            counts = np.where(np.any(inside & valid, axis=1), counts, 0)
+            rows = np.flatnonzero(~all_inside & (counts > 0))
+            if len(rows) == 0:
+                continue
+
+            cut_points, cut_boundary = points[rows], boundary[rows]
+            cut_counts, cut_valid = counts[rows], valid[rows]
+            cut_distance, cut_inside = distance[rows], inside[rows]
+            previous = np.where(index == 0, cut_counts[:, None] - 1, index - 1)
+            prev_points = np.take_along_axis(cut_points, previous[:, :, None], axis=1)
+            prev_boundary = np.take_along_axis(cut_boundary, previous, axis=1)
+            prev_distance = np.take_along_axis(cut_distance, previous, axis=1)
+            crossing = cut_valid & (cut_inside != (prev_distance >= 0))
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = np.where(crossing, prev_distance / (prev_distance - cut_distance), 0.0)
+            intersection = prev_points + t[:, :, None] * (cut_points - prev_points)
+            # Titik potong pada sisi sejajar sumbu diletakkan tepat di garis batas
+            if ny == 0:
+                intersection[:, :, 0] = c / nx
+            elif nx == 0:
+                intersection[:, :, 1] = c / ny
+
+            # Tiap sisi (titik sebelumnya -> titik ini) menghasilkan paling banyak dua titik:
+            # titik potong (jika sisi memotong batas) lalu titik ini (jika di dalam).
+            # Titik potong saat keluar memulai sisi baru di sepanjang batas window.
+            out_points = np.stack((intersection, cut_points), axis=2).reshape(len(rows), 2 * width, 2)
+            out_valid = np.stack((crossing, cut_valid & cut_inside), axis=2).reshape(len(rows), 2 * width)
+            out_boundary = np.stack((np.where(cut_inside, prev_boundary, True), cut_boundary),
+                                    axis=2).reshape(len(rows), 2 * width)
+
+            # Padatkan titik yang valid ke kiri dengan urutan tetap
+            position = np.cumsum(out_valid, axis=1) - 1
+            cut_counts = position[:, -1] + 1
+            width = max(width, int(cut_counts.max()))
+            if width > points.shape[1]:
+                grow = width - points.shape[1]
+                points = np.pad(points, ((0, 0), (0, grow), (0, 0)))
+                boundary = np.pad(boundary, ((0, 0), (0, grow)))
+            owner = np.broadcast_to(rows[:, None], out_valid.shape)[out_valid]
+            points[owner, position[out_valid]] = out_points[out_valid]
+            boundary[owner, position[out_valid]] = out_boundary[out_valid]
+            counts[rows] = cut_counts
+
+        width = int(counts.max(initial=0))
+        return points[:, :width], counts, boundary[:, :width]
+
+    @staticmethod
+    def polygon_edges(points, counts, boundary):
+        # Sisi-sisi poligon hasil clip_polygons_batch yang berasal dari sisi poligon asli,
+        # yaitu bagian keliling yang terlihat di dalam window.
+        # Mengembalikan (segments (S, 4), edge_counts (K,)) dengan segmen berurutan per poligon.
+        width = points.shape[1]
+        index = np.arange(width)
+        following = np.where(index == counts[:, None] - 1, 0, index + 1)
+        following = np.minimum(following, max(width - 1, 0))
+        end_points = np.take_along_axis(points, following[:, :, None], axis=1)
+        keep = (index < counts[:, None]) & ~boundary & np.any(points != end_points, axis=2)
+        segments = np.concatenate((points, end_points), axis=2)[keep]
+        return segments, keep.sum(axis=1)
+
+
+class ClipWindow:
+    # Window clipping berupa poligon konveks. Titik disimpan berlawanan arah jarum jam;
+    # persegi panjang sejajar sumbu tetap memakai Cohen-Sutherland dan uji batas yang lama.
+    UNIT_SQUARE = ((-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5))
+
+    def __init__(self, points):
+        points = np.array(points, dtype=np.float64).reshape(-1, 2)
+        edges = np.roll(points, -1, axis=0) - points
+        points = points[np.any(edges != 0, axis=1)]
+        if len(points) < 3:
+            raise ValueError("Window membutuhkan minimal 3 titik berbeda")
+        area = np.sum(points[:, 0] * np.roll(points[:, 1], -1) - np.roll(points[:, 0], -1) * points[:, 1])
+        if area < 0:
+            points = points[::-1].copy()
+        edges = np.roll(points, -1, axis=0) - points
+
+        self.points = points
+        xmin, ymin = points.min(axis=0).tolist()
+        xmax, ymax = points.max(axis=0).tolist()
+        self.bounds = (xmin, xmax, ymin, ymax)
+        self.axis_aligned = len(points) == 4 and bool(np.all(np.any(edges == 0, axis=1)))
+        if self.axis_aligned:
+            self.planes = Clipper.window_planes(self.bounds)
+        else:
+            # Normal ke dalam (sisi kiri dari arah sisi) dengan panjang satu
+            normals = np.stack((-edges[:, 1], edges[:, 0]), axis=1) / np.hypot(edges[:, 0], edges[:, 1])[:, None]
+            self.planes = np.column_stack((normals, np.einsum('ij,ij->i', normals, points)))
+        self._plane_list = self.planes.tolist()
+        self.key = tuple(points.ravel().tolist())
+
+    @classmethod
+    def of(cls, window):
+        # Terima ClipWindow atau batas [xmin, xmax, ymin, ymax]
+        return window if isinstance(window, cls) else cls.from_bounds(window)
+
+    @classmethod
+    def from_bounds(cls, window_bounds, angle=0.0, shape=None):
+        # shape: titik poligon dalam koordinat kotak satuan (-0.5..0.5), diskalakan ke ukuran
+        # window_bounds, dirotasi angle derajat terhadap pusatnya, lalu digeser ke pusat tersebut
+        left, right, bottom, top = window_bounds
+        if shape is None and angle == 0:
+            return cls([(left, bottom), (right, bottom), (right, top), (left, top)])
+
+        local = np.asarray(cls.UNIT_SQUARE if shape is None else shape, dtype=np.float64) * (right - left, top - bottom)
+        radians = math.radians(angle)
+        cos_a, sin_a = math.cos(radians), math.sin(radians)
+        rotation = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
+        return cls(local @ rotation.T + ((left + right) / 2, (bottom + top) / 2))
+
+    def contains(self, x, y):
+        if self.axis_aligned:
+            return Clipper.is_point_inside_window(x, y, self.bounds)
+        return all(nx * x + ny * y >= c for nx, ny, c in self._plane_list)
+
+    def contains_points(self, points):
+        # Versi vektor dari contains untuk array (K, 2)
+        x, y = points[:, 0], points[:, 1]
+        if self.axis_aligned:
+            xmin, xmax, ymin, ymax = self.bounds
+            return (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+        inside = np.ones(len(points), dtype=bool)
+        for nx, ny, c in self._plane_list:
+            inside &= nx * x + ny * y >= c
+        return inside
+
+    def clip_segments_batch(self, segments):
+        if self.axis_aligned:
+            return Clipper.cohen_sutherland_clip_batch(segments, self.bounds)
+        return Clipper.cyrus_beck_clip_batch(segments, self.planes)
+
+    def box_sides(self, boxes):
+        # (di dalam, di luar) untuk array (K, 4) bounding box xmin, xmax, ymin, ymax.
+        # Kotak di dalam jika titik sudut terdekatnya ke setiap sisi masih di sisi dalam; di luar
+        # jika terpisah oleh salah satu sisi window atau oleh bounding box window.
+        xmin, xmax, ymin, ymax = self.bounds
+        outside = (boxes[:, 1] < xmin) | (boxes[:, 0] > xmax) | (boxes[:, 3] < ymin) | (boxes[:, 2] > ymax)
+        if self.axis_aligned:
+            inside = (boxes[:, 0] >= xmin) & (boxes[:, 1] <= xmax) & (boxes[:, 2] >= ymin) & (boxes[:, 3] <= ymax)
+            return inside, outside
+
+        cx = (boxes[:, 0] + boxes[:, 1]) * 0.5
+        cy = (boxes[:, 2] + boxes[:, 3]) * 0.5
+        hx = (boxes[:, 1] - boxes[:, 0]) * 0.5
+        hy = (boxes[:, 3] - boxes[:, 2]) * 0.5
+        inside = np.ones(len(boxes), dtype=bool)
+        for nx, ny, c in self._plane_list:
+            distance = cx * nx + cy * ny - c
+            reach = hx * abs(nx) + hy * abs(ny)
+            inside &= distance - reach >= 0
+            outside |= distance + reach < 0
+        return inside, outside
 
-        return True, False, False, None
\ No newline at end of file
+    def ellipse_sides(self, center, u, v):
+        # (di dalam, di luar) untuk ellipse dengan pusat dan semi-sumbu u, v berupa array (K, 2).
+        # Jangkauan ellipse searah normal n adalah hypot(n . u, n . v).
+        inside = np.ones(len(center), dtype=bool)
+        outside = np.zeros(len(center), dtype=bool)
+        for nx, ny, c in self._plane_list:
+            distance = center[:, 0] * nx + center[:, 1] * ny - c
+            reach = np.hypot(u[:, 0] * nx + u[:, 1] * ny, v[:, 0] * nx + v[:, 1] * ny)
+            inside &= distance - reach >= 0
+            outside |= distance + reach < 0
+        return inside, outside
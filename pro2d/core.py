@@ -2,19 +2,49 @@
 
 import sys
 import math
+import numpy as np
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 
 from pro2d.objects import Object2D, Point2D, Line2D, Rectangle2D, Ellipse2D
-from pro2d.transform import Transform2D
-from pro2d.render import Renderer
-from pro2d.clipping import Clipper
-from pro2d.utils import screen_to_world, is_point_near_line, is_point_near_rectangle, is_point_near_ellipse
+from pro2d.transform import Transform2D, translation_matrix
+from pro2d.render import Renderer, RenderBatch, SceneClip, EllipseOutlines
+from pro2d.bvh import SceneBVH, OUTSIDE, STRADDLE
+from pro2d.clipping import Clipper, ClipWindow
+from pro2d.scene import Scene2D, TYPE_NAMES
+from pro2d.serialize import save_scene, load_scene
+from pro2d.history import History, TransformObjects, AddObjects, RemoveObjects, SetColor, transformed_flags
+from pro2d.utils import screen_to_world, convex_hull
+from frame_profiler import FrameProfiler
+from static_layer import StaticLayer
+
+PICK_THRESHOLD = 5.0              # piksel layar (tetap sama pada zoom berapa pun)
+SCENE_FILE = 'scene2d.npz'        # Ctrl+S / Ctrl+O
+SCENE_FILE_JSON = 'scene2d.json'  # Ctrl+J
+HISTORY_DEPTH = 100               # jumlah aksi undo yang disimpan
+WINDOW_ROTATE_STEP = 15.0         # derajat per tekan F7/F8
+CULL_MARGIN = 24                  # piksel di luar layar yang masih digambar (tebal garis, sorotan seleksi)
+DEFAULT_VIEW = (-400, 400, -300, 300)   # ortho_bounds awal (Home: kembali ke tampilan ini)
+ZOOM_STEP = 1.25                  # faktor zoom per langkah roda mouse
+ZOOM_LIMITS = (1e-3, 1e3)         # zoom minimum/maksimum relatif terhadap DEFAULT_VIEW
+
+
+def coalesce_motion(events):
+    # Gerakan mouse beruntun cukup diwakili posisi terakhirnya, sehingga banjir MOUSEMOTION
+    # hanya memicu satu pick/drag per frame. Urutan terhadap event lain (klik, tombol) tetap.
+    result = []
+    for event in events:
+        if event.type == pygame.MOUSEMOTION and result and result[-1].type == pygame.MOUSEMOTION:
+            result[-1] = event
+        else:
+            result.append(event)
+    return result
+
 
 class Graphics2DApp:
-    def __init__(self):
+    def __init__(self, history_depth=HISTORY_DEPTH):
         # Initialize Pygame and OpenGL
         pygame.init()
         self.width, self.height = 800, 600
@@ -24,16 +54,23 @@ class Graphics2DApp:
         )
         pygame.display.set_caption("2D Graphics Application")
         
-        # Setup OpenGL
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        self.ortho_bounds = (-400, 400, -300, 300)
-        glOrtho(*self.ortho_bounds, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
+        # Setup OpenGL: ortho_bounds adalah bagian dunia yang terlihat (kamera), diubah lewat
+        # zoom_at (roda mouse) dan pan (drag tombol tengah)
+        self.set_view(DEFAULT_VIEW)
+        self.pan_from = None   # posisi layar terakhir saat drag tombol tengah
 
-        self.objects = []
-        self.selected_object = None
+        # Sumbu dan grid dikompilasi ke display list; dibangun ulang hanya jika tampilan berubah
+        self.background = StaticLayer(Renderer.draw_axes)
+        self.clip_cache = SceneClip()   # hasil clipping per objek, dipakai ulang antar frame
+        self.bvh = SceneBVH()           # pohon bounding box untuk culling viewport dan window
+        self.batch = RenderBatch()      # primitif objek per frame, dikirim per kelompok gaya
+        self.outlines = EllipseOutlines()   # keliling ellipse per slot, ditesselasi ulang jika berubah
+
+        self.objects = Scene2D()
+        self.selection = {}       # objek terpilih (dict sebagai set berurutan), terakhir = utama
+        self.rubber_band = None   # [titik awal, titik saat ini] saat Shift+drag di area kosong
+        self.hovered = None       # objek di bawah kursor (disorot, akan terpilih jika diklik)
+        self.drag = None          # status drag objek terpilih, lihat begin_drag
         self.temp_points = []
 
         self.current_tool = 'point'  # 'point', 'line', 'rectangle', 'ellipse'
@@ -45,11 +82,256 @@ class Graphics2DApp:
         self.custom_pivot_point = None
 
         self.window_bounds = [-200, 200, -150, 150]  # left, right, bottom, top
+        self.window_angle = 0.0     # rotasi window (derajat) terhadap pusat window_bounds
+        self.window_shape = None    # poligon konveks dalam kotak satuan window_bounds; None = persegi panjang
         self.window_active = False
         self.window_definition_mode = False
+        self.window_polygon_mode = False   # definisi window dengan banyak titik (Shift+Q, Enter)
         self.window_temp_points = []
         self.clipping_enabled = False
+
+        # Profiler per tahap render (F12: overlay, Shift+F12: sinkronisasi GPU)
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.profiler_font = None
+        self.profiler_images = []
+
+        # Redraw on-demand: render hanya setelah input atau perubahan scene (F11: mode kontinu)
+        self.on_demand = True
+
+        self.scene_path = SCENE_FILE   # file terakhir yang disimpan/dimuat
+
+        # Undo/redo (Ctrl+Z / Ctrl+Y): delta per operasi, dibatasi history_depth aksi
+        self.history = History(history_depth)
+        self.redraw_requested = True
+        self.drawn_version = -1
     
+    def request_redraw(self):
+        self.redraw_requested = True
+
+    def set_view(self, bounds):
+        # Ganti bagian dunia yang terlihat; proyeksi dan skala piksel (LOD, culling, picking) ikut diperbarui
+        self.ortho_bounds = tuple(bounds)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        glOrtho(*self.ortho_bounds, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        Renderer.set_view(self.width, self.height, self.ortho_bounds)
+        self.request_redraw()
+
+    @property
+    def zoom(self):
+        # Perbesaran relatif terhadap DEFAULT_VIEW (1.0 = tampilan awal)
+        return (DEFAULT_VIEW[1] - DEFAULT_VIEW[0]) / (self.ortho_bounds[1] - self.ortho_bounds[0])
+
+    def zoom_at(self, x, y, factor):
+        # Perbesar factor kali terhadap titik layar (x, y); titik dunia di bawah kursor tidak bergeser
+        zoom = self.zoom
+        factor = min(max(zoom * factor, ZOOM_LIMITS[0]), ZOOM_LIMITS[1]) / zoom
+        if abs(factor - 1.0) < 1e-12:
+            return
+        world_x, world_y = self.screen_to_world(x, y)
+        left, right, bottom, top = self.ortho_bounds
+        self.set_view((world_x + (left - world_x) / factor, world_x + (right - world_x) / factor,
+                       world_y + (bottom - world_y) / factor, world_y + (top - world_y) / factor))
+
+    def pan(self, dx, dy):
+        # Geser tampilan sejauh gerakan mouse (dx, dy) piksel, sehingga dunia ikut bergerak bersama kursor
+        left, right, bottom, top = self.ortho_bounds
+        shift_x = -dx * (right - left) / self.width
+        shift_y = dy * (top - bottom) / self.height
+        self.set_view((left + shift_x, right + shift_x, bottom + shift_y, top + shift_y))
+
+    def needs_redraw(self):
+        # Scene2D.version naik pada setiap perubahan objek (buat, hapus, Transform2D, warna)
+        return (not self.on_demand or self.redraw_requested or
+                self.objects.version != self.drawn_version or
+                self.show_profiler or bool(self.profiler.sinks))
+
+    @property
+    def selected_object(self):
+        # Objek terpilih terakhir; kompatibel dengan kode yang hanya mengenal satu pilihan
+        return next(reversed(self.selection), None) if self.selection else None
+
+    @selected_object.setter
+    def selected_object(self, obj):
+        self.selection = {} if obj is None else {obj: None}
+
+    def toggle_selection(self, obj):
+        if obj in self.selection:
+            del self.selection[obj]
+        else:
+            self.selection[obj] = None
+
+    def select_in_rect(self, x1, y1, x2, y2, extend=False):
+        # Pilih semua objek yang bounding box-nya berada penuh di dalam persegi (x1, y1)-(x2, y2)
+        xmin, xmax = min(x1, x2), max(x1, x2)
+        ymin, ymax = min(y1, y2), max(y1, y2)
+        if not extend:
+            self.selection = {}
+        if len(self.objects):
+            bounds = self.objects.bounds(self.objects.slots)
+            inside = ((bounds[:, 0] >= xmin) & (bounds[:, 1] <= xmax) &
+                      (bounds[:, 2] >= ymin) & (bounds[:, 3] <= ymax))
+            views = self.objects.views
+            for index in np.flatnonzero(inside).tolist():
+                self.selection[views[index]] = None
+        return len(self.selection)
+
+    def selection_center(self):
+        # Pusat bounding box gabungan seluruh objek terpilih
+        objects = list(self.selection)
+        bounds = self.objects.bounds([obj.slot for obj in objects])
+        return ((bounds[:, 0].min() + bounds[:, 1].max()) / 2,
+                (bounds[:, 2].min() + bounds[:, 3].max()) / 2)
+
+    def transform_selection(self, operation, *amount):
+        # operation: 'translate' (dx, dy), 'rotate' (angle,), 'scale' (sx, sy)
+        pivot = self.custom_pivot_point if self.custom_pivot_mode and self.custom_pivot_point else None
+
+        objects = list(self.selection)
+        flags_before = transformed_flags(objects)
+        delta = None
+
+        if len(objects) == 1:
+            obj = objects[0]
+            if operation == 'translate':
+                delta = Transform2D.translate(obj, *amount)
+            elif operation == 'rotate':
+                delta = Transform2D.rotate(obj, *amount, *(pivot or ()))
+            elif operation == 'scale':
+                delta = Transform2D.scale(obj, *amount, *(pivot or ()))
+
+        # Banyak objek: satu transformasi untuk seluruh pilihan terhadap pivot bersama
+        elif operation == 'translate':
+            delta = Transform2D.translate_group(objects, *amount)
+        else:
+            pivot_x, pivot_y = pivot or self.selection_center()
+            if operation == 'rotate':
+                delta = Transform2D.rotate_group(objects, *amount, pivot_x, pivot_y)
+            elif operation == 'scale':
+                delta = Transform2D.scale_group(objects, *amount, pivot_x, pivot_y)
+
+        if delta is not None:
+            self.history.record(TransformObjects(objects, delta, flags_before, operation))
+
+    def recolor_selection(self, color):
+        objects = list(self.selection)
+        colors_before = np.array([obj.color for obj in objects])
+        for obj in objects:
+            obj.color = color
+        self.history.record(SetColor(objects, colors_before, color))
+        print(f"Recolored {len(objects)} object(s)")
+
+    def undo(self):
+        action = self.history.undo(self)
+        print(f"Undo: {action.label}" if action else "Nothing to undo")
+
+    def redo(self):
+        action = self.history.redo(self)
+        print(f"Redo: {action.label}" if action else "Nothing to redo")
+
+    def add_object(self, obj, record=False, index=None):
+        # record: catat di riwayat undo; index: posisi di urutan gambar (default: paling atas)
+        if index is None:
+            self.objects.append(obj)
+        else:
+            self.objects.insert(index, obj)
+        if record:
+            self.history.record(AddObjects([obj], f"add {obj.type}"))
+
+    def remove_objects(self, objects):
+        for obj in objects:
+            self.objects.remove(obj)
+            self.selection.pop(obj, None)
+
+    def clear_objects(self):
+        self.objects.clear()
+        self.selected_object = None
+        self.hovered = None
+        self.drag = None
+
+    @property
+    def clip_window(self):
+        # Window clipping saat ini sebagai ClipWindow. window_bounds tetap menjadi kotak acuan,
+        # sehingga F1-F6 menggeser/mengubah ukuran window bentuk apa pun.
+        return ClipWindow.from_bounds(self.window_bounds, self.window_angle, self.window_shape)
+
+    def define_polygon_window(self, points):
+        # Window konveks dari titik-titik yang diklik (diambil convex hull-nya)
+        hull = convex_hull(points)
+        if len(hull) < 3:
+            print("Window poligon membutuhkan minimal 3 titik yang tidak segaris")
+            return False
+        xs, ys = [p[0] for p in hull], [p[1] for p in hull]
+        left, right, bottom, top = min(xs), max(xs), min(ys), max(ys)
+        cx, cy = (left + right) / 2, (bottom + top) / 2
+        self.window_bounds = [left, right, bottom, top]
+        self.window_shape = [((x - cx) / (right - left), (y - cy) / (top - bottom)) for x, y in hull]
+        self.window_angle = 0.0
+        self.window_active = True
+        self.clipping_enabled = True
+        print(f"Polygon window defined: {len(hull)} vertices")
+        return True
+
+    def rotate_window(self, angle):
+        self.window_angle = (self.window_angle + angle) % 360.0
+        print(f"Window rotation: {self.window_angle:.0f} deg")
+
+    def save_scene(self, path):
+        window = {'bounds': list(self.window_bounds), 'active': self.window_active,
+                  'clipping': self.clipping_enabled, 'angle': self.window_angle,
+                  'shape': self.window_shape}
+        try:
+            save_scene(path, self.objects, window)
+        except OSError as e:
+            print(f"Gagal menyimpan scene ke {path}: {e}")
+            return False
+        self.scene_path = path
+        print(f"Scene saved: {len(self.objects)} objects -> {path}")
+        return True
+
+    def load_scene(self, path):
+        try:
+            scene, window = load_scene(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Gagal memuat scene dari {path}: {e}")
+            return False
+
+        # Scene lama dibersihkan agar objek lama tetap valid sebagai view terpisah
+        version = self.objects.version
+        self.clear_objects()
+        self.history.clear()
+        scene.version = max(scene.version, version + 1)
+        self.objects = scene
+        if window is not None:
+            self.window_bounds = list(window['bounds'])
+            self.window_angle = float(window.get('angle', 0.0))
+            self.window_shape = window.get('shape')
+            self.window_active = bool(window['active'])
+            self.clipping_enabled = bool(window['clipping'])
+        self.scene_path = path
+        print(f"Scene loaded: {len(self.objects)} objects <- {path}")
+        return True
+
+    def pick_object(self, world_x, world_y):
+        # Kandidat diambil dari BVH yang sama dengan culling (diperbarui jika scene berubah), urut
+        # dari objek teratas; jaraknya dihitung sekaligus dan yang terdekat dipilih. Jika sama
+        # dekat, objek teratas yang menang. Dipanggil pada setiap gerakan mouse (hover).
+        # Jarak pick (PICK_THRESHOLD atau tebal garis) dalam piksel, diubah ke unit dunia sesuai zoom.
+        self.bvh.update(self.objects)
+        scale = Renderer.pixel_scale
+        indices = self.bvh.query_point(world_x, world_y, max(PICK_THRESHOLD, self.bvh.max_width) / scale)
+        if not len(indices):
+            return None
+        slots = self.objects.slots[indices]
+        limits = np.maximum(PICK_THRESHOLD, self.objects.widths[slots]) / scale
+        distances = self.objects.distances(slots, world_x, world_y, limits)
+        distances[distances > limits] = np.inf
+        index = int(np.argmin(distances))
+        return self.objects[int(indices[index])] if distances[index] < np.inf else None
+
     def screen_to_world(self, x, y):
         return screen_to_world(x, y, self.width, self.height, self.ortho_bounds)
     
@@ -63,6 +345,10 @@ class Graphics2DApp:
             
         if self.window_definition_mode:
             self.window_temp_points.append((world_x, world_y))
+
+            if self.window_polygon_mode:
+                print(f"Window point {len(self.window_temp_points)} - press Enter to finish")
+                return
             
             if len(self.window_temp_points) == 2:
                 x1, y1 = self.window_temp_points[0]
@@ -72,6 +358,8 @@ class Graphics2DApp:
                 self.window_bounds[1] = max(x1, x2)  # right
                 self.window_bounds[2] = min(y1, y2)  # bottom
                 self.window_bounds[3] = max(y1, y2)  # top
+                self.window_angle = 0.0
+                self.window_shape = None
                 
                 self.window_active = True
                 self.clipping_enabled = True
@@ -82,20 +370,31 @@ class Graphics2DApp:
             return
 
         if len(self.temp_points) == 0:
-            for i in range(len(self.objects) - 1, -1, -1):
-                obj = self.objects[i]
-                if self.is_point_on_object(world_x, world_y, obj):
+            obj = self.pick_object(world_x, world_y)
+            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                # Shift+klik: tambah/hapus objek dari pilihan; di area kosong mulai rubber band
+                if obj is not None:
+                    self.toggle_selection(obj)
+                    print(f"Selection: {len(self.selection)} object(s)")
+                else:
+                    self.rubber_band = [(world_x, world_y), (world_x, world_y)]
+                return
+
+            if obj is not None:
+                # Klik pada anggota pilihan ganda mempertahankan pilihan agar bisa di-drag bersama
+                if obj not in self.selection:
                     self.selected_object = obj
                     print(f"Selected {obj.type} object")
-                    return
+                self.begin_drag(world_x, world_y, obj)
+                return
 
-            if self.selected_object is not None:
+            if self.selection:
                 self.selected_object = None
                 print("Deselected object")
 
         if self.current_tool == 'point':
             obj = Point2D(world_x, world_y, self.current_color, self.current_line_width)
-            self.objects.append(obj)
+            self.add_object(obj, record=True)
             self.selected_object = obj
         
         elif self.current_tool in ['line', 'ellipse']:
@@ -112,7 +411,7 @@ class Graphics2DApp:
                     x2, y2 = self.temp_points[1]
                     obj = Ellipse2D(x1, y1, x2, y2, self.current_color, self.current_line_width)
                 
-                self.objects.append(obj)
+                self.add_object(obj, record=True)
                 self.selected_object = obj
                 self.temp_points.clear()
                 
@@ -127,48 +426,82 @@ class Graphics2DApp:
                 x2, y2 = self.temp_points[1]
                 obj = Rectangle2D(x1, y1, x2, y2, self.current_color, self.current_line_width)
                 
-                self.objects.append(obj)
+                self.add_object(obj, record=True)
                 self.selected_object = obj
                 self.temp_points.clear()
                 print("Rectangle: Selesai dibuat dengan 2 titik (sudut berlawanan).")
     
-    def is_point_on_object(self, px, py, obj, threshold=5.0):
-        if obj.type == 'point' and len(obj.points) > 0:
-            x, y = obj.points[0]
-            return math.sqrt((px - x)**2 + (py - y)**2) <= max(threshold, obj.line_width)
-    
-        elif obj.type == 'line' and len(obj.points) >= 2:
-            x1, y1 = obj.points[0]
-            x2, y2 = obj.points[1]
-            return is_point_near_line(px, py, x1, y1, x2, y2, max(threshold, obj.line_width))
-    
-        elif obj.type == 'rectangle' and len(obj.points) >= 2:
-            if obj.corners:
-                return is_point_near_rectangle(px, py, obj.corners, max(threshold, obj.line_width))
-            else:
-                return is_point_near_rectangle(
-                    px, py, 
-                    [obj.points[0], (obj.points[1][0], obj.points[0][1]), 
-                     obj.points[1], (obj.points[0][0], obj.points[1][1])],
-                    max(threshold, obj.line_width)
-                )
-    
-        elif obj.type == 'ellipse' and len(obj.points) >= 2:
-            if hasattr(obj, 'transformed') and obj.transformed:
-                cx, cy = obj.center
-                rx, ry = obj.radii
-            else:
-                x1, y1 = obj.points[0]
-                x2, y2 = obj.points[1]
-                cx = (x1 + x2) / 2
-                cy = (y1 + y2) / 2
-                rx = abs(x2 - x1) / 2
-                ry = abs(y2 - y1) / 2
-            
-            return is_point_near_ellipse(px, py, cx, cy, rx, ry, max(threshold, obj.line_width))
-    
-        return False
-    
+    def begin_drag(self, world_x, world_y, obj):
+        # Tombol ditahan di atas objek: gerakan berikutnya menggeser seluruh pilihan.
+        # Riwayat undo dicatat sekali saat tombol dilepas (end_drag).
+        objects = list(self.selection)
+        self.drag = {'objects': objects, 'flags': transformed_flags(objects), 'clicked': obj,
+                     'start': (world_x, world_y), 'last': (world_x, world_y)}
+
+    def drag_to(self, world_x, world_y):
+        last_x, last_y = self.drag['last']
+        dx, dy = world_x - last_x, world_y - last_y
+        if dx == 0 and dy == 0:
+            return
+        objects = self.drag['objects']
+        if len(objects) == 1:
+            Transform2D.translate(objects[0], dx, dy)
+        else:
+            Transform2D.translate_group(objects, dx, dy)
+        self.drag['last'] = (world_x, world_y)
+
+    def end_drag(self, world_x, world_y):
+        self.drag_to(world_x, world_y)
+        drag, self.drag = self.drag, None
+        (x0, y0), (x1, y1) = drag['start'], drag['last']
+        if (x1, y1) != (x0, y0):
+            # Translasi total sebagai satu langkah undo
+            delta = (translation_matrix(x1 - x0, y1 - y0), None)
+            self.history.record(TransformObjects(drag['objects'], delta, drag['flags'], 'drag'))
+            print(f"Moved {len(drag['objects'])} object(s) by ({x1 - x0:.1f}, {y1 - y0:.1f})")
+        elif len(drag['objects']) > 1:
+            # Klik tanpa geser pada anggota pilihan ganda: pilih objek itu saja
+            self.selected_object = drag['clicked']
+            print(f"Selected {drag['clicked'].type} object")
+
+    def update_hover(self, world_x, world_y):
+        # Sorot objek yang akan terpilih jika diklik; tidak ada sorotan saat menggambar/mendefinisikan window
+        obj = None
+        if not (self.temp_points or self.window_definition_mode or self.custom_pivot_mode):
+            obj = self.pick_object(world_x, world_y)
+        if obj is not self.hovered:
+            self.hovered = obj
+            self.request_redraw()
+
+    def handle_mouse_motion(self, x, y):
+        if self.pan_from:
+            self.pan(x - self.pan_from[0], y - self.pan_from[1])
+            self.pan_from = (x, y)
+            return
+        world_x, world_y = self.screen_to_world(x, y)
+        if self.rubber_band:
+            self.rubber_band[1] = (world_x, world_y)
+            self.request_redraw()
+        elif self.drag:
+            self.drag_to(world_x, world_y)
+        else:
+            self.update_hover(world_x, world_y)
+
+    def handle_mouse_release(self, x, y):
+        if self.drag:
+            self.end_drag(*self.screen_to_world(x, y))
+        if self.rubber_band:
+            (x1, y1), _ = self.rubber_band
+            x2, y2 = self.screen_to_world(x, y)
+            self.rubber_band = None
+            count = self.select_in_rect(x1, y1, x2, y2, extend=True)
+            print(f"Selection: {count} object(s)")
+
+    def is_point_on_object(self, px, py, obj, threshold=PICK_THRESHOLD):
+        # Titik kena objek jika jaraknya ke garis tepi objek <= max(threshold, tebal garis)
+        distance = obj.scene.distances([obj.slot], px, py)[0]
+        return distance <= max(threshold, obj.line_width)
+
     def handle_keyboard(self, key):
         if key == pygame.K_1:
             self.current_tool = 'point'
@@ -183,6 +516,15 @@ class Graphics2DApp:
             self.current_tool = 'ellipse'
             self.temp_points.clear()
         
+        # Undo/redo
+        elif key == pygame.K_z and pygame.key.get_mods() & pygame.KMOD_CTRL:
+            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                self.redo()
+            else:
+                self.undo()
+        elif key == pygame.K_y and pygame.key.get_mods() & pygame.KMOD_CTRL:
+            self.redo()
+
         # Color controls
         elif key == pygame.K_r:
             self.current_color = (1.0, 0.0, 0.0)  # red
@@ -205,6 +547,14 @@ class Graphics2DApp:
         elif key == pygame.K_MINUS:
             self.current_line_width = max(1.0, self.current_line_width - 1.0)
 
+        # Simpan/muat scene
+        elif key == pygame.K_s and pygame.key.get_mods() & pygame.KMOD_CTRL:
+            self.save_scene(SCENE_FILE)
+        elif key == pygame.K_j and pygame.key.get_mods() & pygame.KMOD_CTRL:
+            self.save_scene(SCENE_FILE_JSON)
+        elif key == pygame.K_o and pygame.key.get_mods() & pygame.KMOD_CTRL:
+            self.load_scene(self.scene_path)
+
         elif key == pygame.K_t:
             self.transform_mode = 'translate'
             print("Transform mode: TRANSLATE")
@@ -227,10 +577,20 @@ class Graphics2DApp:
 
         elif key == pygame.K_q:
             self.window_definition_mode = True
+            self.window_polygon_mode = bool(pygame.key.get_mods() & pygame.KMOD_SHIFT)
+            self.window_temp_points.clear()
+            if self.window_polygon_mode:
+                print("Polygon window mode - Click the window vertices, then press Enter")
+            else:
+                print("Window definition mode - Click 2 points to define window")
+        elif key in (pygame.K_RETURN, pygame.K_KP_ENTER) and self.window_definition_mode and self.window_polygon_mode:
+            if self.define_polygon_window(self.window_temp_points):
+                self.window_definition_mode = False
+                self.window_polygon_mode = False
             self.window_temp_points.clear()
-            print("Window definition mode - Click 2 points to define window")
         elif key == pygame.K_w and (pygame.key.get_pressed()[pygame.K_LCTRL] or pygame.key.get_pressed()[pygame.K_RCTRL]):
             self.window_definition_mode = True
+            self.window_polygon_mode = False
             self.window_temp_points.clear()
             print("Window definition mode - Click 2 points to define window")
         elif key == pygame.K_v:
@@ -241,12 +601,16 @@ class Graphics2DApp:
             self.window_active = False
             self.clipping_enabled = False
             self.window_definition_mode = False
+            self.window_polygon_mode = False
             self.window_temp_points.clear()
             print("Window disabled")
         
         # Clear all
         elif key == pygame.K_DELETE or key == pygame.K_BACKSPACE:
-            self.objects.clear()
+            if len(self.objects):
+                self.history.record(RemoveObjects(list(self.objects), list(range(len(self.objects))), 'clear',
+                                                  clear=True))
+            self.clear_objects()
             self.temp_points.clear()
             print("All objects cleared")
         elif key == pygame.K_F1 and self.window_active:
@@ -274,6 +638,26 @@ class Graphics2DApp:
             self.window_bounds[1] = cx + w/2
             self.window_bounds[2] = cy - h/2
             self.window_bounds[3] = cy + h/2
+        elif key == pygame.K_F7 and self.window_active:
+            self.rotate_window(WINDOW_ROTATE_STEP)
+        elif key == pygame.K_F8 and self.window_active:
+            self.rotate_window(-WINDOW_ROTATE_STEP)
+        elif key == pygame.K_F12:
+            if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+                self.profiler.sync = None if self.profiler.sync else glFinish
+                self.profiler.reset()
+                print(f"Profiler GPU sync: {'ON' if self.profiler.sync else 'OFF'}")
+            else:
+                self.show_profiler = not self.show_profiler
+                self.profiler.enabled = self.show_profiler or bool(self.profiler.sinks)
+                self.profiler_images = []
+                print(f"Profiler overlay: {'ON' if self.show_profiler else 'OFF'}")
+        elif key == pygame.K_HOME:
+            self.set_view(DEFAULT_VIEW)
+            print("View reset")
+        elif key == pygame.K_F11:
+            self.on_demand = not self.on_demand
+            print(f"Redraw mode: {'ON-DEMAND' if self.on_demand else 'CONTINUOUS'}")
         elif key == pygame.K_F6 and self.window_active:
             cx = (self.window_bounds[0] + self.window_bounds[1]) / 2
             cy = (self.window_bounds[2] + self.window_bounds[3]) / 2
@@ -284,114 +668,153 @@ class Graphics2DApp:
             self.window_bounds[2] = cy - h/2
             self.window_bounds[3] = cy + h/2
 
-        if self.transform_mode and self.selected_object:
+        # Shift+tombol warna: warnai ulang semua objek terpilih
+        if (key in (pygame.K_r, pygame.K_g, pygame.K_b, pygame.K_w, pygame.K_y, pygame.K_m, pygame.K_c)
+                and pygame.key.get_mods() & pygame.KMOD_SHIFT
+                and not pygame.key.get_mods() & pygame.KMOD_CTRL and self.selection):
+            self.recolor_selection(self.current_color)
+
+        if self.transform_mode and self.selection:
             if key == pygame.K_UP:
                 if self.transform_mode == 'translate':
-                    Transform2D.translate(self.selected_object, 0, 10)
+                    self.transform_selection('translate', 0, 10)
                 elif self.transform_mode == 'scale':
-                    if self.custom_pivot_mode and self.custom_pivot_point:
-                        pivot_x, pivot_y = self.custom_pivot_point
-                        Transform2D.scale(self.selected_object, 1.1, 1.1, pivot_x, pivot_y)
-                    else:
-                        Transform2D.scale(self.selected_object, 1.1, 1.1)
+                    self.transform_selection('scale', 1.1, 1.1)
             elif key == pygame.K_DOWN:
                 if self.transform_mode == 'translate':
-                    Transform2D.translate(self.selected_object, 0, -10)
+                    self.transform_selection('translate', 0, -10)
                 elif self.transform_mode == 'scale':
-                    if self.custom_pivot_mode and self.custom_pivot_point:
-                        pivot_x, pivot_y = self.custom_pivot_point
-                        Transform2D.scale(self.selected_object, 0.9, 0.9, pivot_x, pivot_y)
-                    else:
-                        Transform2D.scale(self.selected_object, 0.9, 0.9)
+                    self.transform_selection('scale', 0.9, 0.9)
             elif key == pygame.K_LEFT:
                 if self.transform_mode == 'translate':
-                    Transform2D.translate(self.selected_object, -10, 0)
+                    self.transform_selection('translate', -10, 0)
                 elif self.transform_mode == 'rotate':
-                    if self.custom_pivot_mode and self.custom_pivot_point:
-                        pivot_x, pivot_y = self.custom_pivot_point
-                        Transform2D.rotate(self.selected_object, -10, pivot_x, pivot_y)
-                    else:
-                        Transform2D.rotate(self.selected_object, -10)
+                    self.transform_selection('rotate', -10)
                 elif self.transform_mode == 'scale':
-                    if self.custom_pivot_mode and self.custom_pivot_point:
-                        pivot_x, pivot_y = self.custom_pivot_point
-                        Transform2D.scale(self.selected_object, 0.9, 1.0, pivot_x, pivot_y)
-                    else:
-                        Transform2D.scale(self.selected_object, 0.9, 1.0)
+                    self.transform_selection('scale', 0.9, 1.0)
             elif key == pygame.K_RIGHT:
                 if self.transform_mode == 'translate':
-                    Transform2D.translate(self.selected_object, 10, 0)
+                    self.transform_selection('translate', 10, 0)
                 elif self.transform_mode == 'rotate':
-                    if self.custom_pivot_mode and self.custom_pivot_point:
-                        pivot_x, pivot_y = self.custom_pivot_point
-                        Transform2D.rotate(self.selected_object, 10, pivot_x, pivot_y)
-                    else:
-                        Transform2D.rotate(self.selected_object, 10)
+                    self.transform_selection('rotate', 10)
                 elif self.transform_mode == 'scale':
-                    if self.custom_pivot_mode and self.custom_pivot_point:
-                        pivot_x, pivot_y = self.custom_pivot_point
-                        Transform2D.scale(self.selected_object, 1.1, 1.0, pivot_x, pivot_y)
-                    else:
-                        Transform2D.scale(self.selected_object, 1.1, 1.0)
-        elif self.transform_mode and not self.selected_object:
+                    self.transform_selection('scale', 1.1, 1.0)
+        elif self.transform_mode and not self.selection:
             print("No object selected. Click on an object to select it first.")
     
     def render(self):
+        profiler = self.profiler
+        profiler.begin_frame()
         glClear(GL_COLOR_BUFFER_BIT)
 
-        Renderer.draw_axes()
+        with profiler.stage('axes'):
+            self.background.draw(*self.ortho_bounds, Renderer.grid_spacing())
 
-        Renderer.draw_clipping_window(
-            self.window_bounds, 
-            self.window_active,
-            self.window_temp_points, 
-            self.window_definition_mode
-        )
-
-        for obj in self.objects:
-            Renderer.render_object(
-                obj, 
-                self.window_bounds if self.window_active else None,
-                self.clipping_enabled,
-                obj == self.selected_object
+        with profiler.stage('window'):
+            Renderer.draw_clipping_window(
+                self.clip_window, 
+                self.window_active,
+                self.window_temp_points, 
+                self.window_definition_mode
             )
 
+        window_bounds = self.clip_window if self.window_active else None
+        clip_results = regions = None
+        with profiler.stage('cull'):
+            # Objek di luar viewport tidak digambar sama sekali
+            self.bvh.update(self.objects)
+            margin = CULL_MARGIN / Renderer.pixel_scale
+            left, right, bottom, top = self.ortho_bounds
+            visible = self.bvh.query([left - margin, right + margin, bottom - margin, top + margin]) != OUTSIDE
+        if window_bounds and self.clipping_enabled:
+            # Hanya objek yang terpotong window yang di-clip (sekaligus, yang tidak berubah diambil
+            # dari cache); objek yang seluruhnya di dalam/luar window sudah ditentukan oleh BVH
+            with profiler.stage('clip'):
+                regions = self.bvh.query(window_bounds)
+                straddling = self.objects.slots[visible & (regions == STRADDLE)]
+                clip_results = Renderer.clip_scene(self.objects, window_bounds, self.clip_cache, straddling)
+
+        # Primitif dibangun per tipe objek langsung dari array scene (satu tahap profiler per tipe)
+        order = np.flatnonzero(visible)
+        slots = self.objects.slots[order]
+        selected = np.isin(slots, [obj.slot for obj in self.selection if obj in self.objects])
+        window = window_bounds if clip_results is not None else None
+        if regions is not None:
+            regions = regions[order]
+        for type_code, name in enumerate(TYPE_NAMES):
+            with profiler.stage(name):
+                Renderer.add_objects(self.batch, self.objects, type_code, order, slots, selected,
+                                     window, regions, clip_results, self.outlines)
+
+        with profiler.stage('submit'):
+            self.batch.flush()
+
+        if self.hovered is not None and self.hovered in self.objects:
+            # Digambar setelah semua objek agar sorotan selalu di atas
+            Renderer.add_hover(self.batch, self.hovered)
+            self.batch.flush()
+
         if self.custom_pivot_mode and self.custom_pivot_point:
             Renderer.draw_pivot_point(*self.custom_pivot_point)
 
         if self.temp_points:
-            glColor3f(0.5, 0.5, 0.5)  # gray
-            for point in self.temp_points:
-                Renderer.draw_point(point[0], point[1], (0.5, 0.5, 0.5), 3)
-
-            if len(self.temp_points) > 1:
-                if self.current_tool == 'line' and len(self.temp_points) == 2:
-                    p1, p2 = self.temp_points
-                    Renderer.draw_line(p1[0], p1[1], p2[0], p2[1], (0.5, 0.5, 0.5), 1)
-                elif self.current_tool == 'rectangle' and len(self.temp_points) > 1:
-                    glColor3f(0.5, 0.5, 0.5)  # gray
-                    glLineWidth(1)
-                    p1, p2 = self.temp_points
-
-                    Renderer.draw_rectangle([p1, p2], (0.5, 0.5, 0.5), 1)
-                    
-                    glPointSize(5)
-                    glBegin(GL_POINTS)
-                    x1, y1 = min(p1[0], p2[0]), min(p1[1], p2[1])
-                    x2, y2 = max(p1[0], p2[0]), max(p1[1], p2[1])
-                    glVertex2f(x1, y1)
-                    glVertex2f(x2, y1)
-                    glVertex2f(x2, y2)
-                    glVertex2f(x1, y2)
-                    glEnd()
-                elif self.current_tool == 'ellipse' and len(self.temp_points) == 2:
-                    p1, p2 = self.temp_points
-                    cx = (p1[0] + p2[0]) / 2
-                    cy = (p1[1] + p2[1]) / 2
-                    rx = abs(p2[0] - p1[0]) / 2
-                    ry = abs(p2[1] - p1[1]) / 2
-                    Renderer.draw_ellipse(cx, cy, rx, ry, (0.5, 0.5, 0.5), 1)
-        pygame.display.flip()
+            with profiler.stage('preview'):
+                self.render_preview()
+
+        if self.rubber_band:
+            (x1, y1), (x2, y2) = self.rubber_band
+            Renderer.draw_rectangle([(x1, y1), (x2, y2)], (0.5, 0.8, 1.0), 1)
+
+        if self.show_profiler:
+            with profiler.stage('overlay'):
+                self.render_profiler_overlay()
+
+        with profiler.stage('flip'):
+            pygame.display.flip()
+        profiler.end_frame()
+        self.redraw_requested = False
+        self.drawn_version = self.objects.version
+
+    def render_preview(self):
+        glColor3f(0.5, 0.5, 0.5)  # gray
+        for point in self.temp_points:
+            Renderer.draw_point(point[0], point[1], (0.5, 0.5, 0.5), 3)
+
+        if len(self.temp_points) > 1:
+            if self.current_tool == 'line' and len(self.temp_points) == 2:
+                p1, p2 = self.temp_points
+                Renderer.draw_line(p1[0], p1[1], p2[0], p2[1], (0.5, 0.5, 0.5), 1)
+            elif self.current_tool == 'rectangle' and len(self.temp_points) > 1:
+                glColor3f(0.5, 0.5, 0.5)  # gray
+                glLineWidth(1)
+                p1, p2 = self.temp_points
+
+                Renderer.draw_rectangle([p1, p2], (0.5, 0.5, 0.5), 1)
+                
+                glPointSize(5)
+                glBegin(GL_POINTS)
+                x1, y1 = min(p1[0], p2[0]), min(p1[1], p2[1])
+                x2, y2 = max(p1[0], p2[0]), max(p1[1], p2[1])
+                glVertex2f(x1, y1)
+                glVertex2f(x2, y1)
+                glVertex2f(x2, y2)
+                glVertex2f(x1, y2)
+                glEnd()
+            elif self.current_tool == 'ellipse' and len(self.temp_points) == 2:
+                p1, p2 = self.temp_points
+                cx = (p1[0] + p2[0]) / 2
+                cy = (p1[1] + p2[1]) / 2
+                rx = abs(p2[0] - p1[0]) / 2
+                ry = abs(p2[1] - p1[1]) / 2
+                Renderer.draw_ellipse(cx, cy, rx, ry, (0.5, 0.5, 0.5), 1)
+
+    def render_profiler_overlay(self):
+        if self.profiler_font is None:
+            self.profiler_font = pygame.font.SysFont('monospace', 13)
+        # Teks diperbarui beberapa kali per detik saja agar angka mudah dibaca
+        if not self.profiler_images or self.profiler.frame_index % 15 == 0:
+            self.profiler_images = Renderer.render_text_images(self.profiler.report_lines(), self.profiler_font)
+        Renderer.draw_text_panel(self.profiler_images, self.width, self.height)
     
     def get_color_name(self):
         color_map = {
@@ -433,7 +856,11 @@ class Graphics2DApp:
         print("  O - Mode rotasi")
         print("  S - Mode scaling")
         print("  P - Toggle mode pivot kustom (untuk rotasi dan scaling)")
-        print("  KLIK pada objek untuk memilih objek yang akan ditransformasi")
+        print("  KLIK pada objek untuk memilih objek yang akan ditransformasi (objek di bawah kursor disorot)")
+        print("  DRAG objek untuk menggeser objek terpilih (atau seluruh pilihan ganda)")
+        print("  Shift+KLIK pada objek untuk menambah/menghapus objek dari pilihan")
+        print("  Shift+DRAG di area kosong untuk memilih semua objek di dalam kotak")
+        print("  Banyak objek terpilih ditransformasi bersama terhadap pusat pilihan (atau pivot kustom)")
         print("  Saat mode pivot kustom aktif, KLIK di mana saja pada canvas untuk menetapkan titik pivot")
         print("  Arrow Keys untuk mode translasi: Atas/Bawah/Kiri/Kanan")
         print("  Arrow Keys untuk mode rotasi: Kiri  / Kanan ")
@@ -447,6 +874,18 @@ class Graphics2DApp:
         print("  N - Nonaktifkan window")
         print("  F1/F2/F3/F4 - Geser window (atas/bawah/kiri/kanan)")
         print("  F5/F6 - Ubah ukuran window (kecil/besar)")
+        print("  F7/F8 - Putar window (berlawanan/searah jarum jam)")
+        print("  Shift+Q - Definisikan window poligon konveks (klik titik-titiknya, Enter untuk selesai)")
+        print()
+        print("TAMPILAN (KAMERA):")
+        print("  Roda mouse - Zoom in/out terhadap posisi kursor")
+        print("  Drag tombol tengah - Geser tampilan (pan)")
+        print("  Home - Kembali ke tampilan awal")
+        print()
+        print("PROFILING:")
+        print("  F12 - Toggle overlay waktu per tahap render")
+        print("  Shift+F12 - Toggle sinkronisasi GPU (glFinish) saat profiling")
+        print("  F11 - Toggle redraw on-demand / kontinu 60 FPS")
         print()
         print(" CARA TESTING WINDOWING & CLIPPING ")
         print("1. Tekan Q untuk masuk mode definisi window")
@@ -456,6 +895,16 @@ class Graphics2DApp:
         print("5. Objek di DALAM window akan berubah warna HIJAU")
         print("6. Garis yang dipotong window akan menunjukkan efek clipping")
         print()
+        print("UNDO / REDO:")
+        print("  Ctrl+Z - Undo (transformasi, objek baru, hapus semua, warna)")
+        print("  Ctrl+Y / Ctrl+Shift+Z - Redo")
+        print("  Shift+tombol warna - Warnai ulang objek terpilih")
+        print()
+        print("SIMPAN / MUAT:")
+        print(f"  Ctrl+S - Simpan scene (biner, {SCENE_FILE})")
+        print(f"  Ctrl+J - Simpan scene (JSON, {SCENE_FILE_JSON})")
+        print("  Ctrl+O - Muat scene terakhir yang disimpan/dimuat")
+        print()
         print("LAINNYA:")
         print("  Delete/Backspace - Hapus semua objek")
         print("  ESC - Keluar aplikasi")
@@ -464,7 +913,7 @@ class Graphics2DApp:
         print("SISTEM KOORDINAT:")
         print("  Sumbu X - Garis horizontal (merah)")
         print("  Sumbu Y - Garis vertikal (biru)")
-        print("  Grid - Garis bantuan setiap 50 unit")
+        print("  Grid - Garis bantuan setiap 50 unit (menyesuaikan zoom)")
         print("  Titik Pusat (0,0) - Titik kuning di tengah canvas")
         print("=" * 60)
     
@@ -474,7 +923,17 @@ class Graphics2DApp:
         running = True
         
         while running:
-            for event in pygame.event.get():
+            # Mode on-demand: bila tidak ada yang berubah, tidur di event.wait sampai ada input
+            if self.on_demand and not self.needs_redraw():
+                events = [pygame.event.wait()] + pygame.event.get()
+            else:
+                events = pygame.event.get()
+
+            for event in coalesce_motion(events):
+                # Semua input selain gerakan mouse dapat mengubah tampilan (alat, window, pilihan, ...)
+                if event.type != pygame.MOUSEMOTION:
+                    self.request_redraw()
+
                 if event.type == pygame.QUIT:
                     running = False
                 
@@ -484,6 +943,7 @@ class Graphics2DApp:
                     elif event.key == pygame.K_w and (event.mod & pygame.KMOD_CTRL):
                         print("Ctrl+W detected!")
                         self.window_definition_mode = True
+                        self.window_polygon_mode = False
                         self.window_temp_points.clear()
                         print("Window definition mode - Click 2 points to define window")
                     else:
@@ -492,8 +952,23 @@ class Graphics2DApp:
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:
                         self.handle_mouse_click(event.pos[0], event.pos[1])
+                    elif event.button == 2:
+                        self.pan_from = event.pos
+
+                elif event.type == pygame.MOUSEWHEEL:
+                    self.zoom_at(*pygame.mouse.get_pos(), ZOOM_STEP ** event.y)
+
+                elif event.type == pygame.MOUSEMOTION:
+                    self.handle_mouse_motion(event.pos[0], event.pos[1])
+
+                elif event.type == pygame.MOUSEBUTTONUP:
+                    if event.button == 1:
+                        self.handle_mouse_release(event.pos[0], event.pos[1])
+                    elif event.button == 2:
+                        self.pan_from = None
             
-            self.render()
+            if self.needs_redraw():
+                self.render()
             clock.tick(60)
         
         pygame.quit()
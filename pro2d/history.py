@@ -0,0 +1,129 @@
+# Riwayat undo/redo untuk aplikasi 2D.
+#
+# Setiap operasi disimpan sebagai delta kecil, bukan salinan scene:
+#   TransformObjects - matriks delta (world, local) dari Transform2D + flag transformed
+#   AddObjects       - objek yang ditambahkan (data objek tetap hidup di view-nya)
+#   RemoveObjects    - objek yang dihapus beserta posisinya di urutan gambar (atau hapus semua)
+#   SetColor         - warna lama dan warna baru
+# Undo menerapkan kebalikan delta dengan biaya yang sama dengan operasi aslinya.
+from collections import deque
+
+import numpy as np
+
+from pro2d.transform import Transform2D
+
+
+def transformed_flags(objects):
+    flags = np.zeros(len(objects), dtype=bool)
+    for scene, slots, index in Transform2D.group_slots(objects):
+        flags[index] = scene.transformed[slots]
+    return flags
+
+
+def set_transformed_flags(objects, flags):
+    for scene, slots, index in Transform2D.group_slots(objects):
+        scene.transformed[slots] = flags[index]
+        scene.version += 1
+
+
+class TransformObjects:
+    def __init__(self, objects, delta, flags_before, label='transform'):
+        self.objects = objects
+        self.world, self.local = delta
+        self.flags_before = flags_before
+        self.flags_after = transformed_flags(objects)
+        self.label = label
+
+    def undo(self, app):
+        Transform2D.revert(self.objects, self.world, self.local)
+        set_transformed_flags(self.objects, self.flags_before)
+
+    def redo(self, app):
+        Transform2D.apply(self.objects, self.world, self.local)
+        set_transformed_flags(self.objects, self.flags_after)
+
+
+class AddObjects:
+    def __init__(self, objects, label='add'):
+        self.objects = objects
+        self.label = label
+
+    def undo(self, app):
+        app.remove_objects(self.objects)
+
+    def redo(self, app):
+        for obj in self.objects:
+            app.add_object(obj)
+
+
+class RemoveObjects:
+    def __init__(self, objects, indices, label='remove', clear=False):
+        # indices: posisi tiap objek di urutan gambar sebelum dihapus (urut naik)
+        # clear: aksi aslinya hapus semua (redo mengosongkan scene), bukan hapus objek tertentu
+        self.objects = objects
+        self.indices = indices
+        self.label = label
+        self.clear = clear
+
+    def undo(self, app):
+        for index, obj in zip(self.indices, self.objects):
+            app.add_object(obj, index=index)
+
+    def redo(self, app):
+        if self.clear:
+            app.clear_objects()
+        else:
+            app.remove_objects(self.objects)
+
+
+class SetColor:
+    def __init__(self, objects, colors_before, color, label='color'):
+        self.objects = objects
+        self.colors_before = colors_before
+        self.color = color
+        self.label = label
+
+    def undo(self, app):
+        for scene, slots, index in Transform2D.group_slots(self.objects):
+            scene.colors[slots] = self.colors_before[index]
+            scene.version += 1
+
+    def redo(self, app):
+        for scene, slots, _ in Transform2D.group_slots(self.objects):
+            scene.colors[slots] = self.color
+            scene.version += 1
+
+
+class History:
+    def __init__(self, depth=100):
+        # Aksi tertua dibuang otomatis saat kedalaman terlampaui
+        self.undo_stack = deque(maxlen=depth)
+        self.redo_stack = []
+
+    @property
+    def depth(self):
+        return self.undo_stack.maxlen
+
+    def record(self, action):
+        self.undo_stack.append(action)
+        self.redo_stack.clear()
+
+    def undo(self, app):
+        if not self.undo_stack:
+            return None
+        action = self.undo_stack.pop()
+        action.undo(app)
+        self.redo_stack.append(action)
+        return action
+
+    def redo(self, app):
+        if not self.redo_stack:
+            return None
+        action = self.redo_stack.pop()
+        action.redo(app)
+        self.undo_stack.append(action)
+        return action
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
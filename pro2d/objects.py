@@ -1,51 +1,126 @@
 import math
 import numpy as np
 
+from pro2d.scene import Scene2D, TYPE_NAMES, TYPE_CODES
+from pro2d.utils import unit_circle, ellipse_segment_count
+
+def _as_tuples(vertices):
+    return [tuple(p) for p in vertices.tolist()]
+
+
 class Object2D:
     """Kelas dasar untuk semua objek 2D"""
+    # Objek hanyalah view ke Scene2D; seluruh data geometri dan atribut ada di array scene
+    __slots__ = ('scene', 'slot')
+
     def __init__(self, obj_type, points, color=(1.0, 1.0, 1.0), line_width=1.0):
-        self.type = obj_type
-        self.points = points.copy() if points else []
-        self.color = color
-        self.line_width = line_width
-        self.visible = True
-        self.corners = None
-        self.transformed = False
-    
+        Scene2D.detached(self, TYPE_CODES[obj_type], points if points else np.zeros((0, 2)), color, line_width)
+
+    @property
+    def type(self):
+        return TYPE_NAMES[self.scene.types[self.slot]]
+
+    @property
+    def vertices(self):
+        # View (n, 2) read-only ke koordinat dunia di scene; ubah geometri lewat Transform2D
+        vertices = self.scene.vertices(self.slot)
+        vertices.flags.writeable = False
+        return vertices
+
+    @property
+    def matrix(self):
+        # Matriks affine 3x3 hasil komposisi seluruh transformasi objek
+        return self.scene.matrices[self.slot].copy()
+
+    @property
+    def points(self):
+        return _as_tuples(self.vertices)
+
+    @property
+    def corners(self):
+        return None
+
+    @property
+    def color(self):
+        return tuple(self.scene.colors[self.slot].tolist())
+
+    @color.setter
+    def color(self, value):
+        self.scene.colors[self.slot] = value
+        self.scene.version += 1
+
+    @property
+    def line_width(self):
+        return float(self.scene.widths[self.slot])
+
+    @line_width.setter
+    def line_width(self, value):
+        self.scene.widths[self.slot] = value
+        # Tebal garis ikut menentukan jarak pick, jadi dicatat sebagai perubahan geometri slot
+        self.scene.version += 1
+        self.scene.revisions[self.slot] = self.scene.version
+
+    @property
+    def visible(self):
+        return bool(self.scene.visible[self.slot])
+
+    @visible.setter
+    def visible(self, value):
+        self.scene.visible[self.slot] = value
+        self.scene.version += 1
+
+    @property
+    def transformed(self):
+        return bool(self.scene.transformed[self.slot])
+
+    @transformed.setter
+    def transformed(self, value):
+        self.scene.transformed[self.slot] = value
+        self.scene.version += 1
+
+    def get_bounds(self):
+        # Bounding box dunia (xmin, xmax, ymin, ymax) objek (Scene2D.bounds). Disimpan di
+        # Scene2D dan hanya dihitung ulang setelah objek ditransformasi (Transform2D).
+        return tuple(self.scene.box(self.slot).tolist())
+
     def get_center(self):
         if not self.points:
             return (0, 0)
-        
+
         x_sum = sum(p[0] for p in self.points)
         y_sum = sum(p[1] for p in self.points)
         return (x_sum / len(self.points), y_sum / len(self.points))
 
 
 class Point2D(Object2D):
+    __slots__ = ()
+
     def __init__(self, x, y, color=(1.0, 1.0, 1.0), size=1.0):
         super().__init__('point', [(x, y)], color, size)
-    
+
     @property
     def x(self):
-        return self.points[0][0]
-    
+        return float(self.vertices[0, 0])
+
     @property
     def y(self):
-        return self.points[0][1]
+        return float(self.vertices[0, 1])
 
 
 class Line2D(Object2D):
+    __slots__ = ()
+
     def __init__(self, x1, y1, x2, y2, color=(1.0, 1.0, 1.0), width=1.0):
         super().__init__('line', [(x1, y1), (x2, y2)], color, width)
-    
+
     @property
     def start_point(self):
         return self.points[0]
-    
+
     @property
     def end_point(self):
         return self.points[1]
-    
+
     @property
     def length(self):
         """Menghitung panjang garis"""
@@ -55,78 +130,107 @@ class Line2D(Object2D):
 
 
 class Rectangle2D(Object2D):
+    # Disimpan sebagai 4 sudut: kiri bawah, kanan bawah, kanan atas, kiri atas
+    __slots__ = ()
+
     def __init__(self, x1, y1, x2, y2, color=(1.0, 1.0, 1.0), width=1.0):
         min_x, min_y = min(x1, x2), min(y1, y2)
         max_x, max_y = max(x1, x2), max(y1, y2)
-        super().__init__('rectangle', [(min_x, min_y), (max_x, max_y)], color, width)
-
-        self.corners = [
+        super().__init__('rectangle', [
             (min_x, min_y),  # Bottom-left
             (max_x, min_y),  # Bottom-right
             (max_x, max_y),  # Top-right
             (min_x, max_y)   # Top-left
-        ]
-    
+        ], color, width)
+
+    @property
+    def points(self):
+        # Sebelum dirotasi/diskalakan: 2 titik (min, max); sesudahnya: 4 sudut
+        corners = _as_tuples(self.vertices)
+        return corners if self.transformed else [corners[0], corners[2]]
+
+    @property
+    def corners(self):
+        return _as_tuples(self.vertices)
+
     @property
     def width(self):
         """Mendapatkan lebar persegi panjang"""
-        if len(self.points) == 2:
-            return abs(self.points[1][0] - self.points[0][0])
-        elif self.corners:
-            x_values = [p[0] for p in self.corners]
-            return max(x_values) - min(x_values)
-        return 0
-    
+        x_values = self.vertices[:, 0]
+        return float(x_values.max() - x_values.min())
+
     @property
     def height(self):
         """Mendapatkan tinggi persegi panjang"""
-        if len(self.points) == 2:
-            return abs(self.points[1][1] - self.points[0][1])
-        elif self.corners:
-            y_values = [p[1] for p in self.corners]
-            return max(y_values) - min(y_values)
-        return 0
+        y_values = self.vertices[:, 1]
+        return float(y_values.max() - y_values.min())
 
 
 class Ellipse2D(Object2D):
+    # Disimpan sebagai 3 vertex: pusat, pusat + sumbu u, pusat + sumbu v.
+    # Rotasi dan skala cukup mengubah ketiga vertex ini; titik keliling dihitung dari u dan v.
+    __slots__ = ()
+
     def __init__(self, x1, y1, x2, y2, color=(1.0, 1.0, 1.0), width=1.0):
         min_x, min_y = min(x1, x2), min(y1, y2)
         max_x, max_y = max(x1, x2), max(y1, y2)
-        super().__init__('ellipse', [(min_x, min_y), (max_x, max_y)], color, width)
 
         cx = (min_x + max_x) / 2
         cy = (min_y + max_y) / 2
         rx = abs(max_x - min_x) / 2
         ry = abs(max_y - min_y) / 2
-        
-        self.center = (cx, cy)
-        self.radii = (rx, ry)
+        super().__init__('ellipse', [(cx, cy), (cx + rx, cy), (cx, cy + ry)], color, width)
 
-        self.rotated_points = []
-        steps = 36
-        for i in range(steps):
-            angle_rad = math.radians(i * (360 / steps))
-            point_x = cx + rx * math.cos(angle_rad)
-            point_y = cy + ry * math.sin(angle_rad)
-            self.rotated_points.append((point_x, point_y))
+    @property
+    def axes(self):
+        # Vektor semi-sumbu (u, v) sebagai array (2, 2)
+        vertices = self.vertices
+        return vertices[1:3] - vertices[0]
+
+    @property
+    def center(self):
+        return tuple(self.vertices[0].tolist())
+
+    @property
+    def radii(self):
+        u, v = self.axes
+        return (math.hypot(u[0], u[1]), math.hypot(v[0], v[1]))
+
+    @property
+    def rotation_angle(self):
+        u = self.axes[0]
+        return math.degrees(math.atan2(u[1], u[0]))
 
-        self.corners = None
+    def outline(self, segments=None):
+        # Titik keliling ellipse; tanpa segments, jumlahnya mengikuti jari-jari
+        # (dengan asumsi 1 unit dunia = 1 piksel seperti tampilan awal)
+        u, v = self.axes
+        if segments is None:
+            segments = ellipse_segment_count(max(self.radii))
+        unit = unit_circle(segments)
+        return self.vertices[0] + unit[:, :1] * u + unit[:, 1:] * v
+
+    @property
+    def rotated_points(self):
+        return _as_tuples(self.outline())
+
+    @property
+    def points(self):
+        (cx, cy), (rx, ry) = self.center, self.radii
+        return [(cx - rx, cy - ry), (cx + rx, cy + ry)]
 
-        self.transformed = False
-        self.rotation_angle = 0
-    
     @property
     def cx(self):
         return self.center[0]
-    
+
     @property
     def cy(self):
         return self.center[1]
-    
+
     @property
     def rx(self):
         return self.radii[0]
-    
+
     @property
     def ry(self):
         return self.radii[1]
@@ -1,9 +1,311 @@
 import math
+from functools import lru_cache
+import numpy as np
+import pygame
 from OpenGL.GL import *
-from pro2d.clipping import Clipper
+from pro2d.clipping import Clipper, ClipWindow
+from pro2d.bvh import INSIDE, OUTSIDE
+from pro2d.scene import POINT, LINE, RECTANGLE, ELLIPSE
+from pro2d.utils import unit_circle, ellipse_segment_count
+
+class SceneClip:
+    # Hasil clip_scene yang disimpan antar frame. Semua segmen dan poligon hasil clipping
+    # ada dalam array gabungan dengan rentang per slot objek. Slot hanya di-clip ulang jika
+    # geometrinya berubah (Scene2D.revisions); seluruh isi dibuang jika scene, window,
+    # atau skala LOD berubah.
+    def __init__(self):
+        self.scene = None
+        self.key = None
+        self.reset(0)
+
+    def reset(self, slot_count):
+        self.revisions = np.full(slot_count, -1, dtype=np.int64)   # -1: belum pernah di-clip
+        self.starts = np.full(slot_count, -1, dtype=np.int64)
+        self.counts = np.zeros(slot_count, dtype=np.int64)
+        self.polygon_starts = np.full(slot_count, -1, dtype=np.int64)
+        self.polygon_counts = np.zeros(slot_count, dtype=np.int64)
+        self.accept = np.zeros(0, dtype=bool)
+        self.clipped = np.zeros((0, 4))
+        self.polygons = np.zeros((0, 2))
+        self.segment_rows = 0
+        self.polygon_rows = 0
+
+    def prepare(self, scene, key):
+        # Baris milik hasil lama yang sudah diganti ikut dibuang saat jumlahnya terlalu banyak
+        garbage = self.segment_rows > 2 * int(self.counts.sum()) + 4096
+        if scene is not self.scene or key != self.key or garbage:
+            self.scene = scene
+            self.key = key
+            self.reset(scene.slot_count)
+        elif scene.slot_count > len(self.revisions):
+            grow = scene.slot_count - len(self.revisions)
+            self.revisions = np.concatenate((self.revisions, np.full(grow, -1, dtype=np.int64)))
+            self.starts = np.concatenate((self.starts, np.full(grow, -1, dtype=np.int64)))
+            self.counts = np.concatenate((self.counts, np.zeros(grow, dtype=np.int64)))
+            self.polygon_starts = np.concatenate((self.polygon_starts, np.full(grow, -1, dtype=np.int64)))
+            self.polygon_counts = np.concatenate((self.polygon_counts, np.zeros(grow, dtype=np.int64)))
+
+    def stale(self, slots):
+        # Slot yang belum di-clip atau geometrinya berubah sejak terakhir di-clip
+        return slots[self.revisions[slots] != self.scene.revisions[slots]]
+
+    @staticmethod
+    def _append(buffer, used, rows):
+        # Tambahkan baris di belakang buffer; kapasitas digandakan seperti buffer Scene2D
+        if used + len(rows) > len(buffer):
+            grown = np.zeros((max(2 * len(buffer), used + len(rows)),) + buffer.shape[1:], dtype=buffer.dtype)
+            grown[:used] = buffer[:used]
+            buffer = grown
+        buffer[used:used + len(rows)] = rows
+        return buffer
+
+    def store(self, slots, accept, clipped, counts, polygons=None, polygon_counts=None):
+        # counts[i] segmen (dan polygon_counts[i] titik poligon) berurutan milik slots[i]
+        starts = self.segment_rows + np.cumsum(counts) - counts
+        self.accept = self._append(self.accept, self.segment_rows, accept)
+        self.clipped = self._append(self.clipped, self.segment_rows, clipped)
+        self.segment_rows += len(accept)
+        self.starts[slots] = starts
+        self.counts[slots] = counts
+        if polygons is not None:
+            self.polygon_starts[slots] = self.polygon_rows + np.cumsum(polygon_counts) - polygon_counts
+            self.polygon_counts[slots] = polygon_counts
+            self.polygons = self._append(self.polygons, self.polygon_rows, polygons)
+            self.polygon_rows += len(polygons)
+        else:
+            self.polygon_starts[slots] = -1
+            self.polygon_counts[slots] = 0
+        self.revisions[slots] = self.scene.revisions[slots]
+
+    def rows(self, slots):
+        # Indeks baris segmen milik banyak slot sekaligus (berurutan per slot) dan jumlahnya per slot
+        counts = self.counts[slots]
+        starts = np.repeat(self.starts[slots] - np.cumsum(counts) + counts, counts)
+        return np.arange(len(starts)) + starts, counts
+
+class EllipseOutlines:
+    # Keliling ellipse yang sudah ditesselasi, sebagai pasangan verteks GL_LINES, disimpan antar
+    # frame dalam satu array dengan rentang per slot. Slot ditesselasi ulang hanya jika geometrinya
+    # berubah (Scene2D.revisions) atau level LOD-nya (jumlah segmen) berubah karena zoom.
+    def __init__(self):
+        self.scene = None
+        self.reset(0)
+
+    def reset(self, slot_count):
+        self.revisions = np.full(slot_count, -1, dtype=np.int64)   # -1: belum pernah ditesselasi
+        self.segments = np.zeros(slot_count, dtype=np.int64)
+        self.starts = np.zeros(slot_count, dtype=np.int64)
+        self.counts = np.zeros(slot_count, dtype=np.int64)        # verteks (2 x segmen) per slot
+        self.vertices = np.zeros((0, 2))
+        self.rows = 0
+
+    def prepare(self, scene):
+        garbage = self.rows > 2 * int(self.counts.sum()) + 4096
+        if scene is not self.scene or garbage:
+            self.scene = scene
+            self.reset(scene.slot_count)
+        elif scene.slot_count > len(self.revisions):
+            grow = scene.slot_count - len(self.revisions)
+            self.revisions = np.concatenate((self.revisions, np.full(grow, -1, dtype=np.int64)))
+            self.segments = np.concatenate((self.segments, np.zeros(grow, dtype=np.int64)))
+            self.starts = np.concatenate((self.starts, np.zeros(grow, dtype=np.int64)))
+            self.counts = np.concatenate((self.counts, np.zeros(grow, dtype=np.int64)))
+
+    def lines(self, scene, slots, center, u, v):
+        # Verteks GL_LINES keliling ellipse slots (pusat dan semi-sumbu u, v per ellipse), berurutan
+        # per ellipse, beserta jumlah verteks setiap ellipse
+        self.prepare(scene)
+        segments = Renderer.ellipse_segments(np.maximum(np.hypot(u[:, 0], u[:, 1]), np.hypot(v[:, 0], v[:, 1])))
+        stale = np.flatnonzero((self.revisions[slots] != scene.revisions[slots]) | (self.segments[slots] != segments))
+        for count in np.unique(segments[stale]).tolist():
+            group = stale[segments[stale] == count]
+            unit = unit_circle(count)[loop_pairs(count)]
+            outline = (center[group, None, :]
+                       + unit[None, :, :1] * u[group, None, :]
+                       + unit[None, :, 1:] * v[group, None, :])
+            group_slots = slots[group]
+            self.starts[group_slots] = self.rows + np.arange(len(group)) * (2 * count)
+            self.counts[group_slots] = 2 * count
+            self.segments[group_slots] = count
+            self.revisions[group_slots] = scene.revisions[group_slots]
+            self.vertices = SceneClip._append(self.vertices, self.rows, outline.reshape(-1, 2))
+            self.rows += len(group) * 2 * count
+
+        counts = self.counts[slots]
+        starts = np.repeat(self.starts[slots] - np.cumsum(counts) + counts, counts)
+        return self.vertices[np.arange(len(starts)) + starts], counts
+
+
+@lru_cache(maxsize=None)
+def loop_pairs(count):
+    # Indeks titik 0, 1, 1, 2, ..., count - 1, 0 untuk menggambar poligon tertutup sebagai GL_LINES
+    pairs = np.arange(1, 2 * count + 1) // 2 % count
+    pairs.flags.writeable = False
+    return pairs
+
+
+HOVER_COLOR = (0.5, 0.85, 1.0)   # sorotan objek di bawah kursor
+SELECTED_COLOR = (1.0, 0.8, 0.2)
+INSIDE_COLOR = (0.0, 1.0, 0.0)   # objek (atau bagian objek) di dalam window clipping
+MARKER_COLOR = (1.0, 1.0, 1.0)   # titik sudut/ujung/pusat dan lingkaran objek terpilih
+VERTEX_COUNTS = {POINT: 1, LINE: 2, RECTANGLE: 4, ELLIPSE: 3}
+UNORDERED = np.iinfo(np.int64).max   # kunci urutan untuk verteks yang ditambahkan tanpa kunci
+
+# Lingkaran penanda titik terpilih (36 titik, tiap 10 derajat) sebagai (cos, sin)
+SELECTION_CIRCLE = [(math.cos(math.radians(i * 10)), math.sin(math.radians(i * 10))) for i in range(36)]
+
+
+class StyleBucket:
+    # Verteks dan warna satu kelompok gaya. Koordinat dari Python ditampung di list dan baru
+    # dijadikan array saat diperlukan; array NumPy (mis. keliling ellipse) disimpan apa adanya.
+    # Chunk boleh membawa kunci urutan per verteks (posisi objek di urutan gambar): verteks
+    # diurutkan stabil menurut kunci sebelum dikirim, sehingga objek yang dibangun per tipe
+    # tetap digambar sesuai urutan gambar. Verteks tanpa kunci digambar paling akhir.
+    def __init__(self):
+        self.chunks = []   # (verteks (n, 2), warna (n, 3), kunci (n,) atau None) sesuai urutan penambahan
+        self.coords = []   # x1, y1, x2, y2, ... yang belum masuk chunks
+        self.colors = []   # r, g, b per verteks di coords
+
+    def __len__(self):
+        return sum(len(chunk[0]) for chunk in self.chunks) + len(self.coords) // 2
+
+    def extend(self, coords, color):
+        self.coords.extend(coords)
+        self.colors.extend(color * (len(coords) // 2))
+
+    def extend_array(self, vertices, color, keys=None):
+        # color: satu warna (3,) atau per verteks (n, 3)
+        self.seal()
+        self.chunks.append((vertices, np.broadcast_to(color, (len(vertices), 3)), keys))
+
+    def seal(self):
+        if self.coords:
+            self.chunks.append((np.array(self.coords).reshape(-1, 2), np.array(self.colors).reshape(-1, 3), None))
+            self.coords = []
+            self.colors = []
+
+    def arrays(self):
+        # (verteks, warna) float32 siap untuk glVertexPointer/glColorPointer
+        self.seal()
+        vertices, colors, keys = zip(*self.chunks)
+        vertices = np.concatenate(vertices).astype(np.float32, copy=False)
+        colors = np.concatenate(colors).astype(np.float32, copy=False)
+        if any(k is not None for k in keys):
+            keys = np.concatenate([np.full(len(chunk[0]), UNORDERED) if chunk[2] is None else chunk[2]
+                                   for chunk in self.chunks])
+            if len(keys) > 1 and np.any(keys[1:] < keys[:-1]):
+                order = np.argsort(keys, kind='stable')
+                vertices, colors = vertices[order], colors[order]
+        return vertices, colors
+
+
+class RenderBatch:
+    # Primitif satu frame dikumpulkan dulu, lalu dikirim per kelompok gaya dengan satu
+    # glDrawArrays (vertex array + color array dari client memory), bukan glBegin/glEnd per objek.
+    # Semua garis (termasuk keliling persegi panjang/ellipse) menjadi GL_LINES per lebar garis,
+    # titik menjadi GL_POINTS per ukuran. Urutan di dalam kelompok sama dengan urutan penambahan
+    # (atau urutan kunci, lihat StyleBucket); kelompok garis digambar sebelum kelompok titik.
+    def __init__(self):
+        self.lines = {}    # lebar -> StyleBucket
+        self.points = {}   # ukuran -> StyleBucket
+
+    def __len__(self):
+        # Jumlah verteks yang menunggu dikirim
+        return sum(len(bucket) for buckets in (self.lines, self.points) for bucket in buckets.values())
+
+    @staticmethod
+    def _bucket(buckets, size):
+        bucket = buckets.get(size)
+        if bucket is None:
+            bucket = buckets[size] = StyleBucket()
+        return bucket
+
+    def add_points(self, coords, color, size):
+        # coords: koordinat datar (x1, y1, x2, y2, ...)
+        self._bucket(self.points, size).extend(coords, color)
+
+    def add_segments(self, coords, color, width):
+        # coords: segmen datar (x1, y1, x2, y2, ...) atau array (n, 4)
+        if isinstance(coords, np.ndarray):
+            self._bucket(self.lines, width).extend_array(coords.reshape(-1, 2), color)
+        else:
+            self._bucket(self.lines, width).extend(coords, color)
+
+    def add_arrays(self, mode, vertices, colors, keys, sizes):
+        # Banyak primitif sekaligus: verteks (n, 2), warna (n, 3), kunci urutan (n,), dan
+        # lebar garis (GL_LINES) atau ukuran titik (GL_POINTS) per verteks
+        buckets = self.lines if mode == GL_LINES else self.points
+        for size in np.unique(sizes).tolist():
+            mask = sizes == size
+            if mask.all():
+                self._bucket(buckets, size).extend_array(vertices, colors, keys)
+            else:
+                self._bucket(buckets, size).extend_array(vertices[mask], colors[mask], keys[mask])
+
+    def add_loop(self, points, color, width):
+        # Poligon tertutup (list titik atau array (n, 2)) sebagai n segmen
+        if isinstance(points, np.ndarray):
+            self._bucket(self.lines, width).extend_array(points[loop_pairs(len(points))], color)
+            return
+        coords = []
+        previous = points[-1]
+        for point in points:
+            coords.extend(previous)
+            coords.extend(point)
+            previous = point
+        self.add_segments(coords, color, width)
+
+    def flush(self):
+        # Kirim semua kelompok ke GL lalu kosongkan batch
+        if not (self.lines or self.points):
+            return
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        for mode, buckets, set_size in ((GL_LINES, self.lines, glLineWidth), (GL_POINTS, self.points, glPointSize)):
+            for size, bucket in buckets.items():
+                if not len(bucket):
+                    continue
+                vertex_array, color_array = bucket.arrays()
+                set_size(size)
+                glVertexPointer(2, GL_FLOAT, 0, vertex_array)
+                glColorPointer(3, GL_FLOAT, 0, color_array)
+                glDrawArrays(mode, 0, len(vertex_array))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        self.clear()
+
+    def clear(self):
+        self.lines = {}
+        self.points = {}
+
 
 # Kelas yang berisi metode-metode untuk merender objek grafik 2D.
 class Renderer:
+    # Skala piksel per unit dunia dan toleransi chordal error (piksel) untuk LOD ellipse
+    pixel_scale = 1.0
+    lod_tolerance = 0.25
+    grid_min_pixels = 40   # jarak minimum antar garis grid di layar
+
+    @staticmethod
+    def set_view(width, height, ortho_bounds):
+        left, right, bottom, top = ortho_bounds
+        Renderer.pixel_scale = max(width / (right - left), height / (top - bottom))
+
+    @staticmethod
+    def grid_spacing():
+        # Jarak grid (unit dunia) 1, 2, atau 5 x 10^k terkecil yang di layar minimal grid_min_pixels
+        target = Renderer.grid_min_pixels / Renderer.pixel_scale
+        base = 10.0 ** math.floor(math.log10(target))
+        for step in (1, 2, 5):
+            if base * step >= target:
+                return base * step
+        return base * 10
+
+    @staticmethod
+    def ellipse_segments(radius):
+        # Jumlah segmen keliling untuk jari-jari (unit dunia) pada tampilan saat ini
+        return ellipse_segment_count(radius * Renderer.pixel_scale, Renderer.lod_tolerance)
+
     @staticmethod
     def draw_point(x, y, color, size=5):
         glColor3f(*color)
@@ -44,43 +346,20 @@ class Renderer:
         glEnd()
     
     @staticmethod
-    def draw_ellipse(cx, cy, rx, ry, color, width=1):
-        glColor3f(*color)
-        glLineWidth(width)
-        glBegin(GL_LINE_LOOP)
-        
-        for i in range(360):
-            angle = math.radians(i)
-            x = cx + rx * math.cos(angle)
-            y = cy + ry * math.sin(angle)
-            glVertex2f(x, y)
-        
-        glEnd()
-    
-    @staticmethod
-    def draw_transformed_ellipse(obj, color, width=1):
-        glColor3f(*color)
-        glLineWidth(width)
-
-        if hasattr(obj, 'rotated_points') and obj.rotated_points:
-            glBegin(GL_LINE_LOOP)
-            for point in obj.rotated_points:
-                glVertex2f(point[0], point[1])
-            glEnd()
-        else:
-            cx, cy = obj.center if hasattr(obj, 'center') else (0, 0)
-            rx, ry = obj.radii if hasattr(obj, 'radii') else (1, 1)
-            
-            glBegin(GL_LINE_LOOP)
-            for i in range(36):
-                angle = math.radians(i * 10)
-                x = cx + rx * math.cos(angle)
-                y = cy + ry * math.sin(angle)
-                glVertex2f(x, y)
-            glEnd()
+    def draw_ellipse(cx, cy, rx, ry, color, width=1, segments=None):
+        if segments is None:
+            segments = Renderer.ellipse_segments(max(rx, ry))
+        unit = unit_circle(segments)
+        Renderer.draw_outline((unit * (rx, ry) + (cx, cy)).tolist(), color, width)
     
     @staticmethod
     def draw_axes(x_min=-400, x_max=400, y_min=-300, y_max=300, grid_spacing=50):
+        # Grid pada kelipatan grid_spacing di dalam batas (bukan sumbu), titik skala setiap dua garis grid
+        def multiples(low, high):
+            first, last = math.ceil(low / grid_spacing), math.floor(high / grid_spacing)
+            return [(i, i * grid_spacing) for i in range(first, last + 1) if i != 0]
+        x_lines, y_lines = multiples(x_min, x_max), multiples(y_min, y_max)
+
         # Draw X axis (horizontal) in red
         glColor3f(1.0, 0.0, 0.0)  # red
         glLineWidth(1.5)
@@ -103,20 +382,14 @@ class Renderer:
         glBegin(GL_LINES)
         
         # Horizontal grid lines
-        for y in range(0, y_max + 1, grid_spacing):
-            if y != 0:
-                glVertex2f(x_min, y)
-                glVertex2f(x_max, y)
-                glVertex2f(x_min, -y)
-                glVertex2f(x_max, -y)
+        for _, y in y_lines:
+            glVertex2f(x_min, y)
+            glVertex2f(x_max, y)
         
         # Vertical grid lines
-        for x in range(0, x_max + 1, grid_spacing):
-            if x != 0:
-                glVertex2f(x, y_min)
-                glVertex2f(x, y_max)
-                glVertex2f(-x, y_min)
-                glVertex2f(-x, y_max)
+        for _, x in x_lines:
+            glVertex2f(x, y_min)
+            glVertex2f(x, y_max)
         
         glEnd()
 
@@ -124,15 +397,13 @@ class Renderer:
         glPointSize(3)
         glBegin(GL_POINTS)
 
-        for x in range(0, x_max + 1, 100):
-            if x != 0:
+        for i, x in x_lines:
+            if i % 2 == 0:
                 glVertex2f(x, 0)
-                glVertex2f(-x, 0)
 
-        for y in range(0, y_max + 1, 100):
-            if y != 0:
+        for i, y in y_lines:
+            if i % 2 == 0:
                 glVertex2f(0, y)
-                glVertex2f(0, -y)
         
         glEnd()
 
@@ -144,25 +415,26 @@ class Renderer:
     
     @staticmethod
     def draw_clipping_window(window_bounds, window_active=True, window_temp_points=None, window_definition_mode=False):
+        # window_bounds: batas [left, right, bottom, top] atau ClipWindow (poligon konveks)
         if window_active:
-            left, right, bottom, top = window_bounds
+            points = ClipWindow.of(window_bounds).points.tolist()
             
             glColor3f(1.0, 0.0, 0.0)  # red
             glLineWidth(2.0)
             glBegin(GL_LINE_LOOP)
-            glVertex2f(left, bottom)   # Bottom-left
-            glVertex2f(right, bottom)  # Bottom-right
-            glVertex2f(right, top)     # Top-right
-            glVertex2f(left, top)      # Top-left
+            for x, y in points:
+                glVertex2f(x, y)
             glEnd()
             
-            glLineWidth(1.0)
-            glBegin(GL_LINES)
-            glVertex2f(left, bottom)
-            glVertex2f(right, top)
-            glVertex2f(left, top)
-            glVertex2f(right, bottom)
-            glEnd()
+            if len(points) == 4:
+                # Diagonal untuk window persegi panjang (juga yang dirotasi)
+                glLineWidth(1.0)
+                glBegin(GL_LINES)
+                glVertex2f(*points[0])
+                glVertex2f(*points[2])
+                glVertex2f(*points[3])
+                glVertex2f(*points[1])
+                glEnd()
 
         if window_definition_mode and window_temp_points:
             glColor3f(1.0, 1.0, 0.0)  # yellow
@@ -171,6 +443,14 @@ class Renderer:
             for point in window_temp_points:
                 glVertex2f(point[0], point[1])
             glEnd()
+
+            if len(window_temp_points) > 1:
+                # Titik-titik window poligon yang sedang didefinisikan
+                glLineWidth(1.0)
+                glBegin(GL_LINE_STRIP)
+                for point in window_temp_points:
+                    glVertex2f(point[0], point[1])
+                glEnd()
             
             if len(window_temp_points) == 1 and window_temp_points[0] is not None:
                 x, y = window_temp_points[0]
@@ -209,264 +489,233 @@ class Renderer:
         glEnd()
     
     @staticmethod
-    def render_object(obj, window_bounds=None, clipping_enabled=False, is_selected=False):
-        if not obj.visible:
+    def draw_outline(points, color, width=1):
+        # Poligon tertutup dengan jumlah titik bebas (mis. keliling ellipse)
+        glColor3f(*color)
+        glLineWidth(width)
+        glBegin(GL_LINE_LOOP)
+        for x, y in points:
+            glVertex2f(x, y)
+        glEnd()
+
+    @staticmethod
+    def ellipse_points(center, u, v, segments=None):
+        # Titik keliling ellipse (array (n, 2)) dari pusat dan kedua vektor semi-sumbunya
+        if segments is None:
+            segments = Renderer.ellipse_segments(max(math.hypot(*u), math.hypot(*v)))
+        unit = unit_circle(segments)
+        return np.asarray(center) + unit[:, :1] * np.asarray(u) + unit[:, 1:] * np.asarray(v)
+
+    @staticmethod
+    def clip_scene(scene, window_bounds, cache=None, slots=None):
+        # Clip semua objek scene langsung dari array Scene2D dalam beberapa panggilan NumPy:
+        # garis dengan Cohen-Sutherland (Cyrus-Beck untuk window konveks sembarang), persegi
+        # panjang dan keliling ellipse sebagai poligon dengan Sutherland-Hodgman. Jika cache
+        # (SceneClip dari frame sebelumnya) diberikan, hanya objek yang berubah yang di-clip ulang.
+        # slots membatasi clipping pada objek tertentu (mis. yang terpotong window menurut SceneBVH).
+        # Hasil dicari per slot (SceneClip.get).
+        window = ClipWindow.of(window_bounds)
+        if cache is None:
+            cache = SceneClip()
+        cache.prepare(scene, (window.key, Renderer.pixel_scale, Renderer.lod_tolerance))
+
+        selected = None
+        if slots is not None:
+            selected = np.zeros(scene.slot_count, dtype=bool)
+            selected[slots] = True
+
+        def candidates(type_code):
+            found = scene.slots_of_type(type_code)
+            if selected is not None:
+                found = found[selected[found]]
+            return cache.stale(found)
+
+        lines = candidates(LINE)
+        if len(lines):
+            accept, clipped = window.clip_segments_batch(scene.gather(lines, 2).reshape(-1, 4))
+            cache.store(lines, accept, clipped, np.ones(len(lines), dtype=np.int64))
+
+        rectangles = candidates(RECTANGLE)
+        if len(rectangles):
+            Renderer._clip_polygons(cache, rectangles, scene.gather(rectangles, 4), window)
+
+        ellipses = candidates(ELLIPSE)
+        if len(ellipses):
+            control = scene.gather(ellipses, 3)
+            center = control[:, 0]
+            u = control[:, 1] - center
+            v = control[:, 2] - center
+            rx = np.hypot(u[:, 0], u[:, 1])
+            ry = np.hypot(v[:, 0], v[:, 1])
+            # Hanya ellipse yang terpotong window yang punya hasil clipping
+            inside, outside = window.ellipse_sides(center, u, v)
+            partial = ~inside & ~outside
+            whole = ellipses[~partial]
+            cache.store(whole, np.zeros(0, dtype=bool), np.zeros((0, 4)), np.zeros(len(whole), dtype=np.int64))
+            partial = np.flatnonzero(partial)
+            if len(partial):
+                # Ellipse dikelompokkan per level LOD agar tiap kelompok tetap satu array (K, n, 2)
+                segments = Renderer.ellipse_segments(np.maximum(rx[partial], ry[partial]))
+                for count in np.unique(segments).tolist():
+                    group = partial[segments == count]
+                    unit = unit_circle(count)
+                    outline = (center[group, None, :]
+                               + unit[None, :, :1] * u[group, None, :]
+                               + unit[None, :, 1:] * v[group, None, :])
+                    Renderer._clip_polygons(cache, ellipses[group], outline, window)
+
+        return cache
+
+    @staticmethod
+    def _clip_polygons(cache, slots, outlines, window_bounds):
+        # Simpan poligon hasil clipping beserta sisi-sisinya yang terlihat (digambar hijau)
+        points, counts, boundary = Clipper.clip_polygons_batch(outlines, window_bounds)
+        segments, edge_counts = Clipper.polygon_edges(points, counts, boundary)
+        polygons = points[np.arange(points.shape[1]) < counts[:, None]]
+        cache.store(slots, np.ones(len(segments), dtype=bool), segments, edge_counts, polygons, counts)
+
+    @staticmethod
+    def add_objects(batch, scene, type_code, order, slots, selected, window=None, regions=None, clip=None,
+                    outlines=None):
+        # Semua objek bertipe type_code di antara slots dimasukkan ke batch sekaligus dari array
+        # Scene2D: warna objek (hijau di dalam window, pudar di luarnya saat clipping), sisi hasil
+        # clipping, dan penanda objek terpilih. order: posisi setiap objek di urutan gambar (kunci
+        # urutan di batch); selected: mask objek terpilih.
+        # window: ClipWindow bila clipping aktif, beserta regions (SceneBVH.query per objek) dan
+        # clip (SceneClip berisi hasil clip_scene untuk objek STRADDLE).
+        # outlines: EllipseOutlines, keliling ellipse yang disimpan antar frame.
+        count = VERTEX_COUNTS[type_code]
+        mask = (scene.types[slots] == type_code) & scene.visible[slots] & (scene.counts[slots] == count)
+        if not mask.any():
             return
-        
-        render_color = obj.color
-        
-        if window_bounds and clipping_enabled:
-            inside_window = False
-            
-            if obj.type == 'point':
-                if Clipper.is_point_inside_window(obj.points[0][0], obj.points[0][1], window_bounds):
-                    inside_window = True
-            
-            elif obj.type == 'line' and len(obj.points) >= 2:
-    
-                pass
-            
-            elif obj.type == 'ellipse' and len(obj.points) >= 2:
-                if hasattr(obj, 'center') and hasattr(obj, 'radii'):
-                    cx, cy = obj.center
-                    rx, ry = obj.radii
-                else:
-                    x1, y1 = obj.points[0]
-                    x2, y2 = obj.points[1]
-                    cx = (x1 + x2) / 2
-                    cy = (y1 + y2) / 2
-                    rx = abs(x2 - x1) / 2
-                    ry = abs(y2 - y1) / 2
-                
-                points_to_check = []
-                points_to_check.append((cx, cy))  # Center
-                
-                points_to_check.append((cx + rx, cy))  # Right
-                points_to_check.append((cx - rx, cy))  # Left
-                points_to_check.append((cx, cy + ry))  # Top
-                points_to_check.append((cx, cy - ry))  # Bottom
-
-                for point in points_to_check:
-                    if Clipper.is_point_inside_window(point[0], point[1], window_bounds):
-                        inside_window = True
-                        break
-            
-            if inside_window:
-                render_color = (0.0, 1.0, 0.0)  # green untuk dalam window
-        
-        if is_selected:
-            render_color = (1.0, 0.8, 0.2)
-        if obj.type == 'point':
-            Renderer.draw_point(obj.points[0][0], obj.points[0][1], render_color, obj.line_width)
-            
-            if is_selected:
-                glColor3f(1.0, 1.0, 1.0)
-                glLineWidth(1.0)
-                glBegin(GL_LINE_LOOP)
-                for i in range(36):
-                    angle = math.radians(i * 10)
-                    x = obj.points[0][0] + (obj.line_width + 5) * math.cos(angle)
-                    y = obj.points[0][1] + (obj.line_width + 5) * math.sin(angle)
-                    glVertex2f(x, y)
-                glEnd()
-        
-        elif obj.type == 'line':
-            if len(obj.points) >= 2:
-                x1, y1 = obj.points[0]
-                x2, y2 = obj.points[1]
-                
-                if window_bounds and clipping_enabled:
-                    clipped, cx1, cy1, cx2, cy2 = Clipper.cohen_sutherland_clip(x1, y1, x2, y2, window_bounds)
-                    if not clipped:
-                        faded_color = tuple(c * 0.2 for c in obj.color)
-                        Renderer.draw_line(x1, y1, x2, y2, faded_color, obj.line_width)
-                    else:
-                        if not (Clipper.is_point_inside_window(x1, y1, window_bounds) and 
-                                Clipper.is_point_inside_window(x2, y2, window_bounds)):
-                            faded_color = tuple(c * 0.4 for c in obj.color)
-                            Renderer.draw_line(x1, y1, x2, y2, faded_color, obj.line_width)
-
-                        green_color = (0.0, 1.0, 0.0)
-                        Renderer.draw_line(cx1, cy1, cx2, cy2, green_color, obj.line_width)
-                else:
-                    Renderer.draw_line(x1, y1, x2, y2, render_color, obj.line_width)
-
-                if is_selected:
-                    glColor3f(1.0, 1.0, 1.0)  # white
-                    glPointSize(8.0)
-                    glBegin(GL_POINTS)
-                    glVertex2f(x1, y1)
-                    glVertex2f(x2, y2)
-                    glEnd()
-        
-        elif obj.type == 'rectangle':
-            if len(obj.points) >= 2:
-                if len(obj.points) == 4 or obj.corners:
-                    rect_points = obj.corners if obj.corners else obj.points
-                else:
-                    x1, y1 = obj.points[0]
-                    x2, y2 = obj.points[1]
-                    rect_points = [
-                        (x1, y1),  # Bottom-left
-                        (x2, y1),  # Bottom-right
-                        (x2, y2),  # Top-right
-                        (x1, y2),  # Top-left
-                    ]
-                
-                if window_bounds and clipping_enabled:
-                    # Potong (clip) persegi panjang terhadap window
-                    is_clipped, is_inside, is_outside, clipped_points = Clipper.clip_rectangle(rect_points, window_bounds)
-                    
-                    if is_inside:
-                        Renderer.draw_rectangle(rect_points, (0.0, 1.0, 0.0), obj.line_width)
-                    elif is_outside:
-                        faded_color = tuple(c * 0.2 for c in obj.color)
-                        Renderer.draw_rectangle(rect_points, faded_color, obj.line_width)
-                    else:
-                        faded_color = tuple(c * 0.4 for c in obj.color)
-                        Renderer.draw_rectangle(rect_points, faded_color, obj.line_width)
-                        
-                        left, right, bottom, top = window_bounds
-                        window_corners = [
-                            (left, bottom),   # Bottom-left
-                            (right, bottom),  # Bottom-right
-                            (right, top),     # Top-right
-                            (left, top),      # Top-left
-                        ]
-                        glColor3f(0.0, 1.0, 0.0)  # Green
-                        glLineWidth(obj.line_width)
-                        glBegin(GL_LINES)
-                        for i in range(len(rect_points)):
-                            x1, y1 = rect_points[i]
-                            x2, y2 = rect_points[(i + 1) % len(rect_points)]
-                            
-                            clipped, cx1, cy1, cx2, cy2 = Clipper.cohen_sutherland_clip(x1, y1, x2, y2, window_bounds)
-                            if clipped:
-                                glVertex2f(cx1, cy1)
-                                glVertex2f(cx2, cy2)
-                        glEnd()
-                else:
-                    Renderer.draw_rectangle(rect_points, render_color, obj.line_width)
-                
-                if is_selected:
-                    # Draw dots at the corners
-                    glColor3f(1.0, 1.0, 1.0)  # white
-                    glPointSize(8.0)
-                    glBegin(GL_POINTS)
-                    
-                    if len(obj.points) == 4:
-                        for point in obj.points:
-                            glVertex2f(point[0], point[1])
-                    elif obj.corners:
-                        for point in obj.corners:
-                            glVertex2f(point[0], point[1])
-                    else:
-                        x1, y1 = obj.points[0]  # Min x, Min y
-                        x2, y2 = obj.points[1]  # Max x, Max y
-                        glVertex2f(x1, y1)  # Bottom-left
-                        glVertex2f(x2, y1)  # Bottom-right
-                        glVertex2f(x2, y2)  # Top-right
-                        glVertex2f(x1, y2)  # Top-left
-                    glEnd()
-        
-        elif obj.type == 'ellipse':
-            if len(obj.points) >= 2:
-                x1, y1 = obj.points[0]
-                x2, y2 = obj.points[1]
-                
-                if window_bounds and clipping_enabled:
-                    if hasattr(obj, 'center') and hasattr(obj, 'radii'):
-                        cx, cy = obj.center
-                        rx, ry = obj.radii
-                    else:
-                        cx = (x1 + x2) / 2
-                        cy = (y1 + y2) / 2
-                        rx = abs(x2 - x1) / 2
-                        ry = abs(y2 - y1) / 2
-                    xmin, xmax, ymin, ymax = window_bounds
-                    ellipse_inside = (cx - rx >= xmin and cx + rx <= xmax and 
-                                     cy - ry >= ymin and cy + ry <= ymax)
-                    ellipse_outside = (cx + rx < xmin or cx - rx > xmax or 
-                                      cy + ry < ymin or cy - ry > ymax)
-                    
-                    if ellipse_inside:
-                        green_color = (0.0, 1.0, 0.0)
-                        
-                        if hasattr(obj, 'transformed') and obj.transformed:
-                            Renderer.draw_transformed_ellipse(obj, green_color, obj.line_width)
-                        else:
-                            Renderer.draw_ellipse(cx, cy, rx, ry, green_color, obj.line_width)
-                    
-                    elif ellipse_outside:
-                        faded_color = tuple(c * 0.2 for c in obj.color)
-                        
-                        if hasattr(obj, 'transformed') and obj.transformed:
-                            Renderer.draw_transformed_ellipse(obj, faded_color, obj.line_width)
-                        else:
-                            Renderer.draw_ellipse(cx, cy, rx, ry, faded_color, obj.line_width)
-                    
-                    else:
-                        faded_color = tuple(c * 0.4 for c in obj.color)
-                        
-                        if hasattr(obj, 'transformed') and obj.transformed:
-                            Renderer.draw_transformed_ellipse(obj, faded_color, obj.line_width)
-                        else:
-                            Renderer.draw_ellipse(cx, cy, rx, ry, faded_color, obj.line_width)
-                        
-                        glColor3f(0.0, 1.0, 0.0)  # Green
-                        glLineWidth(obj.line_width)
-                        
-                        if hasattr(obj, 'transformed') and obj.transformed and hasattr(obj, 'rotated_points'):
-                            points = obj.rotated_points
-                            glBegin(GL_LINES)
-                            for i in range(len(points)):
-                                x1, y1 = points[i]
-                                x2, y2 = points[(i + 1) % len(points)]
-
-                                clipped, cx1, cy1, cx2, cy2 = Clipper.cohen_sutherland_clip(x1, y1, x2, y2, window_bounds)
-                                if clipped:
-                                    glVertex2f(cx1, cy1)
-                                    glVertex2f(cx2, cy2)
-                            glEnd()
-                        else:
-                            glBegin(GL_LINES)
-                            for i in range(36):
-                                angle1 = math.radians(i * 10)
-                                angle2 = math.radians(((i + 1) % 36) * 10)
-                                
-                                x1 = cx + rx * math.cos(angle1)
-                                y1 = cy + ry * math.sin(angle1)
-                                x2 = cx + rx * math.cos(angle2)
-                                y2 = cy + ry * math.sin(angle2)
-                                
-                                clipped, cx1, cy1, cx2, cy2 = Clipper.cohen_sutherland_clip(x1, y1, x2, y2, window_bounds)
-                                if clipped:
-                                    glVertex2f(cx1, cy1)
-                                    glVertex2f(cx2, cy2)
-                            glEnd()
-                else:
-                    if hasattr(obj, 'transformed') and obj.transformed:
-                        Renderer.draw_transformed_ellipse(obj, render_color, obj.line_width)
-                    else:
-                        cx = (x1 + x2) / 2
-                        cy = (y1 + y2) / 2
-                        rx = abs(x2 - x1) / 2
-                        ry = abs(y2 - y1) / 2
-                        Renderer.draw_ellipse(cx, cy, rx, ry, render_color, obj.line_width)
-                
-                if is_selected:
-                    if hasattr(obj, 'center'):
-                        cx, cy = obj.center
-                    else:
-                        cx = (x1 + x2) / 2
-                        cy = (y1 + y2) / 2
-                    
-                    glColor3f(1.0, 1.0, 1.0)  # white
-                    glPointSize(8.0)
-                    glBegin(GL_POINTS)
-                    glVertex2f(cx, cy)
-                    glEnd()
-    
+        order, slots, selected = order[mask], slots[mask], selected[mask]
+        vertices = scene.gather(slots, count)
+        colors = scene.colors[slots]
+        widths = scene.widths[slots]
+        everything = np.arange(len(slots))
+        chosen = np.flatnonzero(selected)
+        if window is not None:
+            regions = regions[mask]
+            inside, outside = regions == INSIDE, regions == OUTSIDE
+            straddle = np.flatnonzero(~inside & ~outside)
+
+        def add(mode, points, object_colors, index, per_object, sizes):
+            # points: verteks berurutan milik objek index, per_object verteks untuk setiap objek
+            object_colors = np.broadcast_to(object_colors, (len(index), 3))
+            batch.add_arrays(mode, points, np.repeat(object_colors, per_object, axis=0),
+                             np.repeat(order[index], per_object), np.repeat(sizes, per_object))
+
+        def clipped_edges(index):
+            # Segmen hasil clipping yang terlihat (hijau) milik objek index dan jumlahnya per objek
+            rows, counts = clip.rows(slots[index])
+            keep = clip.accept[rows]
+            counts = np.bincount(np.repeat(np.arange(len(index)), counts)[keep], minlength=len(index))
+            return clip.clipped[rows[keep]].reshape(-1, 2), counts
+
+        def add_outlines(points, per_object, shapes_inside, shapes_outside):
+            # Keliling persegi panjang/ellipse: hijau jika di dalam window, pudar jika di luar atau
+            # terpotong; bagian yang terpotong ditambah sisi hasil clipping berwarna hijau
+            if window is None:
+                add(GL_LINES, points, np.where(selected[:, None], SELECTED_COLOR, colors), everything,
+                    per_object, widths)
+                return
+            render_colors = colors * np.where(shapes_outside, 0.2, 0.4)[:, None]
+            render_colors[shapes_inside] = INSIDE_COLOR
+            add(GL_LINES, points, render_colors, everything, per_object, widths)
+            cut = np.flatnonzero(~shapes_inside & ~shapes_outside)
+            if len(cut):
+                edges, counts = clipped_edges(cut)
+                add(GL_LINES, edges, INSIDE_COLOR, cut, 2 * counts, widths[cut])
+
+        if type_code == POINT:
+            points = vertices[:, 0]
+            render_colors = colors.copy()
+            if window is not None:
+                green = inside.copy()
+                green[straddle] = window.contains_points(points[straddle])
+                render_colors[green] = INSIDE_COLOR
+            render_colors[selected] = SELECTED_COLOR
+            add(GL_POINTS, points, render_colors, everything, 1, widths)
+            if len(chosen):
+                circle = np.asarray(SELECTION_CIRCLE)[loop_pairs(len(SELECTION_CIRCLE))]
+                rings = points[chosen, None, :] + (widths[chosen] + 5)[:, None, None] * circle
+                add(GL_LINES, rings.reshape(-1, 2), MARKER_COLOR, chosen, len(circle), np.ones(len(chosen)))
+            return
+
+        if type_code == LINE:
+            if window is None:
+                add(GL_LINES, vertices.reshape(-1, 2), np.where(selected[:, None], SELECTED_COLOR, colors),
+                    everything, 2, widths)
+            else:
+                edges, accepted = clipped_edges(straddle)
+                accepted = accepted > 0
+                # Garis di luar pudar 0.2; garis yang terpotong digambar pudar 0.4 lalu bagian
+                # dalamnya hijau, kecuali kedua ujungnya di dalam window
+                factor = np.where(outside, 0.2, 0.0)
+                factor[straddle[~accepted]] = 0.2
+                crossing = straddle[accepted]
+                ends_inside = window.contains_points(vertices[crossing].reshape(-1, 2)).reshape(-1, 2).all(axis=1)
+                factor[crossing[~ends_inside]] = 0.4
+                faded = np.flatnonzero(factor)
+                add(GL_LINES, vertices[faded].reshape(-1, 2), colors[faded] * factor[faded, None], faded, 2,
+                    widths[faded])
+                whole = np.flatnonzero(inside)
+                add(GL_LINES, vertices[whole].reshape(-1, 2), INSIDE_COLOR, whole, 2, widths[whole])
+                add(GL_LINES, edges, INSIDE_COLOR, crossing, 2, widths[crossing])
+            if len(chosen):
+                add(GL_POINTS, vertices[chosen].reshape(-1, 2), MARKER_COLOR, chosen, 2, np.full(len(chosen), 8.0))
+
+        elif type_code == RECTANGLE:
+            shapes_inside = shapes_outside = None
+            if window is not None:
+                # Persegi panjang yang terpotong kotaknya: di dalam jika keempat sudutnya di dalam,
+                # terpotong jika ada sisi hasil clipping (atau window di dalamnya), selain itu di luar
+                corners_inside = window.contains_points(vertices[straddle].reshape(-1, 2)).reshape(-1, 4).all(axis=1)
+                _, edge_counts = clip.rows(slots[straddle])
+                touched = (edge_counts > 0) | (clip.polygon_counts[slots[straddle]] > 0)
+                shapes_inside = inside.copy()
+                shapes_inside[straddle[corners_inside]] = True
+                shapes_outside = outside.copy()
+                shapes_outside[straddle[~corners_inside & ~touched]] = True
+            add_outlines(vertices[:, loop_pairs(4)].reshape(-1, 2), 8, shapes_inside, shapes_outside)
+            if len(chosen):
+                add(GL_POINTS, vertices[chosen].reshape(-1, 2), MARKER_COLOR, chosen, 4, np.full(len(chosen), 8.0))
+
+        elif type_code == ELLIPSE:
+            center = vertices[:, 0]
+            u = vertices[:, 1] - center
+            v = vertices[:, 2] - center
+            outline, per_object = (outlines or EllipseOutlines()).lines(scene, slots, center, u, v)
+            shapes_inside = shapes_outside = None
+            if window is not None:
+                ellipse_inside, ellipse_outside = window.ellipse_sides(center[straddle], u[straddle], v[straddle])
+                shapes_inside = inside.copy()
+                shapes_inside[straddle[ellipse_inside]] = True
+                shapes_outside = outside.copy()
+                shapes_outside[straddle[ellipse_outside]] = True
+            add_outlines(outline, per_object, shapes_inside, shapes_outside)
+            if len(chosen):
+                add(GL_POINTS, center[chosen], MARKER_COLOR, chosen, 1, np.full(len(chosen), 8.0))
+
+    @staticmethod
+    def add_hover(batch, obj):
+        # Sorotan hover: garis tepi objek digambar ulang dengan HOVER_COLOR (titik sedikit diperbesar)
+        scene, slot = obj.scene, obj.slot
+        if not scene.visible[slot]:
+            return
+        obj_type = scene.types[slot]
+        vertices = scene.vertices(slot)
+        line_width = float(scene.widths[slot])
+        if obj_type == POINT:
+            batch.add_points(vertices[0].tolist(), HOVER_COLOR, line_width + 2)
+        elif obj_type == LINE:
+            batch.add_segments(vertices.reshape(1, 4), HOVER_COLOR, line_width)
+        elif obj_type == RECTANGLE:
+            batch.add_loop(vertices, HOVER_COLOR, line_width)
+        elif obj_type == ELLIPSE:
+            center, u, v = vertices
+            batch.add_loop(Renderer.ellipse_points(center, u - center, v - center), HOVER_COLOR, line_width)
+
     @staticmethod
     def draw_ui_info(text_lines, x, y, line_height=20):
         if not text_lines:
@@ -527,4 +776,51 @@ class Renderer:
             glVertex2f(x + square_size, y_pos - square_size/2)
             glVertex2f(x + square_size, y_pos + square_size/2)
             glVertex2f(x, y_pos + square_size/2)
-            glEnd()
\ No newline at end of file
+            glEnd()
+
+    @staticmethod
+    def render_text_images(lines, font, color=(255, 255, 255)):
+        # Ubah baris teks menjadi data piksel RGBA (width, height, bytes) untuk glDrawPixels
+        images = []
+        for line in lines:
+            surface = font.render(line, True, color)
+            images.append((surface.get_width(), surface.get_height(), pygame.image.tostring(surface, "RGBA", True)))
+        return images
+
+    @staticmethod
+    def draw_text_panel(text_images, screen_width, screen_height, line_height=16, padding=6):
+        # Panel teks di pojok kanan bawah layar, digambar dalam koordinat piksel
+        if not text_images:
+            return
+        panel_width = max(image[0] for image in text_images) + padding * 2
+        panel_height = len(text_images) * line_height + padding * 2
+        x = screen_width - panel_width - 10
+        y = 10
+
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, screen_width, 0, screen_height, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glColor4f(0.0, 0.0, 0.0, 0.7)
+        glBegin(GL_QUADS)
+        glVertex2f(x, y)
+        glVertex2f(x + panel_width, y)
+        glVertex2f(x + panel_width, y + panel_height)
+        glVertex2f(x, y + panel_height)
+        glEnd()
+
+        for i, (width, height, text_data) in enumerate(text_images):
+            glRasterPos2f(x + padding, y + panel_height - padding - (i + 1) * line_height)
+            glDrawPixels(width, height, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+        glDisable(GL_BLEND)
+
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopMatrix()
@@ -0,0 +1,410 @@
+# Penyimpanan scene 2D berbasis array (struct-of-arrays).
+#
+# Semua vertex objek disimpan dalam satu buffer float64 `coords`, sedangkan atribut
+# per objek (offset, jumlah vertex, tipe, warna, tebal garis, ...) disimpan dalam
+# array terpisah yang diindeks dengan nomor slot. Objek Point2D/Line2D/Rectangle2D/
+# Ellipse2D hanyalah view kecil (scene, slot) ke dalam array tersebut.
+#
+# Geometri asli objek disimpan di `local_coords` dan tidak pernah diubah. Transformasi
+# hanya dikomposisikan ke matriks affine 3x3 per objek (`matrices`); koordinat dunia
+# di `coords` dihitung ulang secara malas saat dibaca (render, hit test, clip).
+from collections.abc import Sequence
+
+import numpy as np
+
+from pro2d.utils import point_segment_distances, point_polygon_distances, point_ellipse_distances
+
+TYPE_NAMES = ('point', 'line', 'rectangle', 'ellipse')
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+POINT, LINE, RECTANGLE, ELLIPSE = range(4)
+
+class Scene2D(Sequence):
+    # Array per objek yang ikut diperbesar, disalin, dan dipadatkan bersama
+    OBJECT_ARRAYS = ('offsets', 'counts', 'types', 'colors', 'widths', 'visible', 'transformed',
+                     'matrices', 'dirty', 'revisions', 'boxes', 'box_revisions')
+
+    def __init__(self, capacity=64, vertex_capacity=None):
+        capacity = max(1, capacity)
+        vertex_capacity = max(1, vertex_capacity or capacity * 4)
+        self.local_coords = np.zeros((vertex_capacity, 2))
+        self.coords = np.zeros((vertex_capacity, 2))   # cache koordinat dunia
+        self.offsets = np.zeros(capacity, dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=np.int32)
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.colors = np.zeros((capacity, 3))
+        self.widths = np.zeros(capacity)
+        self.visible = np.zeros(capacity, dtype=bool)
+        self.transformed = np.zeros(capacity, dtype=bool)
+        self.matrices = np.zeros((capacity, 3, 3))
+        self.dirty = np.zeros(capacity, dtype=bool)     # coords objek belum mengikuti matriksnya
+        self.revisions = np.zeros(capacity, dtype=np.int64)  # version saat geometri slot terakhir berubah
+        self.boxes = np.zeros((capacity, 4))                   # cache bounding box dunia (xmin, xmax, ymin, ymax)
+        self.box_revisions = np.zeros(capacity, dtype=np.int64)  # revisions saat boxes dihitung
+
+        self.vertex_count = 0   # baris coords yang sudah terpakai (termasuk milik objek terhapus)
+        self.slot_count = 0     # slot yang sudah terpakai (termasuk milik objek terhapus)
+        self.dead_vertices = 0
+        self.views = []         # objek dalam urutan gambar (terakhir = paling atas)
+        self._slots = None
+        self.pending = False    # ada slot dirty yang belum dihitung ulang
+        self.version = 0        # naik setiap kali isi scene berubah (untuk redraw on-demand)
+        self.private = False    # scene milik satu objek yang belum dimasukkan ke scene lain
+
+    # Antarmuka seperti list
+    def __len__(self):
+        return len(self.views)
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def __contains__(self, obj):
+        return getattr(obj, 'scene', None) is self and not self.private
+
+    def index(self, obj):
+        return self.views.index(obj)
+
+    @property
+    def slots(self):
+        # Nomor slot semua objek aktif sesuai urutan gambar
+        if self._slots is None:
+            self._slots = np.fromiter((view.slot for view in self.views), dtype=np.int64, count=len(self.views))
+        return self._slots
+
+    def _reserve(self, slots, vertices):
+        if self.slot_count + slots > len(self.offsets):
+            capacity = max(len(self.offsets) * 2, self.slot_count + slots)
+            for name in self.OBJECT_ARRAYS:
+                old = getattr(self, name)
+                grown = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+                grown[:len(old)] = old
+                setattr(self, name, grown)
+        if self.vertex_count + vertices > len(self.coords):
+            capacity = max(len(self.coords) * 2, self.vertex_count + vertices)
+            for name in ('local_coords', 'coords'):
+                old = getattr(self, name)
+                grown = np.zeros((capacity, 2))
+                grown[:len(old)] = old
+                setattr(self, name, grown)
+
+    def allocate(self, type_code, vertices, color, width, visible=True, transformed=False, matrix=None):
+        # Tulis data satu objek ke slot baru dan kembalikan nomor slotnya.
+        # vertices adalah geometri lokal; matrix (default identitas) memetakannya ke dunia.
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        self._reserve(1, len(vertices))
+        slot = self.slot_count
+        offset = self.vertex_count
+        self.local_coords[offset:offset + len(vertices)] = vertices
+        if matrix is None:
+            self.matrices[slot] = np.eye(3)
+            self.coords[offset:offset + len(vertices)] = vertices
+        else:
+            self.matrices[slot] = matrix
+            self.dirty[slot] = True
+            self.pending = True
+        self.offsets[slot] = offset
+        self.counts[slot] = len(vertices)
+        self.types[slot] = type_code
+        self.colors[slot] = color
+        self.widths[slot] = width
+        self.visible[slot] = visible
+        self.transformed[slot] = transformed
+        self.slot_count += 1
+        self.vertex_count += len(vertices)
+        self.version += 1
+        self.revisions[slot] = self.version
+        return slot
+
+    def _copy_from(self, scene, slot):
+        offset, count = scene.offsets[slot], scene.counts[slot]
+        return self.allocate(scene.types[slot], scene.local_coords[offset:offset + count], scene.colors[slot],
+                             scene.widths[slot], scene.visible[slot], scene.transformed[slot],
+                             scene.matrices[slot])
+
+    @classmethod
+    def detached(cls, view, type_code, vertices, color, width):
+        # Scene pribadi untuk objek yang baru dibuat dan belum dimasukkan ke scene aplikasi
+        scene = cls(capacity=1, vertex_capacity=len(vertices))
+        scene.private = True
+        view.scene = scene
+        view.slot = scene.allocate(type_code, vertices, color, width)
+        scene.views.append(view)
+        return scene
+
+    def append(self, obj):
+        self.insert(len(self.views), obj)
+
+    def insert(self, index, obj):
+        source = obj.scene
+        if source is self and not self.private:
+            raise ValueError("Objek sudah ada di scene ini")
+        if not source.private:
+            source.remove(obj)
+            source = obj.scene
+        obj.slot = self._copy_from(source, obj.slot)
+        obj.scene = self
+        self.views.insert(index, obj)
+        self._slots = None
+
+    def extend(self, objects):
+        for obj in objects:
+            self.append(obj)
+
+    def remove(self, obj):
+        if obj not in self:
+            raise ValueError("Objek tidak ada di scene ini")
+        self.views.remove(obj)
+        self._slots = None
+        self.version += 1
+        slot = obj.slot
+        # Data objek dipindahkan ke scene pribadi agar tetap valid (mis. untuk undo)
+        private = Scene2D(capacity=1, vertex_capacity=int(self.counts[slot]))
+        private.private = True
+        obj.slot = private._copy_from(self, slot)
+        obj.scene = private
+        private.views.append(obj)
+
+        self.dead_vertices += int(self.counts[slot])
+        if self.dead_vertices > self.vertex_count // 2 and self.vertex_count > 256:
+            self.compact()
+
+    def pop(self, index=-1):
+        obj = self.views[index]
+        self.remove(obj)
+        return obj
+
+    def clear(self):
+        # Objek lama tetap valid: seluruh array dipindahkan ke scene terpisah yang tidak dirender lagi
+        old = Scene2D.__new__(Scene2D)
+        old.__dict__.update(self.__dict__)
+        old.private = True
+        for view in self.views:
+            view.scene = old
+        self.__init__()
+        self.version = old.version + 1
+
+    def compact(self):
+        # Buang slot dan vertex milik objek yang sudah dihapus
+        slots = self.slots
+        counts = self.counts[slots].astype(np.int64)
+        starts = self.offsets[slots]
+        new_offsets = np.zeros(len(slots), dtype=np.int64)
+        np.cumsum(counts[:-1], out=new_offsets[1:])
+        total = int(counts.sum())
+        # Indeks vertex lama untuk setiap posisi baru, tanpa loop Python
+        source = np.arange(total) - np.repeat(new_offsets - starts, counts)
+
+        self.local_coords = self.local_coords[source] if total else np.zeros((1, 2))
+        self.coords = self.coords[source] if total else np.zeros((1, 2))
+        for name in self.OBJECT_ARRAYS:
+            setattr(self, name, getattr(self, name)[slots])
+        self.offsets = new_offsets
+        for slot, view in enumerate(self.views):
+            view.slot = slot
+        self.slot_count = len(slots)
+        self.vertex_count = total
+        self.dead_vertices = 0
+        self._slots = None
+        # Nomor slot berubah: semua cache per slot (mis. hasil clipping) harus dihitung ulang
+        self.version += 1
+        self.revisions[:len(slots)] = self.version
+
+    # Transformasi: hanya komposisi matriks O(1), geometri dunia menyusul saat dibaca.
+    # slot boleh berupa array slot; matrix boleh satu (3, 3) atau satu per slot (K, 3, 3).
+    def compose(self, slot, matrix):
+        # matrix diterapkan setelah transformasi yang sudah ada (dalam koordinat dunia)
+        self.matrices[slot] = matrix @ self.matrices[slot]
+        self.dirty[slot] = True
+        self.pending = True
+        self.version += 1
+        self.revisions[slot] = self.version
+
+    def compose_local(self, slot, matrix):
+        # matrix diterapkan sebelum transformasi yang sudah ada (dalam koordinat lokal objek)
+        self.matrices[slot] = self.matrices[slot] @ matrix
+        self.dirty[slot] = True
+        self.pending = True
+        self.version += 1
+        self.revisions[slot] = self.version
+
+    def to_world(self, slot, x, y):
+        # Petakan satu titik lokal ke dunia tanpa menghitung ulang seluruh geometri objek
+        m = self.matrices[slot]
+        return (m[..., 0, 0] * x + m[..., 0, 1] * y + m[..., 0, 2],
+                m[..., 1, 0] * x + m[..., 1, 1] * y + m[..., 1, 2])
+
+    def local_vertices(self, slot):
+        offset = self.offsets[slot]
+        return self.local_coords[offset:offset + self.counts[slot]]
+
+    def _apply(self, slot):
+        offset, count = self.offsets[slot], self.counts[slot]
+        m = self.matrices[slot]
+        local = self.local_coords[offset:offset + count]
+        self.coords[offset:offset + count] = local @ m[:2, :2].T + m[:2, 2]
+        self.dirty[slot] = False
+
+    def refresh(self):
+        # Hitung ulang koordinat dunia semua slot dirty dalam satu operasi NumPy
+        if not self.pending:
+            return
+        slots = np.flatnonzero(self.dirty[:self.slot_count])
+        if len(slots) == 1:
+            self._apply(slots[0])
+        elif len(slots):
+            owner = np.repeat(slots, self.counts[slots])
+            rows = self._rows(slots)
+            m = self.matrices[owner]
+            local = self.local_coords[rows]
+            self.coords[rows] = np.einsum('nij,nj->ni', m[:, :2, :2], local) + m[:, :2, 2]
+            self.dirty[slots] = False
+        self.pending = False
+
+    # Ekspor/impor seluruh scene sebagai array padat (dipakai pro2d.serialize)
+    SAVED_ARRAYS = ('types', 'counts', 'coords', 'matrices', 'colors', 'widths', 'visible', 'transformed')
+
+    def to_arrays(self):
+        # Salinan padat sesuai urutan gambar; coords berisi geometri lokal, bukan cache dunia
+        slots = self.slots
+        return {
+            'types': self.types[slots],
+            'counts': self.counts[slots],
+            'coords': self.local_coords[self._rows(slots)],
+            'matrices': self.matrices[slots],
+            'colors': self.colors[slots],
+            'widths': self.widths[slots],
+            'visible': self.visible[slots],
+            'transformed': self.transformed[slots],
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, view_factory):
+        # Bangun scene langsung dari array tanpa membuat objek satu per satu.
+        # view_factory(type_code) mengembalikan view kosong (tanpa __init__) untuk tipe tersebut.
+        types = np.asarray(arrays['types'], dtype=np.int8)
+        counts = np.asarray(arrays['counts'], dtype=np.int32)
+        coords = np.asarray(arrays['coords'], dtype=np.float64).reshape(-1, 2)
+        count = len(types)
+        if int(counts.sum()) != len(coords):
+            raise ValueError("Jumlah vertex tidak sesuai dengan counts")
+
+        scene = cls(capacity=count, vertex_capacity=len(coords))
+        scene.types[:count] = types
+        scene.counts[:count] = counts
+        np.cumsum(counts[:-1], out=scene.offsets[1:count])
+        scene.local_coords[:len(coords)] = coords
+        matrices = arrays.get('matrices')
+        scene.matrices[:count] = np.eye(3) if matrices is None else matrices
+        scene.colors[:count] = arrays['colors']
+        scene.widths[:count] = arrays['widths']
+        scene.visible[:count] = arrays.get('visible', True)
+        scene.transformed[:count] = arrays.get('transformed', False)
+        scene.dirty[:count] = True
+        scene.pending = count > 0
+        scene.slot_count = count
+        scene.vertex_count = len(coords)
+        scene.version = 1
+        scene.revisions[:count] = 1
+
+        for slot, type_code in enumerate(types.tolist()):
+            view = view_factory(type_code)
+            view.scene = scene
+            view.slot = slot
+            scene.views.append(view)
+        return scene
+
+    # Akses vertex (koordinat dunia) per objek
+    def vertices(self, slot):
+        if self.dirty[slot]:
+            self._apply(slot)
+        offset = self.offsets[slot]
+        return self.coords[offset:offset + self.counts[slot]]
+
+    def slots_of_type(self, type_code, visible_only=True):
+        slots = self.slots
+        mask = self.types[slots] == type_code
+        if visible_only:
+            mask &= self.visible[slots]
+        return slots[mask]
+
+    def _rows(self, slots):
+        # Indeks baris coords untuk semua vertex dari slot-slot yang diberikan (berurutan)
+        counts = self.counts[slots].astype(np.int64)
+        starts = np.repeat(self.offsets[slots] - np.cumsum(counts) + counts, counts)
+        return np.arange(len(starts)) + starts
+
+    def bounds(self, slots):
+        # Bounding box dunia (K, 4) -> xmin, xmax, ymin, ymax, sama dengan Object2D.get_bounds.
+        # Kotak disimpan per slot dan hanya dihitung ulang untuk slot yang geometrinya berubah.
+        slots = np.asarray(slots, dtype=np.int64)
+        stale = slots[self.box_revisions[slots] != self.revisions[slots]]
+        if len(stale):
+            stale = np.unique(stale)
+            self.boxes[stale] = self._compute_bounds(stale)
+            self.box_revisions[stale] = self.revisions[stale]
+        return self.boxes[slots]
+
+    def box(self, slot):
+        # Bounding box satu slot (view ke cache)
+        if self.box_revisions[slot] != self.revisions[slot]:
+            self.bounds([slot])
+        return self.boxes[slot]
+
+    def _compute_bounds(self, slots):
+        self.refresh()
+        result = np.zeros((len(slots), 4))
+        types = self.types[slots]
+
+        polygons = np.flatnonzero((types != ELLIPSE) & (self.counts[slots] > 0))
+        if len(polygons):
+            counts = self.counts[slots[polygons]].astype(np.int64)
+            starts = np.zeros(len(counts), dtype=np.int64)
+            np.cumsum(counts[:-1], out=starts[1:])
+            points = self.coords[self._rows(slots[polygons])]
+            result[polygons, 0::2] = np.minimum.reduceat(points, starts)
+            result[polygons, 1::2] = np.maximum.reduceat(points, starts)
+
+        ellipses = np.flatnonzero(types == ELLIPSE)
+        if len(ellipses):
+            control = self.gather(slots[ellipses], 3)
+            center = control[:, 0]
+            u = control[:, 1] - center
+            v = control[:, 2] - center
+            # Jangkauan ellipse searah sumbu x dan y (juga setelah dirotasi)
+            ex = np.hypot(u[:, 0], v[:, 0])
+            ey = np.hypot(u[:, 1], v[:, 1])
+            result[ellipses] = np.stack((center[:, 0] - ex, center[:, 0] + ex,
+                                         center[:, 1] - ey, center[:, 1] + ey), axis=1)
+        return result
+
+    def distances(self, slots, x, y, limit=None):
+        # Jarak (K,) dari titik (x, y) ke garis tepi setiap objek: ke titik, ke segmen garis,
+        # ke sisi persegi panjang terdekat, atau ke keliling ellipse (jarak sebenarnya).
+        # limit (skalar atau per objek): jarak di atas limit boleh hanya perkiraan (tetap > limit)
+        slots = np.asarray(slots, dtype=np.int64)
+        result = np.full(len(slots), np.inf)   # objek tanpa vertex tidak pernah kena
+        types = self.types[slots]
+        for type_code, count in ((POINT, 1), (LINE, 2), (RECTANGLE, 4), (ELLIPSE, 3)):
+            index = np.flatnonzero((types == type_code) & (self.counts[slots] == count))
+            if not len(index):
+                continue
+            vertices = self.gather(slots[index], count)
+            if type_code == POINT:
+                result[index] = np.hypot(vertices[:, 0, 0] - x, vertices[:, 0, 1] - y)
+            elif type_code == LINE:
+                result[index] = point_segment_distances(x, y, vertices.reshape(-1, 4))
+            elif type_code == RECTANGLE:
+                result[index] = point_polygon_distances(x, y, vertices)
+            else:
+                center = vertices[:, 0]
+                result[index] = point_ellipse_distances(x, y, center, vertices[:, 1] - center,
+                                                        vertices[:, 2] - center,
+                                                        limit if np.ndim(limit) == 0 else limit[index])
+        return result
+
+    def gather(self, slots, count):
+        # Vertex objek-objek dengan jumlah vertex sama sebagai array (K, count, 2)
+        self.refresh()
+        return self.coords[self.offsets[slots][:, None] + np.arange(count)]
@@ -0,0 +1,163 @@
+# Simpan dan muat gambar 2D.
+#
+# Dua format:
+#   .npz  - biner terkompresi, langsung berisi array Scene2D (geometri lokal + matriks
+#           transformasi), sehingga hasil muat identik dan cepat untuk ratusan ribu objek
+#   .json - mudah dibaca/diedit; berisi geometri dunia per objek:
+#           point/line -> "points", rectangle -> "corners",
+#           ellipse -> "center" dan "axes" (vektor semi-sumbu u, v; keliling yang sudah
+#           dirotasi dapat diturunkan dari keduanya)
+# Keduanya juga menyimpan window clipping: {"bounds": [l, r, b, t], "active", "clipping"},
+# serta "angle" (rotasi, derajat) dan "shape" (poligon konveks dalam kotak satuan bounds)
+# bila window bukan persegi panjang sejajar sumbu.
+import json
+import os
+
+import numpy as np
+
+from pro2d.objects import Point2D, Line2D, Rectangle2D, Ellipse2D
+from pro2d.scene import Scene2D, TYPE_NAMES, TYPE_CODES, RECTANGLE, ELLIPSE
+
+FORMAT_NAME = 'pro2d-scene'
+FORMAT_VERSION = 1
+VIEW_CLASSES = (Point2D, Line2D, Rectangle2D, Ellipse2D)   # diindeks dengan kode tipe
+VERTEX_COUNTS = (1, 2, 4, 3)
+
+
+def _new_view(type_code):
+    cls = VIEW_CLASSES[type_code]
+    return cls.__new__(cls)
+
+
+def _window_arrays(window):
+    if window is None:
+        return {}
+    arrays = {
+        'window_bounds': np.asarray(window['bounds'], dtype=np.float64),
+        'window_flags': np.array([window['active'], window['clipping']], dtype=bool),
+        'window_angle': np.float64(window.get('angle', 0.0)),
+    }
+    if window.get('shape') is not None:
+        arrays['window_shape'] = np.asarray(window['shape'], dtype=np.float64).reshape(-1, 2)
+    return arrays
+
+
+def save_scene_npz(path, scene, window=None):
+    arrays = scene.to_arrays()
+    arrays.update(_window_arrays(window))
+    np.savez_compressed(path, format_version=FORMAT_VERSION, **arrays)
+
+
+def load_scene_npz(path):
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files}
+    if int(arrays.get('format_version', 0)) > FORMAT_VERSION:
+        raise ValueError(f"Versi format {int(arrays['format_version'])} tidak didukung")
+
+    window = None
+    if 'window_bounds' in arrays:
+        active, clipping = arrays['window_flags'].tolist()
+        window = {'bounds': arrays['window_bounds'].tolist(), 'active': active, 'clipping': clipping,
+                  'angle': float(arrays.get('window_angle', 0.0)), 'shape': None}
+        if 'window_shape' in arrays:
+            window['shape'] = [tuple(p) for p in arrays['window_shape'].tolist()]
+    return Scene2D.from_arrays(arrays, _new_view), window
+
+
+def save_scene_json(path, scene, window=None):
+    # Semua kolom diambil sekaligus sebagai list Python agar loop per objek tidak memanggil NumPy
+    slots = scene.slots
+    scene.refresh()
+    types = scene.types[slots].tolist()
+    colors = scene.colors[slots].tolist()
+    widths = scene.widths[slots].tolist()
+    visible = scene.visible[slots].tolist()
+    transformed = scene.transformed[slots].tolist()
+    coords = scene.coords[scene._rows(slots)].tolist()
+
+    objects = []
+    start = 0
+    for i, type_code in enumerate(types):
+        end = start + VERTEX_COUNTS[type_code]
+        vertices = coords[start:end]
+        start = end
+        entry = {'type': TYPE_NAMES[type_code], 'color': colors[i], 'width': widths[i]}
+        if not visible[i]:
+            entry['visible'] = False
+        if transformed[i]:
+            entry['transformed'] = True
+
+        if type_code == ELLIPSE:
+            (cx, cy), (ux, uy), (vx, vy) = vertices
+            entry['center'] = [cx, cy]
+            entry['axes'] = [[ux - cx, uy - cy], [vx - cx, vy - cy]]
+        elif type_code == RECTANGLE:
+            entry['corners'] = vertices
+        else:
+            entry['points'] = vertices
+        objects.append(entry)
+
+    document = {'format': FORMAT_NAME, 'version': FORMAT_VERSION, 'objects': objects}
+    if window is not None:
+        document['window'] = {'bounds': list(window['bounds']), 'active': bool(window['active']),
+                              'clipping': bool(window['clipping'])}
+        if window.get('angle'):
+            document['window']['angle'] = float(window['angle'])
+        if window.get('shape') is not None:
+            document['window']['shape'] = [list(p) for p in window['shape']]
+    with open(path, 'w') as f:
+        f.write(json.dumps(document, separators=(',', ':')))
+
+
+def load_scene_json(path):
+    with open(path) as f:
+        document = json.load(f)
+    if document.get('format') != FORMAT_NAME:
+        raise ValueError(f"{path} bukan file scene 2D")
+    if document.get('version', 0) > FORMAT_VERSION:
+        raise ValueError(f"Versi format {document['version']} tidak didukung")
+
+    objects = document['objects']
+    types, coords, colors, widths, visible, transformed = [], [], [], [], [], []
+    for entry in objects:
+        type_code = TYPE_CODES[entry['type']]
+        if type_code == ELLIPSE:
+            (cx, cy), ((ux, uy), (vx, vy)) = entry['center'], entry['axes']
+            vertices = [(cx, cy), (cx + ux, cy + uy), (cx + vx, cy + vy)]
+        else:
+            vertices = entry['corners'] if type_code == RECTANGLE else entry['points']
+            if len(vertices) != VERTEX_COUNTS[type_code]:
+                raise ValueError(f"Objek {entry['type']} membutuhkan {VERTEX_COUNTS[type_code]} titik")
+        types.append(type_code)
+        coords.extend(vertices)
+        colors.append(entry['color'])
+        widths.append(entry['width'])
+        visible.append(entry.get('visible', True))
+        transformed.append(entry.get('transformed', False))
+
+    types = np.array(types, dtype=np.int8)
+    arrays = {
+        'types': types,
+        'counts': np.array(VERTEX_COUNTS, dtype=np.int32)[types],
+        'coords': np.array(coords, dtype=np.float64).reshape(-1, 2),
+        'colors': np.array(colors, dtype=np.float64).reshape(-1, 3),
+        'widths': np.array(widths, dtype=np.float64),
+        'visible': np.array(visible, dtype=bool),
+        'transformed': np.array(transformed, dtype=bool),
+    }
+    return Scene2D.from_arrays(arrays, _new_view), document.get('window')
+
+
+def save_scene(path, scene, window=None):
+    # Format dipilih dari ekstensi file: .json untuk JSON, selain itu .npz
+    if os.path.splitext(path)[1].lower() == '.json':
+        save_scene_json(path, scene, window)
+    else:
+        save_scene_npz(path, scene, window)
+
+
+def load_scene(path):
+    # Mengembalikan (Scene2D, window atau None)
+    if os.path.splitext(path)[1].lower() == '.json':
+        return load_scene_json(path)
+    return load_scene_npz(path)
@@ -0,0 +1,58 @@
+# Generator scene acak yang dapat diulang (seed) untuk uji beban dan benchmark.
+#
+# Pemakaian:
+#   generate_scene(app, 100000, seed=1, transformed=0.25)
+#
+# Objek (campuran titik, garis, persegi panjang, ellipse) ditambahkan lewat app.add_object
+# (tercatat seperti objek yang digambar pengguna). Seed dan jumlah yang sama selalu menghasilkan scene
+# yang sama; scene n objek adalah awalan dari scene yang lebih besar dengan seed yang sama.
+import random
+
+from pro2d.objects import Point2D, Line2D, Rectangle2D, Ellipse2D
+from pro2d.transform import Transform2D
+
+COLORS = [(1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (1.0, 1.0, 1.0), (1.0, 1.0, 0.0)]
+LINE_WIDTHS = (1.0, 2.0, 3.0)
+
+
+def random_object(rng, bounds, size=60.0):
+    # Satu objek acak di dalam bounds [left, right, bottom, top]; ukuran sisi hingga +-size
+    left, right, bottom, top = bounds
+    x, y = rng.uniform(left, right), rng.uniform(bottom, top)
+    dx, dy = rng.uniform(-size, size), rng.uniform(-size, size)
+    color = rng.choice(COLORS)
+    width = rng.choice(LINE_WIDTHS)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return Point2D(x, y, color, width)
+    if kind == 1:
+        return Line2D(x, y, x + dx, y + dy, color, width)
+    if kind == 2:
+        return Rectangle2D(x, y, x + dx, y + dy, color, width)
+    return Ellipse2D(x, y, x + dx, y + dy, color, width)
+
+
+def generate_scene(app, count, seed=1, transformed=0.0, bounds=None, size=60.0):
+    # Tambahkan count objek acak ke app. transformed: bagian objek (0..1) yang dirotasi dan
+    # diskalakan terhadap pusatnya lewat Transform2D. bounds default: ortho_bounds app.
+    # Mengembalikan list objek yang ditambahkan.
+    rng = random.Random(seed)
+    bounds = bounds or app.ortho_bounds
+    objects = []
+    for _ in range(count):
+        obj = random_object(rng, bounds, size)
+        app.add_object(obj)
+        objects.append(obj)
+
+    if transformed <= 0:
+        return objects
+    # Transformasi memakai generator terpisah agar posisi objek tidak bergantung pada transformed
+    rng = random.Random(seed + 1)
+    for obj in objects:
+        if rng.random() >= transformed:
+            continue
+        angle, scale = rng.uniform(-180.0, 180.0), rng.uniform(0.5, 1.5)
+        cx, cy = obj.get_center()
+        Transform2D.rotate(obj, angle, cx, cy)
+        Transform2D.scale(obj, scale, scale, cx, cy)
+    return objects
@@ -1,272 +1,154 @@
 import math
 import numpy as np
 
+from pro2d.scene import RECTANGLE, ELLIPSE
+
+# Setiap transformasi hanya dikomposisikan ke matriks affine 3x3 objek (O(1));
+# koordinat dunia baru dihitung saat dibutuhkan oleh render, hit test, atau clip.
+def translation_matrix(dx, dy):
+    return np.array([[1.0, 0.0, dx],
+                     [0.0, 1.0, dy],
+                     [0.0, 0.0, 1.0]])
+
+def rotation_matrix(angle, pivot_x=0, pivot_y=0):
+    cos_a = math.cos(math.radians(angle))
+    sin_a = math.sin(math.radians(angle))
+    # Rotasi terhadap pivot: T(pivot) . R . T(-pivot)
+    return np.array([[cos_a, -sin_a, pivot_x - cos_a * pivot_x + sin_a * pivot_y],
+                     [sin_a, cos_a, pivot_y - sin_a * pivot_x - cos_a * pivot_y],
+                     [0.0, 0.0, 1.0]])
+
+def scale_matrix(sx, sy, pivot_x=0, pivot_y=0):
+    return np.array([[sx, 0.0, pivot_x - sx * pivot_x],
+                     [0.0, sy, pivot_y - sy * pivot_y],
+                     [0.0, 0.0, 1.0]])
+
+# Semua operasi mengembalikan delta (world, local): matriks baru M' = world . M . local.
+# world/local berupa satu matriks (3, 3) atau satu per objek (K, 3, 3); local boleh None.
+# Delta ini cukup untuk undo/redo lewat Transform2D.apply dan Transform2D.revert.
 class Transform2D:
     @staticmethod
     def translate(obj, dx, dy):
-        new_points = []
-        
-        if obj.type == 'rectangle':
-            new_corners = []
-            for point in obj.corners:
-                new_x = point[0] + dx
-                new_y = point[1] + dy
-                new_corners.append((new_x, new_y))
-            obj.corners = new_corners
-            
-            for point in obj.points:
-                new_x = point[0] + dx
-                new_y = point[1] + dy
-                new_points.append((new_x, new_y))
-                
-        elif obj.type == 'ellipse':
-            if hasattr(obj, 'center'):
-                cx, cy = obj.center
-                obj.center = (cx + dx, cy + dy)
-            
-            if hasattr(obj, 'rotated_points') and obj.rotated_points:
-                new_rotated_points = []
-                for point in obj.rotated_points:
-                    new_x = point[0] + dx
-                    new_y = point[1] + dy
-                    new_rotated_points.append((new_x, new_y))
-                obj.rotated_points = new_rotated_points
-            
-            for point in obj.points:
-                new_x = point[0] + dx
-                new_y = point[1] + dy
-                new_points.append((new_x, new_y))
-                
-        else:
-            for point in obj.points:
-                new_x = point[0] + dx
-                new_y = point[1] + dy
-                new_points.append((new_x, new_y))
-        
-        obj.points = new_points
-    
+        world = translation_matrix(dx, dy)
+        obj.scene.compose(obj.slot, world)
+        return world, None
+
     @staticmethod
     def rotate(obj, angle, pivot_x=0, pivot_y=0):
-        if obj is None or not hasattr(obj, 'points') or not obj.points:
+        if obj is None or obj.scene.counts[obj.slot] == 0:
             print("Warning: Cannot rotate - invalid object or no points defined")
-            return
-        
-        cos_a = math.cos(math.radians(angle))
-        sin_a = math.sin(math.radians(angle))
-        
-        if obj.type == 'rectangle':
-            if len(obj.points) == 2 and not obj.transformed:
-                pass
-            
-            new_corners = []
-            for point in obj.corners:
-                x = point[0] - pivot_x
-                y = point[1] - pivot_y
-                
-                new_x = x * cos_a - y * sin_a
-                new_y = x * sin_a + y * cos_a
-                
-                new_x += pivot_x
-                new_y += pivot_y
-                
-                new_corners.append((new_x, new_y))
-            
-            obj.corners = new_corners
-            obj.points = new_corners
+            return None
+
+        # Untuk ellipse ini memutar pusat sekaligus kedua sumbunya
+        world = rotation_matrix(angle, pivot_x, pivot_y)
+        obj.scene.compose(obj.slot, world)
+
+        if obj.type in ('rectangle', 'ellipse'):
             obj.transformed = True
-            
-            return
-        
-        elif obj.type == 'ellipse':
-            if hasattr(obj, 'center') and hasattr(obj, 'radii'):
-                cx, cy = obj.center
-                rx, ry = obj.radii
-            else:
-                x1, y1 = obj.points[0]
-                x2, y2 = obj.points[1]
-                cx = (x1 + x2) / 2
-                cy = (y1 + y2) / 2
-                rx = abs(x2 - x1) / 2
-                ry = abs(y2 - y1) / 2
-                obj.center = (cx, cy)
-                obj.radii = (rx, ry)
-            
-            if not obj.transformed:
-                obj.rotation_angle = 0
-                obj.transformed = True
-                
-                if not hasattr(obj, 'rotated_points') or not obj.rotated_points:
-                    obj.rotated_points = []
-                    steps = 36
-                    for i in range(steps):
-                        angle_rad = math.radians(i * (360 / steps))
-                        point_x = cx + rx * math.cos(angle_rad)
-                        point_y = cy + ry * math.sin(angle_rad)
-                        obj.rotated_points.append((point_x, point_y))
-            
-            obj.rotation_angle += angle
-            
-            x = cx - pivot_x
-            y = cy - pivot_y
-            
-            new_cx = x * cos_a - y * sin_a
-            new_cy = x * sin_a + y * cos_a
-            
-            new_cx += pivot_x
-            new_cy += pivot_y
-            
-            obj.center = (new_cx, new_cy)
-            
-            new_points = []
-            for point in obj.rotated_points:
-                x = point[0] - pivot_x
-                y = point[1] - pivot_y
-                
-                new_x = x * cos_a - y * sin_a
-                new_y = x * sin_a + y * cos_a
-                
-                new_x += pivot_x
-                new_y += pivot_y
-                
-                new_points.append((new_x, new_y))
-            
-            obj.rotated_points = new_points
-            return
-        
-        new_points = []
-        for point in obj.points:
-            x = point[0] - pivot_x
-            y = point[1] - pivot_y
-            
-            new_x = x * cos_a - y * sin_a
-            new_y = x * sin_a + y * cos_a
-            
-            new_x += pivot_x
-            new_y += pivot_y
-            
-            new_points.append((new_x, new_y))
-        obj.points = new_points
-    
+        return world, None
+
     @staticmethod
     def scale(obj, sx, sy, pivot_x=0, pivot_y=0):
-        if obj is None or not hasattr(obj, 'points') or not obj.points:
+        if obj is None or obj.scene.counts[obj.slot] == 0:
             print("Warning: Cannot scale - invalid object or no points defined")
-            return
-        
-        if obj.type == 'rectangle':
-            if len(obj.points) == 2 and not obj.transformed:
-                if pivot_x == 0 and pivot_y == 0:
-                    x1, y1 = obj.points[0]
-                    x2, y2 = obj.points[1]
-                    pivot_x = (x1 + x2) / 2
-                    pivot_y = (y1 + y2) / 2
-            
-            elif len(obj.points) == 4:
-                if pivot_x == 0 and pivot_y == 0:
-                    x_sum = sum(p[0] for p in obj.points)
-                    y_sum = sum(p[1] for p in obj.points)
-                    pivot_x = x_sum / 4
-                    pivot_y = y_sum / 4
-            
-            new_corners = []
-            for point in obj.corners:
-                x = point[0] - pivot_x
-                y = point[1] - pivot_y
-                
-                new_x = x * sx
-                new_y = y * sy
-                
-                new_x += pivot_x
-                new_y += pivot_y
-                
-                new_corners.append((new_x, new_y))
-            
-            obj.corners = new_corners
-            obj.points = new_corners
-            obj.transformed = True
-            
-            return
-        
-        elif obj.type == 'ellipse':
-            if hasattr(obj, 'center') and hasattr(obj, 'radii'):
-                cx, cy = obj.center
-                rx, ry = obj.radii
-            else:
-                x1, y1 = obj.points[0]
-                x2, y2 = obj.points[1]
-                cx = (x1 + x2) / 2
-                cy = (y1 + y2) / 2
-                rx = abs(x2 - x1) / 2
-                ry = abs(y2 - y1) / 2
-                obj.center = (cx, cy)
-                obj.radii = (rx, ry)
-            
+            return None
+
+        scene, slot = obj.scene, obj.slot
+        local = None
+
+        if obj.type == 'ellipse':
+            # Sumbu diskalakan pada kerangka lokal ellipse sehingga rotasinya tetap,
+            # sedangkan pusat diskalakan terhadap pivot (default: pusat ellipse)
+            local_cx, local_cy = scene.local_vertices(slot)[0]
+            cx, cy = scene.to_world(slot, local_cx, local_cy)
             if pivot_x == 0 and pivot_y == 0:
-                pivot_x = cx
-                pivot_y = cy
-            
+                pivot_x, pivot_y = cx, cy
+
+            local = scale_matrix(sx, sy, local_cx, local_cy)
+            world = translation_matrix((cx - pivot_x) * (sx - 1), (cy - pivot_y) * (sy - 1))
+            scene.compose_local(slot, local)
+            scene.compose(slot, world)
             obj.transformed = True
-            
-            x = cx - pivot_x
-            y = cy - pivot_y
-            
-            new_cx = x * sx
-            new_cy = y * sy
-            
-            new_cx += pivot_x
-            new_cy += pivot_y
-            
-            new_rx = rx * sx
-            new_ry = ry * sy
-            
-            obj.center = (new_cx, new_cy)
-            obj.radii = (new_rx, new_ry)
-            
-            rotation_angle = obj.rotation_angle if hasattr(obj, 'rotation_angle') else 0
-            
-            new_rotated_points = []
-            steps = 36
-            
-            for i in range(steps):
-                angle = i * (360 / steps)
-                angle_rad = math.radians(angle)
-                
-                x = new_rx * math.cos(angle_rad)
-                y = new_ry * math.sin(angle_rad)
-                
-                if rotation_angle != 0:
-                    rotation_rad = math.radians(rotation_angle)
-                    cos_rot = math.cos(rotation_rad)
-                    sin_rot = math.sin(rotation_rad)
-                    rotated_x = x * cos_rot - y * sin_rot
-                    rotated_y = x * sin_rot + y * cos_rot
-                    x, y = rotated_x, rotated_y
-                
-                point_x = new_cx + x
-                point_y = new_cy + y
-                
-                new_rotated_points.append((point_x, point_y))
-            
-            obj.rotated_points = new_rotated_points
-            
-            min_x = new_cx - new_rx
-            max_x = new_cx + new_rx
-            min_y = new_cy - new_ry
-            max_y = new_cy + new_ry
-            obj.points = [(min_x, min_y), (max_x, max_y)]
-            
-            return
-        
-        new_points = []
-        for point in obj.points:
-            x = point[0] - pivot_x
-            y = point[1] - pivot_y
-            
-            new_x = x * sx
-            new_y = y * sy
-            
-            new_x += pivot_x
-            new_y += pivot_y
-            
-            new_points.append((new_x, new_y))
-        obj.points = new_points
\ No newline at end of file
+
+        else:
+            if obj.type == 'rectangle':
+                # Pivot default persegi panjang adalah pusatnya
+                if pivot_x == 0 and pivot_y == 0:
+                    pivot_x, pivot_y = scene.to_world(slot, *scene.local_vertices(slot).mean(axis=0))
+                obj.transformed = True
+
+            world = scale_matrix(sx, sy, pivot_x, pivot_y)
+            scene.compose(slot, world)
+
+        return world, local
+
+    # Transformasi kelompok: satu matriks dikomposisikan ke semua slot terpilih sekaligus.
+    # Hasilnya sama dengan memanggil translate/rotate/scale per objek dengan pivot bersama.
+    @staticmethod
+    def group_slots(objects):
+        # Kelompokkan slot per scene agar tiap scene cukup diproses dengan satu operasi array.
+        # Mengembalikan (scene, slot, posisi di objects) per scene.
+        groups = {}
+        for index, obj in enumerate(objects):
+            group = groups.setdefault(id(obj.scene), (obj.scene, [], []))
+            group[1].append(obj.slot)
+            group[2].append(index)
+        return [(scene, np.array(slots, dtype=np.int64), np.array(index, dtype=np.int64))
+                for scene, slots, index in groups.values()]
+
+    @staticmethod
+    def apply(objects, world, local=None, groups=None):
+        # Terapkan delta (world, local) ke sekelompok objek: M' = world . M . local
+        for scene, slots, index in groups or Transform2D.group_slots(objects):
+            if local is not None:
+                scene.compose_local(slots, local if local.ndim == 2 else local[index])
+            scene.compose(slots, world if world.ndim == 2 else world[index])
+
+    @staticmethod
+    def revert(objects, world, local=None):
+        # Kebalikan apply: M = world^-1 . M' . local^-1 (dipakai undo)
+        Transform2D.apply(objects, np.linalg.inv(world), None if local is None else np.linalg.inv(local))
+
+    @staticmethod
+    def translate_group(objects, dx, dy):
+        world = translation_matrix(dx, dy)
+        Transform2D.apply(objects, world)
+        return world, None
+
+    @staticmethod
+    def rotate_group(objects, angle, pivot_x, pivot_y):
+        world = rotation_matrix(angle, pivot_x, pivot_y)
+        groups = Transform2D.group_slots(objects)
+        Transform2D.apply(objects, world, groups=groups)
+        for scene, slots, _ in groups:
+            types = scene.types[slots]
+            scene.transformed[slots[(types == RECTANGLE) | (types == ELLIPSE)]] = True
+        return world, None
+
+    @staticmethod
+    def scale_group(objects, sx, sy, pivot_x, pivot_y):
+        world = scale_matrix(sx, sy, pivot_x, pivot_y)
+        local = None
+        groups = Transform2D.group_slots(objects)
+
+        if any((scene.types[slots] == ELLIPSE).any() for scene, slots, _ in groups):
+            # Sama seperti scale(): sumbu ellipse diskalakan di kerangka lokal dan pusatnya
+            # terhadap pivot, sehingga delta ellipse berbeda per objek
+            world = np.tile(world, (len(objects), 1, 1))
+            local = np.tile(np.eye(3), (len(objects), 1, 1))
+            for scene, slots, index in groups:
+                is_ellipse = scene.types[slots] == ELLIPSE
+                ellipses, rows = slots[is_ellipse], index[is_ellipse]
+                local_center = scene.local_coords[scene.offsets[ellipses]]
+                cx, cy = scene.to_world(ellipses, local_center[:, 0], local_center[:, 1])
+                local[rows, 0, 0], local[rows, 1, 1] = sx, sy
+                local[rows, :2, 2] = local_center * (1 - sx, 1 - sy)
+                world[rows] = np.eye(3)
+                world[rows, 0, 2] = (cx - pivot_x) * (sx - 1)
+                world[rows, 1, 2] = (cy - pivot_y) * (sy - 1)
+
+        Transform2D.apply(objects, world, local, groups)
+        for scene, slots, _ in groups:
+            types = scene.types[slots]
+            scene.transformed[slots[(types == RECTANGLE) | (types == ELLIPSE)]] = True
+        return world, local
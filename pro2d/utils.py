@@ -1,4 +1,6 @@
 import math
+from functools import lru_cache
+
 import numpy as np
 
 def screen_to_world(x, y, width, height, ortho_bounds):
@@ -33,38 +35,121 @@ def normalize_rectangle_points(p1, p2):
     
     return [(min_x, min_y), (max_x, max_y)]
 
-def is_point_near_line(px, py, x1, y1, x2, y2, threshold=5.0):
-    l2 = (x2 - x1)**2 + (y2 - y1)**2
-    
-    # Handle degenerate case
-    if l2 == 0:
-        return math.sqrt((px - x1)**2 + (py - y1)**2) <= threshold
-    
-    t = max(0, min(1, ((px - x1) * (x2 - x1) + (py - y1) * (y2 - y1)) / l2))
-    
-    proj_x = x1 + t * (x2 - x1)
-    proj_y = y1 + t * (y2 - y1)
-    
-    distance = math.sqrt((px - proj_x)**2 + (py - proj_y)**2)
-    
-    return distance <= threshold
-
-def is_point_near_rectangle(px, py, corners, threshold=5.0):
-    for i in range(4):
-        x1, y1 = corners[i]
-        x2, y2 = corners[(i+1) % 4]
-        if is_point_near_line(px, py, x1, y1, x2, y2, threshold):
-            return True
-    
-    return False
+# Hit test: jarak satu titik (px, py) terhadap K bentuk sekaligus (dipakai Scene2D.distances).
+# Semuanya mengembalikan jarak (K,) dalam unit dunia sehingga objek terdekat dapat dipilih.
+ELLIPSE_DISTANCE_ITERATIONS = 10   # batas atas; iterasi berhenti lebih awal jika sudah konvergen
 
-def is_point_near_ellipse(px, py, cx, cy, rx, ry, threshold=5.0):
-    # Normalize to unit circle space
-    nx = (px - cx) / rx
-    ny = (py - cy) / ry
-    
-    dist_to_unit_circle = abs(math.sqrt(nx*nx + ny*ny) - 1.0)
-    
-    actual_distance = dist_to_unit_circle * (rx + ry) / 2
-    
-    return actual_distance <= threshold
+def point_segment_distances(px, py, segments):
+    # Jarak ke setiap segmen (K, 4) x1, y1, x2, y2; segmen dengan panjang nol menjadi titik
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = segments.T
+    dx, dy = x2 - x1, y2 - y1
+    length2 = dx * dx + dy * dy
+    t = np.divide((px - x1) * dx + (py - y1) * dy, length2, out=np.zeros_like(length2), where=length2 > 0)
+    t = np.clip(t, 0.0, 1.0)
+    return np.hypot(px - (x1 + t * dx), py - (y1 + t * dy))
+
+def point_polygon_distances(px, py, polygons):
+    # Jarak ke sisi terdekat setiap poligon tertutup (K, n, 2), mis. sudut persegi panjang
+    polygons = np.asarray(polygons, dtype=np.float64)
+    following = polygons[:, (np.arange(polygons.shape[1]) + 1) % polygons.shape[1]]
+    segments = np.concatenate((polygons, following), axis=2)
+    return point_segment_distances(px, py, segments).reshape(polygons.shape[:2]).min(axis=1)
+
+def point_ellipse_distances(px, py, centers, u, v, limit=None):
+    # Jarak sebenarnya ke keliling ellipse c + u cos t + v sin t (K ellipse; u, v boleh tidak
+    # tegak lurus). Sumbu utama a >= b dan sudutnya diambil dari M M^T dengan M = [u v];
+    # titik lalu diputar ke kerangka ellipse, dicerminkan ke kuadran pertama, dan titik
+    # terdekat dicari dengan iterasi lewat evolute ellipse (konvergen dalam beberapa langkah
+    # juga untuk ellipse yang sangat pipih). Ellipse yang pipih sempurna dihitung sebagai segmen.
+    # limit (skalar atau per ellipse): ellipse yang pasti lebih jauh dari limit tidak diiterasi;
+    # hasilnya batas bawah jarak (tetap > limit). Titik pada ellipse yang diskalakan rho kali
+    # berjarak minimal |rho - 1| * b dari keliling ellipse.
+    centers, u, v = (np.asarray(a, dtype=np.float64).reshape(-1, 2) for a in (centers, u, v))
+    if not len(centers):
+        return np.zeros(0)
+    p = u[:, 0] ** 2 + v[:, 0] ** 2
+    q = u[:, 0] * u[:, 1] + v[:, 0] * v[:, 1]
+    r = u[:, 1] ** 2 + v[:, 1] ** 2
+    mean, spread = (p + r) / 2, np.hypot((p - r) / 2, q)
+    a = np.sqrt(mean + spread)
+    b = np.sqrt(np.maximum(mean - spread, 0.0))
+    angle = 0.5 * np.arctan2(2 * q, p - r)
+    cos, sin = np.cos(angle), np.sin(angle)
+    dx, dy = px - centers[:, 0], py - centers[:, 1]
+    x = np.abs(dx * cos + dy * sin)
+    y = np.abs(dy * cos - dx * sin)
+
+    flat = b <= a * 1e-9
+    result = np.hypot(np.maximum(x - a, 0.0), y)
+    solve = ~flat
+    if limit is not None:
+        bound = np.abs(np.hypot(x / np.where(flat, 1.0, a), y / np.where(flat, 1.0, b)) - 1.0) * b
+        far = solve & (bound > limit)
+        result[far] = bound[far]
+        solve &= ~far
+    if not solve.any():
+        return result
+    a, b, x, y = a[solve], b[solve], x[solve], y[solve]
+
+    # Baris 0 untuk sumbu a, baris 1 untuk sumbu b; t = titik keliling (cos, sin) di kuadran pertama
+    axes = np.stack((a, b))
+    evolute = (axes[0] ** 2 - axes[1] ** 2) / axes * [[1.0], [-1.0]]
+    point = np.stack((x, y))
+    t = np.full(axes.shape, math.sqrt(0.5))
+    for _ in range(ELLIPSE_DISTANCE_ITERATIONS):
+        e = evolute * (t * t * t)
+        arm = axes * t - e
+        offset = point - e
+        scale = np.hypot(arm[0], arm[1]) / (np.hypot(offset[0], offset[1]) + 1e-300)
+        previous = t
+        t = (offset * scale + e) / axes
+        np.minimum(np.maximum(t, 0.0, out=t), 1.0, out=t)
+        t /= np.hypot(t[0], t[1]) + 1e-300
+        if np.abs(t - previous).max() < 1e-12:
+            break
+    result[solve] = np.hypot(*(point - axes * t))
+    return result
+
+def convex_hull(points):
+    # Monotone chain: titik hull berlawanan arah jarum jam, tanpa titik kolinear
+    points = sorted(set(map(tuple, points)))
+    if len(points) < 3:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+# Level of detail keliling ellipse: jumlah segmen mengikuti jari-jari di layar
+ELLIPSE_MIN_SEGMENTS = 8
+ELLIPSE_MAX_SEGMENTS = 360
+
+@lru_cache(maxsize=None)
+def unit_circle(segments):
+    # Tabel cos/sin lingkaran satuan (segments, 2), dihitung sekali per level LOD
+    angles = np.arange(segments) * (2.0 * math.pi / segments)
+    table = np.column_stack((np.cos(angles), np.sin(angles)))
+    table.flags.writeable = False
+    return table
+
+def ellipse_segment_count(radius_px, tolerance=0.25):
+    # Segmen minimum agar jarak tali busur ke kurva (chordal error) <= tolerance piksel:
+    # r * (1 - cos(pi / n)) <= tol  ->  n >= pi / acos(1 - tol / r).
+    # Dibulatkan ke kelipatan 4 agar jumlah tabel unit_circle tetap sedikit.
+    # radius_px boleh skalar atau array.
+    radius = np.maximum(np.asarray(radius_px, dtype=np.float64), tolerance)
+    with np.errstate(divide='ignore'):
+        segments = np.ceil(math.pi / np.arccos(1.0 - tolerance / radius))
+    segments = np.clip(np.ceil(segments / 4) * 4, ELLIPSE_MIN_SEGMENTS, ELLIPSE_MAX_SEGMENTS).astype(np.int64)
+    return int(segments) if segments.ndim == 0 else segments
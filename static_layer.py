@@ -0,0 +1,40 @@
+# Lapisan statis (display list OpenGL) untuk geometri latar yang hampir tidak pernah
+# berubah, seperti sumbu dan grid pada aplikasi 2D dan 3D.
+#
+# Pemakaian:
+#   layer = StaticLayer(Renderer.draw_axes)
+#   layer.draw(*ortho_bounds)   # dikompilasi sekali, dibangun ulang hanya jika argumen berubah
+
+from OpenGL.GL import glGenLists, glNewList, glEndList, glCallList, glDeleteLists, GL_COMPILE
+
+
+class StaticLayer:
+    def __init__(self, build):
+        self.build = build      # fungsi yang memanggil perintah GL untuk lapisan ini
+        self.list_id = None
+        self.key = None
+
+    def draw(self, *args):
+        # Argumen build sekaligus menjadi kunci cache, mis. ortho_bounds atau ukuran layar
+        if self.list_id is None or args != self.key:
+            self.compile(args)
+        glCallList(self.list_id)
+
+    def compile(self, args):
+        if self.list_id is None:
+            self.list_id = glGenLists(1)
+        glNewList(self.list_id, GL_COMPILE)
+        try:
+            self.build(*args)
+        finally:
+            glEndList()
+        self.key = args
+
+    def invalidate(self):
+        self.key = None
+
+    def delete(self):
+        if self.list_id is not None:
+            glDeleteLists(self.list_id, 1)
+            self.list_id = None
+            self.key = None
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul di akar repo (obj_loader, pro2d) diimpor langsung oleh test
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
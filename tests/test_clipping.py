@@ -0,0 +1,107 @@
+# Versi batch (NumPy) algoritma clipping dibandingkan dengan versi skalar per segmen/poligon
+import math
+
+import numpy as np
+import pytest
+
+from pro2d.clipping import Clipper, ClipWindow
+from pro2d.utils import unit_circle
+
+BOUNDS = (-50.0, 50.0, -40.0, 40.0)
+
+
+def random_segments(rng, count=2000):
+    # Segmen acak di sekitar window, ditambah segmen horizontal, vertikal, titik, dan
+    # segmen yang ujungnya tepat di garis batas
+    segments = rng.uniform(-150, 150, (count, 4))
+    segments[:100, 3] = segments[:100, 1]
+    segments[100:200, 2] = segments[100:200, 0]
+    segments[200:250, 2:] = segments[200:250, :2]
+    segments[250:300, 0] = BOUNDS[0]
+    segments[300:350, 3] = BOUNDS[3]
+    return segments
+
+
+def rotate(points, angle, center):
+    radians = math.radians(angle)
+    cos_a, sin_a = math.cos(radians), math.sin(radians)
+    return (np.asarray(points) - center) @ np.array([[cos_a, sin_a], [-sin_a, cos_a]]) + center
+
+
+def sutherland_hodgman(points, planes):
+    # Sutherland-Hodgman skalar: poligon dipotong berturut-turut oleh setiap bidang n . p >= c
+    result = [np.asarray(p, dtype=np.float64) for p in points]
+    for nx, ny, c in planes:
+        source, result = result, []
+        for i, current in enumerate(source):
+            previous = source[i - 1]
+            d_current = nx * current[0] + ny * current[1] - c
+            d_previous = nx * previous[0] + ny * previous[1] - c
+            if (d_current >= 0) != (d_previous >= 0):
+                t = d_previous / (d_previous - d_current)
+                result.append(previous + t * (current - previous))
+            if d_current >= 0:
+                result.append(current)
+    return np.array(result).reshape(-1, 2)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_cohen_sutherland_batch_matches_scalar(seed):
+    segments = random_segments(np.random.default_rng(seed))
+    accept, clipped = Clipper.cohen_sutherland_clip_batch(segments, BOUNDS)
+    for segment, batch_accept, batch_clipped in zip(segments.tolist(), accept, clipped):
+        expected = Clipper.cohen_sutherland_clip(*segment, BOUNDS)
+        assert batch_accept == expected[0]
+        if expected[0]:
+            np.testing.assert_allclose(batch_clipped, expected[1:], rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_cyrus_beck_matches_liang_barsky(seed):
+    segments = random_segments(np.random.default_rng(seed))
+    accept, clipped = Clipper.cyrus_beck_clip_batch(segments, Clipper.window_planes(BOUNDS))
+    for segment, batch_accept, batch_clipped in zip(segments.tolist(), accept, clipped):
+        expected = Clipper.liang_barsky_clip(*segment, BOUNDS)
+        assert batch_accept == expected[0]
+        if expected[0]:
+            np.testing.assert_allclose(batch_clipped, expected[1:], rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('angle', [30.0, 90.0, 217.0])
+def test_cyrus_beck_rotated_window_matches_liang_barsky(angle):
+    # Window yang dirotasi sama dengan window sejajar sumbu di kerangka lokalnya
+    segments = np.random.default_rng(7).uniform(-150, 150, (2000, 4))
+    window = ClipWindow.from_bounds(BOUNDS, angle)
+    center = ((BOUNDS[0] + BOUNDS[1]) / 2, (BOUNDS[2] + BOUNDS[3]) / 2)
+    accept, clipped = window.clip_segments_batch(segments)
+
+    local = rotate(segments.reshape(-1, 2), -angle, center).reshape(-1, 4)
+    for segment, batch_accept, batch_clipped in zip(local.tolist(), accept, clipped):
+        expected = Clipper.liang_barsky_clip(*segment, BOUNDS)
+        assert batch_accept == expected[0]
+        if expected[0]:
+            world = rotate(np.reshape(expected[1:], (2, 2)), angle, center).ravel()
+            np.testing.assert_allclose(batch_clipped, world, rtol=0, atol=1e-7)
+
+
+@pytest.mark.parametrize('angle', [0.0, 25.0])
+def test_sutherland_hodgman_batch_matches_scalar(angle):
+    rng = np.random.default_rng(3)
+    window = ClipWindow.from_bounds(BOUNDS, angle)
+    # Persegi panjang yang dirotasi dan keliling ellipse dengan berbagai ukuran dan posisi,
+    # sebagian seluruhnya di dalam atau di luar window
+    count = 400
+    centers = rng.uniform(-120, 120, (count, 1, 2))
+    radii = rng.uniform(1, 90, (count, 1, 2))
+    angles = rng.uniform(0, 2 * math.pi, (count, 1))
+    for shape in (np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=np.float64), unit_circle(24)):
+        local = shape[None] * radii
+        cos_a, sin_a = np.cos(angles), np.sin(angles)
+        polygons = centers + np.stack((local[..., 0] * cos_a - local[..., 1] * sin_a,
+                                       local[..., 0] * sin_a + local[..., 1] * cos_a), axis=-1)
+
+        points, counts, _ = Clipper.clip_polygons_batch(polygons, window)
+        for polygon, batch_points, batch_count in zip(polygons, points, counts):
+            expected = sutherland_hodgman(polygon, window.planes.tolist())
+            assert batch_count == len(expected)
+            np.testing.assert_allclose(batch_points[:batch_count], expected, rtol=0, atol=1e-9)
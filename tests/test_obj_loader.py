@@ -0,0 +1,107 @@
+# Parser OBJ berbasis NumPy dibandingkan dengan parser baris per baris yang sederhana
+import numpy as np
+import pytest
+
+from obj_loader import parse_obj_file
+
+
+def reference_parse(text):
+    # Parser acuan: satu baris satu record, indeks negatif relatif terhadap record sebelumnya
+    vertices, texcoords, normals = [], [], []
+    faces = []
+
+    def resolve(token, total):
+        if not token:
+            return -1
+        index = int(token)
+        return total + index if index < 0 else index - 1
+
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == 'v':
+            vertices.append([float(p) for p in parts[1:4]])
+        elif parts[0] == 'vt':
+            texcoords.append([float(p) for p in parts[1:3]])
+        elif parts[0] == 'vn':
+            normals.append([float(p) for p in parts[1:4]])
+        elif parts[0] == 'f':
+            corners = []
+            for token in parts[1:]:
+                fields = token.split('/') + [''] * 2
+                corners.append((resolve(fields[0], len(vertices)), resolve(fields[1], len(texcoords)),
+                                resolve(fields[2], len(normals))))
+            faces.append(corners)
+    return vertices, texcoords, normals, faces
+
+
+def random_obj(rng, lines=600, mixed=False):
+    # Isi file acak: record v/vt/vn dan face dengan semua format sudut, indeks positif dan negatif,
+    # komentar, baris kosong, serta record yang diawali spasi/tab
+    out = []
+    counts = {'v': 0, 'vt': 0, 'vn': 0}
+    formats = ('{v}', '{v}/{t}', '{v}//{n}', '{v}/{t}/{n}')
+    line_format = rng.choice(formats)
+    for _ in range(lines):
+        kind = rng.choice(['v', 'vt', 'vn', 'f', 'f', '#', ''], p=[.3, .1, .1, .3, .1, .05, .05])
+        indent = rng.choice(['', ' ', '\t', '  \t'], p=[.7, .1, .1, .1])
+        if kind in counts:
+            width = 2 if kind == 'vt' else 3
+            values = ' '.join(f"{value:.6g}" for value in rng.uniform(-100, 100, width))
+            out.append(f"{indent}{kind} {values}")
+            counts[kind] += 1
+        elif kind == 'f':
+            if min(counts.values()) == 0:
+                continue
+            corner_format = rng.choice(formats) if mixed else line_format
+
+            def index(record):
+                value = int(rng.integers(1, counts[record] + 1))
+                return str(-value if rng.random() < 0.3 else counts[record] + 1 - value)
+
+            corners = [corner_format.format(v=index('v'), t=index('vt'), n=index('vn'))
+                       for _ in range(int(rng.integers(3, 7)))]
+            out.append(f"{indent}f " + ' '.join(corners))
+        elif kind == '#':
+            out.append("# komentar v 1 2 3")
+        else:
+            out.append(indent)
+    return '\n'.join(out) + '\n'
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('chunk_size', [64, 257, 1 << 20])
+@pytest.mark.parametrize('mixed', [False, True])
+def test_matches_reference(tmp_path, seed, chunk_size, mixed):
+    text = random_obj(np.random.default_rng(seed), mixed=mixed)
+    path = tmp_path / 'mesh.obj'
+    path.write_text(text)
+    mesh = parse_obj_file(str(path), chunk_size=chunk_size)
+
+    vertices, texcoords, normals, faces = reference_parse(text)
+    np.testing.assert_array_equal(mesh.vertices, np.array(vertices, dtype=np.float32).reshape(-1, 3))
+    np.testing.assert_array_equal(mesh.texcoords, np.array(texcoords, dtype=np.float32).reshape(-1, 2))
+    np.testing.assert_array_equal(mesh.normals, np.array(normals, dtype=np.float32).reshape(-1, 3))
+
+    corners = np.array([corner for face in faces for corner in face]).reshape(-1, 3)
+    assert mesh.face_count == len(faces)
+    np.testing.assert_array_equal(np.diff(mesh.face_offsets), [len(face) for face in faces])
+    np.testing.assert_array_equal(mesh.face_indices, corners[:, 0])
+    np.testing.assert_array_equal(mesh.face_texcoord_indices, corners[:, 1])
+    np.testing.assert_array_equal(mesh.face_normal_indices, corners[:, 2])
+
+
+def test_crlf_and_missing_final_newline(tmp_path):
+    path = tmp_path / 'mesh.obj'
+    path.write_bytes(b"v 0 0 0\r\nv 1 0 0\r\n\tv 0 1 0\r\nf -3 -2 -1")
+    mesh = parse_obj_file(str(path), chunk_size=8)
+    assert len(mesh.vertices) == 3
+    np.testing.assert_array_equal(mesh.face_indices, [0, 1, 2])
+
+
+def test_rejects_out_of_range_index(tmp_path):
+    path = tmp_path / 'mesh.obj'
+    path.write_text("v 0 0 0\nv 1 0 0\nf 1 2 3\n")
+    with pytest.raises(ValueError):
+        parse_obj_file(str(path))